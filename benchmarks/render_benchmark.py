@@ -0,0 +1,111 @@
+"""
+Rendering Benchmark ⏱️
+
+Times ``HTMLTemplate`` and ``MarkdownTemplate`` on a synthetic file with
+many documented, AI-enhanced symbols, and compares the peak memory of
+rendering to a string with streaming to a file (``render_to``).
+
+    python benchmarks/render_benchmark.py --symbols 10000 --repeat 5
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from codedoc.templates import HTMLTemplate, MarkdownTemplate  # noqa: E402
+from codedoc.xref import CrossReferenceIndex  # noqa: E402
+
+
+def synthetic_file(symbols: int) -> dict:
+    """File data with ``symbols`` functions and classes (one class per ten symbols)."""
+    classes = symbols // 10
+    functions = [
+        {
+            "name": f"process_{i}",
+            "args": ["data", "limit"],
+            "arg_annotations": {"data": f"Model{i % max(classes, 1)}"},
+            "return_type": "Dict[str, Any]",
+            "docstring": f"Process batch {i} & return <summary>.",
+            "source_code": f"def process_{i}(data, limit=10):\n    return {{'n': len(data[:limit])}}\n",
+            "line_number": i,
+            "explanation": f"Processes batch {i} and summarizes it.",
+            "examples": [f"process_{i}(rows, limit=5)"],
+            "use_cases": ["Reports", "Dashboards"],
+            "parameters": [
+                {"name": "data", "type": "list", "default": "", "description": "Rows to process"},
+                {"name": "limit", "type": "int", "default": "10", "description": "Maximum rows"},
+            ],
+            "returns": {"type": "dict", "description": "Summary"},
+        }
+        for i in range(symbols - classes)
+    ]
+    classes = [
+        {
+            "name": f"Model{i}",
+            "bases": ["Base"],
+            "docstring": f"Model number {i}.",
+            "methods": [{"name": "save"}, {"name": "load"}],
+            "source_code": f"class Model{i}(Base):\n    def save(self):\n        pass\n",
+            "line_number": i,
+            "explanation": f"Model {i}.",
+            "examples": [f"Model{i}().save()"],
+        }
+        for i in range(classes)
+    ]
+    return {
+        "file_path": "bench/module.py",
+        "language": "python",
+        "imports": ["from typing import Any, Dict"],
+        "functions": functions,
+        "classes": classes,
+        "total_functions": len(functions),
+        "total_classes": len(classes),
+    }
+
+
+def best_of(repeat: int, render) -> float:
+    """Fastest of ``repeat`` timed calls, in seconds."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        render()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def peak_memory(render) -> float:
+    """Peak traced allocation of one call, in bytes."""
+    tracemalloc.start()
+    try:
+        render()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=10000, help="Symbols in the synthetic file")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed renders per format (the best is reported)")
+    args = parser.parse_args()
+
+    data = synthetic_file(args.symbols)
+    xref = CrossReferenceIndex.build([data])
+    html, markdown = HTMLTemplate(), MarkdownTemplate()
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        for name, template in (("html", html), ("markdown", markdown)):
+            render = lambda: template.render(data, xref)  # noqa: E731
+            size = len(render())
+            seconds = best_of(args.repeat, render)
+            print(f"{name:<9} {args.symbols} symbols: {seconds * 1000:8.1f} ms, {size / 1e6:6.2f} MB")
+            print(f"{'':<9} peak memory: render {peak_memory(render) / 1e6:6.2f} MB, "
+                  f"render_to {peak_memory(lambda: template.render_to(devnull, data, xref)) / 1e6:6.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
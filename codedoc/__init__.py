@@ -11,5 +11,6 @@ __email__ = "hello@codedoc-ai.com"
 from .core import DocumentationGenerator
 from .parser import CodeParser
 from .ai import AIExampleGenerator
+from .index import SymbolIndex
 
-__all__ = ["DocumentationGenerator", "CodeParser", "AIExampleGenerator"] 
\ No newline at end of file
+__all__ = ["DocumentationGenerator", "CodeParser", "AIExampleGenerator", "SymbolIndex"] 
\ No newline at end of file
@@ -4,76 +4,936 @@ AI Example Generator Module 🤖
 Uses AI to generate smart examples, explanations, and use cases.
 """
 
+import asyncio
 import os
-from typing import List, Dict, Any, Optional
-from openai import OpenAI
+import queue
+import re
+import time
+from dataclasses import dataclass
+from typing import List, Dict, Any, Callable, Iterator, Optional, Sequence, Tuple
+from openai import AsyncOpenAI
+from .batchfile import batch_request_line
+from .budget import compact_source, estimate_tokens
+from .cache import AIResponseCache, make_key
+from .clients import ClientRegistry, PoolConfig, get_registry
+from .ratelimit import (
+    BudgetExhaustedError, CallBudget, CircuitBreaker, DeadlineExceededError, RateLimiter, RetryPolicy,
+    acall_with_retry, call_with_retry
+)
+from .heuristic import HeuristicExampleGenerator
 from .parser import FunctionInfo, ClassInfo
+from .routing import HEURISTIC, ModelRouter
+from .usage import CallRecord, UsageTracker
 import json
 
 
+# Keys of an AI response that are merged into a symbol's documentation data
+ENHANCEMENT_KEYS = ("examples", "explanation", "use_cases")
+
+# Bump whenever a prompt template changes so cached responses are not reused
+PROMPT_VERSION = "1"
+
+# Batched prompts: at most this many symbols per request, and only symbols
+# using at most this fraction of the batch token budget are batched
+MAX_BATCH_SYMBOLS = 20
+BATCH_SYMBOL_SHARE = 4
+BATCH_OUTPUT_TOKENS_PER_SYMBOL = 400
+
+# Hedging waits for this many answered calls before trusting their p95 latency
+HEDGE_MIN_SAMPLES = 20
+HEDGE_PERCENTILE = 95
+
+
+@dataclass
+class _PendingSymbol:
+    """One ``enhance_many`` request, prepared for the cache and the prompt."""
+    position: int
+    kind: str
+    name: str
+    names: List[str]
+    signature: str
+    docstring: Optional[str]
+    source_code: str
+    language: str
+    prompt: str
+    key: str
+    max_tokens: int
+    tokens: int
+    structure_hash: Optional[str] = None
+    file: Optional[str] = None
+    model: Optional[str] = None
+    request: Optional[Tuple[str, Dict[str, Any]]] = None
+
+
+class FallbackEnhancement(dict):
+    """Offline heuristic content given to a symbol whose AI call missed its deadline.
+    
+    It renders like any other result, but is not a finished AI answer: run
+    journals leave it out so a resumed run asks the provider again.
+    """
+
+
+def substitute_names(value: Any, replacements: Dict[str, str]) -> Any:
+    """Replace whole-word identifiers in every string of an AI response."""
+    replacements = {old: new for old, new in replacements.items() if old and old != new}
+    if not replacements:
+        return value
+    pattern = re.compile(r"\b(" + "|".join(map(re.escape, sorted(replacements, key=len, reverse=True))) + r")\b")
+    
+    def substitute(item: Any) -> Any:
+        if isinstance(item, str):
+            return pattern.sub(lambda match: replacements[match.group(1)], item)
+        if isinstance(item, list):
+            return [substitute(element) for element in item]
+        if isinstance(item, dict):
+            return {key: substitute(element) for key, element in item.items()}
+        return item
+    
+    return substitute(value)
+
+
 class AIExampleGenerator:
     """🤖 AI-powered example generator for code documentation."""
     
-    def __init__(self, api_key: Optional[str] = None):
-        """Initialize AI generator with OpenAI API key."""
+    provider = "openai"
+    
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        concurrency: int = 8,
+        base_url: Optional[str] = None,
+        cache: Optional[AIResponseCache] = None,
+        batch_tokens: int = 2000,
+        max_source_tokens: int = 1500,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        pool: Optional[PoolConfig] = None,
+        registry: Optional[ClientRegistry] = None,
+        stream: bool = False,
+        budget: Optional[CallBudget] = None,
+        reuse_structures: bool = True,
+        usage: Optional[UsageTracker] = None,
+        model: str = "gpt-3.5-turbo",
+        router: Optional[ModelRouter] = None,
+        deadline: Optional[float] = None,
+        hedge: bool = False
+    ):
+        """Initialize AI generator with OpenAI API key.
+        
+        Args:
+            api_key: OpenAI API key (defaults to ``OPENAI_API_KEY``)
+            concurrency: Maximum number of AI requests in flight at once
+            base_url: OpenAI-compatible endpoint to use instead of the default
+                (e.g. a local ``StandInServer``)
+            cache: Optional persistent cache consulted before every request
+            batch_tokens: Token budget for packing several small symbols of a
+                file into one request (0 sends every symbol on its own)
+            max_source_tokens: Source code beyond this estimate is compacted to
+                signatures, docstrings and elided bodies before it is sent
+            rate_limiter: Shared requests/tokens per minute limits (unlimited if omitted)
+            retry_policy: Backoff for transient errors (defaults to ``RetryPolicy()``)
+            circuit_breaker: Fails fast while the provider is down (defaults to
+                the registry's breaker for this provider, endpoint and model)
+            pool: Connection pool limits and timeouts of the shared clients
+            registry: Where pooled clients come from (the process-wide registry
+                by default, so generators with equal settings share connections)
+            stream: Receive completions as streamed chunks, so long answers are
+                not cut off by the read timeout and stalls surface early
+            budget: Wall time and call limit of the run; requests beyond it fail
+                with ``BudgetExhaustedError`` without being sent
+            reuse_structures: Answer symbols whose ``structure_hash`` matches an
+                earlier one with that symbol's output, names substituted,
+                instead of sending a request
+            usage: Where tokens, latency, retries, cache hits and errors of
+                every request are recorded (a new ``UsageTracker`` by default)
+            model: Model for symbols the router does not route
+            router: Picks a model per symbol from the ``complexity`` of its
+                request; symbols routed to ``HEURISTIC`` are answered offline
+            deadline: Seconds a call (async or sync) may take from its first
+                attempt, retries included; symbols of a call past it get the
+                offline heuristic's content instead of an error
+            hedge: Send a duplicate of an attempt still unanswered after the
+                p95 latency of earlier calls; the first answer wins. Duplicates
+                wait for the rate limiter and a concurrency slot like any request
+        """
         self.api_key = api_key or os.getenv('OPENAI_API_KEY')
         if not self.api_key:
             raise Exception("❌ OpenAI API key not found! Set OPENAI_API_KEY environment variable.")
+        if concurrency < 1:
+            raise ValueError("AI concurrency must be at least 1")
+        if deadline is not None and deadline <= 0:
+            raise ValueError("AI deadline must be positive")
         
-        self.client = OpenAI(api_key=self.api_key)
-        self.model = "gpt-3.5-turbo"
+        self.base_url = base_url
+        self.pool = pool or PoolConfig()
+        self._registry = registry or get_registry()
+        self.client = self._registry.sync_client(self.api_key, base_url, self.pool)
+        self.model = model
+        self.router = router
+        self.usage = usage or UsageTracker(self.model)
+        self._heuristic = HeuristicExampleGenerator()
+        self.concurrency = concurrency
+        self.cache = cache
+        self.batch_tokens = batch_tokens
+        self.max_source_tokens = max_source_tokens
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker or self._registry.circuit_breaker(self.provider, base_url, model)
+        self.stream = stream
+        self.budget = budget
+        self.deadline = deadline
+        self.hedge = hedge
+        self.reuse_structures = reuse_structures
+        self.structure_reuses = 0
+        # structure hash -> (name, parameter or method names, enhancement)
+        self._structures: Dict[str, Tuple[str, List[str], Dict[str, Any]]] = {}
+        # The shared async client and this generator's semaphore are bound to
+        # the registry loop and looked up on first use
+        self._async_client: Optional[AsyncOpenAI] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
     
     def generate_function_examples(self, function: FunctionInfo) -> Dict[str, Any]:
         """Generate comprehensive examples for a function."""
         prompt = self._create_function_prompt(function)
         
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a expert Python documentation generator. Generate practical, real-world examples and explanations."},
-                    {"role": "user", "content": prompt}
-                ],
+            result = self._complete(
+                "function_examples",
+                "You are a expert Python documentation generator. Generate practical, real-world examples and explanations.",
+                prompt,
                 temperature=0.7,
                 max_tokens=1000
             )
-            
-            result = response.choices[0].message.content
             return self._parse_ai_response(result)
             
         except Exception as e:
-            return {
-                "examples": [f"# Example usage of {function.name}\nresult = {function.name}()"],
-                "explanation": f"Function {function.name} with parameters: {', '.join(function.args)}",
-                "use_cases": ["General purpose function"],
-                "error": str(e)
-            }
+            # Degrade to offline content, as async calls past their deadline do
+            if isinstance(e, DeadlineExceededError):
+                self.usage.record_fallback()
+            return dict(self._heuristic.generate_function_examples(function), error=str(e))
     
     def generate_class_examples(self, class_info: ClassInfo) -> Dict[str, Any]:
         """Generate comprehensive examples for a class."""
         prompt = self._create_class_prompt(class_info)
         
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a expert Python documentation generator. Generate practical, real-world examples and explanations for classes."},
-                    {"role": "user", "content": prompt}
-                ],
+            result = self._complete(
+                "class_examples",
+                "You are a expert Python documentation generator. Generate practical, real-world examples and explanations for classes.",
+                prompt,
                 temperature=0.7,
                 max_tokens=1200
             )
-            
-            result = response.choices[0].message.content
             return self._parse_ai_response(result)
             
         except Exception as e:
-            return {
-                "examples": [f"# Example usage of {class_info.name}\nobj = {class_info.name}()"],
-                "explanation": f"Class {class_info.name} with {len(class_info.methods)} methods",
-                "use_cases": ["General purpose class"],
-                "error": str(e)
-            }
+            if isinstance(e, DeadlineExceededError):
+                self.usage.record_fallback()
+            return dict(self._heuristic.generate_class_examples(class_info), error=str(e))
+    
+    def enhance_function_documentation(
+        self,
+        name: str,
+        params: List[str],
+        docstring: Optional[str],
+        source_code: str,
+        language: str = "python",
+        return_type: Optional[str] = None,
+        is_async: bool = False
+    ) -> Dict[str, Any]:
+        """Generate examples and an explanation for a parsed function.
+        
+        Returns:
+            The ``ENHANCEMENT_KEYS`` subset of the AI response
+        """
+        return self.run(self.aenhance_function_documentation(
+            name, params, docstring, source_code, language, return_type, is_async
+        ))
+    
+    def enhance_class_documentation(
+        self,
+        name: str,
+        methods: List[str],
+        docstring: Optional[str],
+        source_code: str,
+        language: str = "python"
+    ) -> Dict[str, Any]:
+        """Generate examples and an explanation for a parsed class.
+        
+        Returns:
+            The ``ENHANCEMENT_KEYS`` subset of the AI response
+        """
+        return self.run(self.aenhance_class_documentation(name, methods, docstring, source_code, language))
+    
+    async def aenhance_function_documentation(
+        self,
+        name: str,
+        params: List[str],
+        docstring: Optional[str],
+        source_code: str,
+        language: str = "python",
+        return_type: Optional[str] = None,
+        is_async: bool = False
+    ) -> Dict[str, Any]:
+        """Async version of ``enhance_function_documentation``."""
+        signature = self._symbol_signature("function", name, params=params, return_type=return_type, is_async=is_async)
+        compacted = compact_source(source_code, self.max_source_tokens, language)
+        prompt = self._create_symbol_prompt("function", signature, docstring, compacted, language)
+        try:
+            return await self._acomplete(prompt, language, max_tokens=1000)
+        except DeadlineExceededError:
+            self.usage.record_fallback()
+            return FallbackEnhancement(self._heuristic.enhance_function_documentation(
+                name, params, docstring, source_code, language, return_type, is_async
+            ))
+    
+    async def aenhance_class_documentation(
+        self,
+        name: str,
+        methods: List[str],
+        docstring: Optional[str],
+        source_code: str,
+        language: str = "python"
+    ) -> Dict[str, Any]:
+        """Async version of ``enhance_class_documentation``."""
+        signature = self._symbol_signature("class", name, methods=methods)
+        compacted = compact_source(source_code, self.max_source_tokens, language)
+        prompt = self._create_symbol_prompt("class", signature, docstring, compacted, language)
+        try:
+            return await self._acomplete(prompt, language, max_tokens=1200)
+        except DeadlineExceededError:
+            self.usage.record_fallback()
+            return FallbackEnhancement(
+                self._heuristic.enhance_class_documentation(name, methods, docstring, source_code, language)
+            )
+    
+    def enhance_many(self, requests: Sequence[Tuple[str, Dict[str, Any]]]) -> List[Any]:
+        """Enhance many symbols concurrently, at most ``concurrency`` requests at a time.
+        
+        Cached symbols are answered without a request, and so are symbols
+        structurally identical to one already answered (see
+        ``reuse_structures``). With ``batch_tokens`` set, small symbols of the
+        same language are packed into shared prompts; symbols a batch fails to
+        answer are retried on their own. Symbols of a call past the
+        ``deadline`` get the offline heuristic's content.
+        
+        Args:
+            requests: ``("function" | "class", keyword arguments)`` pairs for the
+                matching ``enhance_*_documentation`` method
+        
+        Returns:
+            One result per request, in request order; failed requests yield
+            their exception instead of a result
+        """
+        results: List[Any] = [None] * len(requests)
+        
+        def collect(position: int, result: Any) -> None:
+            results[position] = result
+        
+        if requests:
+            self.run(self._agather(requests, collect))
+        return results
+    
+    def iter_enhancements(self, requests: Sequence[Tuple[str, Dict[str, Any]]]) -> Iterator[Tuple[int, Any]]:
+        """Like ``enhance_many``, but yield ``(position, result)`` as each symbol finishes.
+        
+        Cached symbols come first; the rest arrive in completion order. Closing
+        the iterator early cancels the requests still outstanding.
+        """
+        if not requests:
+            return
+        finished: "queue.Queue[Any]" = queue.Queue()
+        done = object()
+        future = self._registry.submit(self._agather(requests, lambda position, result: finished.put((position, result))))
+        future.add_done_callback(lambda _: finished.put(done))
+        try:
+            while True:
+                item = finished.get()
+                if item is done:
+                    break
+                yield item
+            future.result()
+        finally:
+            future.cancel()
+    
+    def batch_requests(self, requests: Sequence[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Batch API request lines for the symbols ``enhance_many`` would send.
+        
+        Cached symbols, symbols routed to ``HEURISTIC`` and symbols structurally
+        identical to one already listed are left out, since a run answers them
+        without a request. Every line asks about one symbol, and its
+        ``custom_id`` is that symbol's cache key (see ``ingest_batch_results``).
+        """
+        lines = []
+        keys = set()
+        structures = set(self._structures)
+        for position, (kind, kwargs) in enumerate(requests):
+            symbol = self._pending_symbol(position, kind, kwargs)
+            if symbol.model == HEURISTIC or symbol.key in keys or symbol.structure_hash in structures:
+                continue
+            if self.cache and self.cache.get(symbol.key) is not None:
+                continue
+            keys.add(symbol.key)
+            if symbol.structure_hash:
+                structures.add(symbol.structure_hash)
+            lines.append(batch_request_line(symbol.key, {
+                "model": symbol.model,
+                "messages": [
+                    {"role": "system", "content": self._system_prompt(symbol.language)},
+                    {"role": "user", "content": symbol.prompt}
+                ],
+                "temperature": 0.7,
+                "max_tokens": symbol.max_tokens,
+            }))
+        return lines
+    
+    async def _agather(self, requests: Sequence[Tuple[str, Dict[str, Any]]], emit: Callable[[int, Any], None]) -> None:
+        """Enhance ``requests``, calling ``emit(position, result)`` as each one finishes."""
+        pending = []
+        # Symbols waiting for a structurally identical symbol sent in this call
+        followers: Dict[str, List[_PendingSymbol]] = {}
+        
+        def finish(symbol: _PendingSymbol, result: Any) -> None:
+            emit(symbol.position, result)
+            if not symbol.structure_hash:
+                return
+            if not isinstance(result, Exception):
+                self._structures[symbol.structure_hash] = (symbol.name, symbol.names, result)
+            for follower in followers.pop(symbol.structure_hash, []):
+                emit(follower.position, result if isinstance(result, Exception) else self._reuse(follower))
+        
+        def fall_back(symbol: _PendingSymbol) -> None:
+            # Offline content is not worth reusing, so followers get their own
+            for late in [symbol] + followers.pop(symbol.structure_hash, []):
+                self.usage.record_fallback(late.file)
+                result = self._heuristic.enhance_many([late.request])[0]
+                emit(late.position, result if isinstance(result, Exception) else FallbackEnhancement(result))
+        
+        for position, (kind, kwargs) in enumerate(requests):
+            symbol = self._pending_symbol(position, kind, kwargs)
+            if self.router:
+                self.usage.record_route(symbol.file, symbol.model)
+            if symbol.model == HEURISTIC:
+                emit(position, self._heuristic.enhance_many([(kind, kwargs)])[0])
+                continue
+            cached = self.cache.get(symbol.key) if self.cache else None
+            if cached is not None:
+                self.usage.record_cache_hit(symbol.file)
+                finish(symbol, self._enhancement(cached))
+            elif symbol.structure_hash in self._structures:
+                emit(position, self._reuse(symbol))
+            elif symbol.structure_hash in followers:
+                followers[symbol.structure_hash].append(symbol)
+            else:
+                if symbol.structure_hash:
+                    followers[symbol.structure_hash] = []
+                pending.append(symbol)
+        
+        async def single(symbol: _PendingSymbol) -> None:
+            try:
+                content = await self._afetch(symbol.key, symbol.prompt, symbol.language, symbol.max_tokens,
+                                             symbol.file, symbol.model)
+                result = self._enhancement(content)
+            except DeadlineExceededError:
+                fall_back(symbol)
+                return
+            except Exception as e:
+                result = e
+            finish(symbol, result)
+        
+        async def batch(symbols: List[_PendingSymbol]) -> None:
+            try:
+                answered = await self._abatch(symbols)
+            except DeadlineExceededError:
+                for symbol in symbols:
+                    fall_back(symbol)
+                return
+            except Exception:
+                answered = {}
+            for symbol in symbols:
+                if symbol.position in answered:
+                    finish(symbol, answered[symbol.position])
+            await asyncio.gather(*(single(s) for s in symbols if s.position not in answered))
+        
+        await asyncio.gather(*(
+            batch(group) if len(group) > 1 else single(group[0])
+            for group in self._plan_batches(pending)
+        ))
+    
+    def _reuse(self, symbol: _PendingSymbol) -> Dict[str, Any]:
+        """The output of the structurally identical symbol, renamed for ``symbol``."""
+        name, names, enhancement = self._structures[symbol.structure_hash]
+        self.structure_reuses += 1
+        self.usage.record_reuse(symbol.file)
+        replacements = {name: symbol.name}
+        replacements.update((old, new) for old, new in zip(names, symbol.names) if old != new)
+        return substitute_names(enhancement, replacements)
+    
+    def run(self, coroutine) -> Any:
+        """Run a coroutine on the shared AI event loop and wait for its result.
+        
+        The loop lives in a background thread so pooled async connections stay
+        warm between calls, and callers that already run an event loop (e.g.
+        the web interface) can use the synchronous API.
+        """
+        return self._registry.run(coroutine)
+    
+    def close(self) -> None:
+        """Drop this generator's client references.
+        
+        Pooled clients stay open for other generators; ``ClientRegistry.close``
+        (run at interpreter exit) closes them.
+        """
+        self._async_client = None
+        self._semaphore = None
+    
+    def _complete(self, kind: str, system: str, prompt: str, temperature: float, max_tokens: int) -> str:
+        """Send one prompt through the synchronous client, consulting the cache first.
+        
+        Like async calls, the call (retries included) is bounded by ``deadline``.
+        """
+        key = make_key(self.provider, self.model, PROMPT_VERSION, kind, prompt)
+        cached = self.cache.get(key) if self.cache else None
+        if cached is not None:
+            self.usage.record_cache_hit()
+            return cached
+        started = time.perf_counter()
+        sent: List[float] = []
+        
+        def attempt():
+            left = None
+            if self.deadline is not None:
+                left = self.deadline - (time.perf_counter() - sent[0]) if sent else self.deadline
+                if left <= 0:
+                    raise DeadlineExceededError(f"AI call not answered within {self.deadline:g}s")
+            remaining = None
+            if self.budget:
+                self.budget.charge()
+                remaining = self.budget.remaining()
+            timeout = min((t for t in (left, remaining) if t is not None), default=None)
+            sent.append(time.perf_counter())
+            try:
+                return self.client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {"role": "system", "content": system},
+                        {"role": "user", "content": prompt}
+                    ],
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    **({"timeout": timeout} if timeout is not None else {})
+                )
+            except Exception as e:
+                if left is not None and time.perf_counter() - sent[-1] >= left:
+                    raise DeadlineExceededError(f"AI call not answered within {self.deadline:g}s") from e
+                raise
+        
+        try:
+            response = call_with_retry(
+                attempt,
+                estimate_tokens(system + prompt) + max_tokens,
+                self.rate_limiter,
+                self.retry_policy,
+                self.circuit_breaker
+            )
+        except Exception as e:
+            self._record_call(None, 1, system + prompt, None, None, started, sent, type(e).__name__)
+            raise
+        
+        result = response.choices[0].message.content
+        self._record_call(None, 1, system + prompt, result, getattr(response, "usage", None), started, sent)
+        if self.cache:
+            self.cache.put(key, result)
+        return result
+    
+    async def _acomplete(self, prompt: str, language: str, max_tokens: int) -> Dict[str, Any]:
+        """Enhance one symbol through the async client, consulting the cache first."""
+        key = make_key(self.provider, self.model, PROMPT_VERSION, "enhance", prompt)
+        result = self.cache.get(key) if self.cache else None
+        if result is None:
+            result = await self._afetch(key, prompt, language, max_tokens)
+        else:
+            self.usage.record_cache_hit()
+        return self._enhancement(result)
+    
+    async def _afetch(
+        self,
+        key: str,
+        prompt: str,
+        language: str,
+        max_tokens: int,
+        file: Optional[str] = None,
+        model: Optional[str] = None
+    ) -> str:
+        """Send one symbol prompt and cache the raw response under ``key``."""
+        result = await self._arequest(self._system_prompt(language), prompt, max_tokens, file, model=model)
+        if self.cache:
+            self.cache.put(key, result)
+        return result
+    
+    async def _abatch(self, symbols: List[_PendingSymbol]) -> Dict[int, Dict[str, Any]]:
+        """Send one prompt for several symbols and split the answer per symbol.
+        
+        Returns:
+            Enhancements by request position, for the symbols the response covered;
+            each is also cached as if the symbol had been sent on its own
+        """
+        content = await self._arequest(
+            self._system_prompt(symbols[0].language),
+            self._create_batch_prompt(symbols),
+            max_tokens=BATCH_OUTPUT_TOKENS_PER_SYMBOL * len(symbols),
+            file=symbols[0].file,
+            symbols=len(symbols),
+            model=symbols[0].model
+        )
+        answers = json.loads(self._strip_code_fence(content))
+        if not isinstance(answers, dict):
+            raise ValueError("Batched response is not a JSON object")
+        
+        answered = {}
+        for number, symbol in enumerate(symbols, 1):
+            answer = answers.get(str(number))
+            if not isinstance(answer, dict):
+                continue
+            enhancement = {field: answer[field] for field in ENHANCEMENT_KEYS if field in answer}
+            if not enhancement:
+                continue
+            answered[symbol.position] = enhancement
+            if self.cache:
+                self.cache.put(symbol.key, json.dumps(enhancement))
+        return answered
+    
+    async def _arequest(
+        self,
+        system: str,
+        prompt: str,
+        max_tokens: int,
+        file: Optional[str] = None,
+        symbols: int = 1,
+        model: Optional[str] = None
+    ) -> str:
+        """Send one chat completion through the shared async client.
+        
+        Each attempt waits for the rate limiter and then holds the semaphore;
+        retry backoff happens outside it so other requests can proceed. The
+        budget is charged once a slot is free, so requests still queued when it
+        runs out are never sent, and a request in flight at the deadline is
+        abandoned. Requests that reached the provider are recorded in ``usage``
+        under ``file``, answering ``symbols`` symbols. ``model`` overrides the
+        default model.
+        
+        Raises:
+            DeadlineExceededError: If the call is not answered within
+                ``deadline`` seconds of its first attempt
+        """
+        model = model or self.model
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        if self._async_client is None:
+            self._async_client = self._registry.async_client(self.api_key, self.base_url, self.pool)
+        
+        started = time.perf_counter()
+        sent: List[float] = []
+        hedged: List[bool] = []
+        tokens = estimate_tokens(system + prompt) + max_tokens
+        
+        async def attempt():
+            async with self._semaphore:
+                left = None
+                if self.deadline is not None:
+                    left = self.deadline - (time.perf_counter() - sent[0]) if sent else self.deadline
+                    if left <= 0:
+                        raise DeadlineExceededError(f"AI call not answered within {self.deadline:g}s")
+                remaining = None
+                if self.budget:
+                    self.budget.charge()
+                    remaining = self.budget.remaining()
+                timeout = min((t for t in (left, remaining) if t is not None), default=None)
+                sent.append(time.perf_counter())
+                try:
+                    return await asyncio.wait_for(
+                        self._acreate_hedged(system, prompt, max_tokens, model, tokens, hedged), timeout
+                    )
+                except asyncio.TimeoutError:
+                    if timeout is None:
+                        raise
+                    if timeout == left:
+                        raise DeadlineExceededError(f"AI call not answered within {self.deadline:g}s")
+                    raise BudgetExhaustedError("AI time budget ran out during a request")
+        
+        try:
+            content, usage = await acall_with_retry(
+                attempt,
+                tokens,
+                self.rate_limiter,
+                self.retry_policy,
+                self.circuit_breaker
+            )
+        except Exception as e:
+            self._record_call(file, symbols, system + prompt, None, None, started, sent, type(e).__name__, model,
+                              bool(hedged))
+            raise
+        self._record_call(file, symbols, system + prompt, content, usage, started, sent, model=model,
+                          hedged=bool(hedged))
+        return content
+    
+    def _record_call(
+        self,
+        file: Optional[str],
+        symbols: int,
+        prompt: str,
+        content: Optional[str],
+        usage: Any,
+        started: float,
+        sent: List[float],
+        error: Optional[str] = None,
+        model: Optional[str] = None,
+        hedged: bool = False
+    ) -> None:
+        """Record a request in ``usage`` unless none of its attempts was sent.
+        
+        Token counts the response does not report are estimated.
+        """
+        if not sent:
+            return  # Refused client-side (budget, open circuit); nothing was spent
+        now = time.perf_counter()
+        prompt_tokens = getattr(usage, "prompt_tokens", None)
+        completion_tokens = getattr(usage, "completion_tokens", None)
+        self.usage.record_call(CallRecord(
+            file=file,
+            symbols=symbols,
+            prompt_tokens=estimate_tokens(prompt) if prompt_tokens is None else prompt_tokens,
+            completion_tokens=(estimate_tokens(content) if content else 0) if completion_tokens is None
+            else completion_tokens,
+            latency=now - sent[-1],
+            elapsed=now - started,
+            attempts=len(sent),
+            error=error,
+            estimated=prompt_tokens is None or completion_tokens is None,
+            model=model or self.model,
+            hedged=hedged,
+        ))
+    
+    async def _acreate_hedged(
+        self,
+        system: str,
+        prompt: str,
+        max_tokens: int,
+        model: Optional[str],
+        tokens: int,
+        hedged: List[bool]
+    ) -> Tuple[str, Any]:
+        """``_acreate``, duplicated if ``hedge`` is on and the first request outlives the p95 latency.
+        
+        The first successful answer wins and the other request is cancelled.
+        A duplicate is sent like any attempt: it waits for ``tokens`` from the
+        rate limiter and for a free semaphore slot, and is charged to the
+        budget (and not sent if none is left); ``hedged`` gets an entry when
+        one was sent.
+        """
+        delay = self._hedge_delay()
+        if delay is None:
+            return await self._acreate(system, prompt, max_tokens, model)
+        
+        async def duplicate() -> Tuple[str, Any]:
+            if self.rate_limiter:
+                await self.rate_limiter.acquire(tokens)
+            async with self._semaphore:
+                if self.budget:
+                    self.budget.charge()
+                hedged.append(True)
+                return await self._acreate(system, prompt, max_tokens, model)
+        
+        first = asyncio.ensure_future(self._acreate(system, prompt, max_tokens, model))
+        tasks = {first}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done:
+                return first.result()
+            tasks.add(asyncio.ensure_future(duplicate()))
+            while True:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                if not tasks:
+                    return done.pop().result()  # Both failed; raise one of the errors
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    def _hedge_delay(self) -> Optional[float]:
+        """Seconds after which an attempt is duplicated (``None``: do not hedge yet)."""
+        if not self.hedge or sum(1 for r in self.usage.records if r.error is None) < HEDGE_MIN_SAMPLES:
+            return None
+        return self.usage.latency_percentile(HEDGE_PERCENTILE)
+    
+    async def _acreate(self, system: str, prompt: str, max_tokens: int, model: Optional[str] = None) -> Tuple[str, Any]:
+        """One chat completion request; streamed chunks are joined.
+        
+        Returns:
+            The content and the response's ``usage`` (``None`` if not reported)
+        """
+        response = await self._async_client.chat.completions.create(
+            model=model or self.model,
+            messages=[
+                {"role": "system", "content": system},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.7,
+            max_tokens=max_tokens,
+            **({"stream": True, "stream_options": {"include_usage": True}} if self.stream else {})
+        )
+        if not self.stream:
+            return response.choices[0].message.content, getattr(response, "usage", None)
+        # Read the whole stream inside the attempt so a dropped stream is retried
+        parts = []
+        usage = None
+        async for chunk in response:
+            if chunk.choices and chunk.choices[0].delta.content:
+                parts.append(chunk.choices[0].delta.content)
+            usage = getattr(chunk, "usage", None) or usage
+        return "".join(parts), usage
+    
+    def _plan_batches(self, symbols: List[_PendingSymbol]) -> List[List[_PendingSymbol]]:
+        """Group symbols into requests.
+        
+        Small symbols of the same language and model share a prompt within
+        ``batch_tokens``.
+        """
+        groups: List[List[_PendingSymbol]] = []
+        open_batches: Dict[Tuple[str, Optional[str]], Tuple[List[_PendingSymbol], int]] = {}
+        
+        for symbol in symbols:
+            if not self.batch_tokens or symbol.tokens > self.batch_tokens // BATCH_SYMBOL_SHARE:
+                groups.append([symbol])
+                continue
+            
+            current, used = open_batches.get((symbol.language, symbol.model), (None, 0))
+            if current is None or used + symbol.tokens > self.batch_tokens or len(current) >= MAX_BATCH_SYMBOLS:
+                current, used = [], 0
+                groups.append(current)
+            current.append(symbol)
+            open_batches[(symbol.language, symbol.model)] = (current, used + symbol.tokens)
+        return groups
+    
+    def _pending_symbol(self, position: int, kind: str, kwargs: Dict[str, Any]) -> _PendingSymbol:
+        """Describe one ``enhance_many`` request."""
+        language = kwargs.get("language", "python")
+        signature = self._symbol_signature(kind, **kwargs)
+        docstring = kwargs.get("docstring")
+        source_code = compact_source(kwargs.get("source_code", ""), self.max_source_tokens, language)
+        prompt = self._create_symbol_prompt(kind, signature, docstring, source_code, language)
+        names = kwargs.get("methods" if kind == "class" else "params") or []
+        model = (self.router.route(kwargs.get("complexity")) if self.router else None) or self.model
+        return _PendingSymbol(
+            position=position,
+            kind=kind,
+            name=kwargs["name"],
+            names=[re.split(r"[=:\s]", str(name), 1)[0].lstrip("*") for name in names],
+            signature=signature,
+            docstring=docstring,
+            source_code=source_code,
+            language=language,
+            prompt=prompt,
+            key=make_key(self.provider, model, PROMPT_VERSION, "enhance", prompt),
+            max_tokens=1000 if kind == "function" else 1200,
+            tokens=estimate_tokens(f"{signature}\n{docstring or ''}\n{source_code}"),
+            structure_hash=kwargs.get("structure_hash") if self.reuse_structures else None,
+            file=kwargs.get("file_path"),
+            model=model,
+            request=(kind, kwargs),
+        )
+    
+    @staticmethod
+    def _symbol_signature(
+        kind: str,
+        name: str,
+        params: Sequence[str] = (),
+        methods: Sequence[str] = (),
+        return_type: Optional[str] = None,
+        is_async: bool = False,
+        **_: Any
+    ) -> str:
+        """Signature line shown to the model for a function or class."""
+        if kind == "class":
+            return f"{name} (methods: {', '.join(methods) or 'none'})"
+        signature = f"{'async ' if is_async else ''}{name}({', '.join(params)})"
+        if return_type:
+            signature += f" -> {return_type}"
+        return signature
+    
+    def _system_prompt(self, language: str) -> str:
+        return f"You are a expert {language.capitalize()} documentation generator. Generate practical, real-world examples and explanations."
+    
+    def _enhancement(self, response: str) -> Dict[str, Any]:
+        """The ``ENHANCEMENT_KEYS`` subset of a symbol response."""
+        parsed = self._parse_ai_response(response)
+        return {field: parsed[field] for field in ENHANCEMENT_KEYS if field in parsed}
+    
+    @staticmethod
+    def _strip_code_fence(response: str) -> str:
+        """Remove a surrounding Markdown code fence from a JSON response."""
+        return re.sub(r"^```[a-z]*\s*|\s*```$", "", response.strip())
+    
+    def _create_batch_prompt(self, symbols: List[_PendingSymbol]) -> str:
+        """Create one prompt documenting several symbols of the same language."""
+        language = symbols[0].language
+        sections = "\n".join(
+            f"""
+### Symbol {number} ({symbol.kind})
+Signature: {symbol.signature}
+Docstring: {symbol.docstring or 'No docstring provided'}
+Source Code:
+```{language}
+{symbol.source_code}
+```"""
+            for number, symbol in enumerate(symbols, 1)
+        )
+        return f"""
+Generate comprehensive documentation for each of these {language.capitalize()} symbols:
+{sections}
+
+For every symbol provide:
+1. **Examples**: 2-3 practical code examples showing how to use it
+2. **Explanation**: Clear explanation of what it does and when to use it
+3. **Use Cases**: Real-world scenarios where it would be useful
+
+Format your response as a JSON object mapping each symbol number ("1", "2", ...)
+to an object with keys: examples, explanation, use_cases
+"""
+    
+    def _create_symbol_prompt(
+        self,
+        kind: str,
+        signature: str,
+        docstring: Optional[str],
+        source_code: str,
+        language: str
+    ) -> str:
+        """Create a prompt for a parsed function or class of any supported language.
+        
+        ``source_code`` must already be compacted with ``compact_source``.
+        """
+        return f"""
+Generate comprehensive documentation for this {language.capitalize()} {kind}:
+
+Signature: {signature}
+Docstring: {docstring or 'No docstring provided'}
+Source Code:
+```{language}
+{source_code}
+```
+
+Please provide:
+1. **Examples**: 2-3 practical code examples showing how to use this {kind}
+2. **Explanation**: Clear explanation of what the {kind} does and when to use it
+3. **Use Cases**: Real-world scenarios where this {kind} would be useful
+
+Format your response as JSON with keys: examples, explanation, use_cases
+Make the examples practical and ready-to-run.
+"""
     
     def _create_function_prompt(self, function: FunctionInfo) -> str:
         """Create a prompt for function documentation generation."""
@@ -85,7 +945,7 @@ Arguments: {', '.join(function.args)}
 Docstring: {function.docstring or 'No docstring provided'}
 Source Code:
 ```python
-{function.source_code}
+{compact_source(function.source_code, self.max_source_tokens)}
 ```
 
 Please provide:
@@ -114,7 +974,7 @@ Methods:
 
 Source Code:
 ```python
-{class_info.source_code}
+{compact_source(class_info.source_code, self.max_source_tokens)}
 ```
 
 Please provide:
@@ -208,17 +1068,13 @@ Return only the improved docstring.
 """
         
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a documentation expert. Improve docstrings to be clear and helpful."},
-                    {"role": "user", "content": prompt}
-                ],
+            return self._complete(
+                "docstring",
+                "You are a documentation expert. Improve docstrings to be clear and helpful.",
+                prompt,
                 temperature=0.5,
                 max_tokens=300
-            )
-            
-            return response.choices[0].message.content.strip()
+            ).strip()
             
         except Exception as e:
-            return original_docstring or f"Documentation for {function_name}" 
\ No newline at end of file
+            return original_docstring or f"Documentation for {function_name}"
@@ -0,0 +1,131 @@
+"""
+AI Batch File Module 📦
+
+Bulk, non-interactive AI enhancement: the prompts a run would send are
+written to a JSONL file in the OpenAI Batch API request format, processed
+out of band, and the results file is ingested into the AI response cache,
+from which a later run renders without any API round trips.
+"""
+
+import json
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+from .budget import estimate_tokens
+from .cache import AIResponseCache
+
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+
+
+def batch_request_line(custom_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+    """One line of a batch request file."""
+    return {"custom_id": custom_id, "method": "POST", "url": BATCH_ENDPOINT, "body": body}
+
+
+def write_jsonl(lines: Iterable[Dict[str, Any]], path: str) -> int:
+    """Write one JSON document per line and return how many were written."""
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for line in lines:
+            f.write(json.dumps(line) + "\n")
+            count += 1
+    return count
+
+
+def read_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    """JSON documents of a JSONL file, skipping blank lines.
+
+    Raises:
+        ValueError: For a line that is not a JSON object
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                document = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{number}: invalid JSON ({e})")
+            if not isinstance(document, dict):
+                raise ValueError(f"{path}:{number}: expected a JSON object")
+            yield document
+
+
+def result_content(result: Dict[str, Any]) -> Optional[str]:
+    """The completion text of one batch result line, or ``None`` if the request failed."""
+    response = result.get("response") or {}
+    if result.get("error") or response.get("status_code") != 200:
+        return None
+    try:
+        return response["body"]["choices"][0]["message"]["content"]
+    except (KeyError, IndexError, TypeError):
+        return None
+
+
+def ingest_batch_results(path: str, cache: AIResponseCache) -> Dict[str, int]:
+    """Store every answered request of a batch results file in ``cache``.
+
+    ``custom_id`` is the cache key the request was prepared with, so a later
+    run finds the answers exactly where a live request would have put them.
+
+    Returns:
+        Counts of ``ingested`` and ``failed`` result lines
+    """
+    counts = {"ingested": 0, "failed": 0}
+    for result in read_jsonl(path):
+        content = result_content(result)
+        if not result.get("custom_id") or content is None:
+            counts["failed"] += 1
+            continue
+        cache.put(result["custom_id"], content)
+        counts["ingested"] += 1
+    return counts
+
+
+def process_batch_file(
+    input_path: str,
+    output_path: str,
+    responder: Optional[Callable[[str], str]] = None
+) -> int:
+    """Answer a batch request file locally, writing a results file as the Batch API would.
+
+    Args:
+        input_path: JSONL batch request file
+        output_path: Where the JSONL results go
+        responder: Answer for a user prompt (defaults to the stand-in's
+            ``canned_response``)
+
+    Returns:
+        Number of requests answered
+    """
+    if responder is None:
+        from .standin import canned_response
+        responder = canned_response
+
+    def results() -> Iterator[Dict[str, Any]]:
+        for number, request in enumerate(read_jsonl(input_path), 1):
+            body = request.get("body") or {}
+            messages = body.get("messages") or []
+            content = responder(messages[-1].get("content", "") if messages else "")
+            prompt_tokens = sum(estimate_tokens(message.get("content", "")) for message in messages)
+            completion_tokens = estimate_tokens(content)
+            yield {
+                "id": f"batch_req_standin_{number}",
+                "custom_id": request.get("custom_id"),
+                "response": {
+                    "status_code": 200,
+                    "request_id": f"standin-{number}",
+                    "body": {
+                        "id": f"chatcmpl-standin-batch-{number}",
+                        "object": "chat.completion",
+                        "model": body.get("model", "standin"),
+                        "choices": [{"index": 0, "message": {"role": "assistant", "content": content},
+                                     "finish_reason": "stop"}],
+                        "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                                  "total_tokens": prompt_tokens + completion_tokens},
+                    },
+                },
+                "error": None,
+            }
+
+    return write_jsonl(results(), output_path)
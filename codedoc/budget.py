@@ -0,0 +1,161 @@
+"""
+AI Budget Module 💰
+
+Token estimation, prompt compaction and skip rules that bound how much
+source is sent to the AI and which symbols are sent at all.
+"""
+
+import ast
+import re
+import textwrap
+from dataclasses import dataclass
+from pathlib import PurePath
+from typing import Dict, Any, Optional
+
+import astunparse
+
+
+ELIDED_BODY = "..."
+
+_DOCSTRING_SECTIONS = re.compile(
+    r"^\s*(Args|Arguments|Parameters|Returns|Raises|Yields|Examples?)\s*:|@(param|returns?|throws)\b",
+    re.MULTILINE | re.IGNORECASE
+)
+_TEST_FILE = re.compile(r"(^test_.*\.py|_test\.py|\.(test|spec)\.[jt]sx?|conftest\.py)$")
+_TRIVIAL_JS_BODY = re.compile(
+    r"^\s*(return\s+(this\.)?[\w$.]+|this\.[\w$]+\s*=\s*[\w$]+)?\s*;?\s*$"
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token)."""
+    return len(text) // 4 + 1
+
+
+def compact_source(source_code: str, max_tokens: int, language: str = "python") -> str:
+    """Shrink source code to roughly ``max_tokens`` for a prompt.
+
+    Source within budget is returned unchanged. Otherwise Python function
+    bodies are replaced by their docstring and ``...`` (keeping signatures and
+    class structure), and whatever is still over budget is truncated with a
+    note of how many lines were elided.
+    """
+    if estimate_tokens(source_code) <= max_tokens:
+        return source_code
+
+    if language == "python":
+        outline = _python_outline(source_code)
+        if outline is not None:
+            source_code = outline
+            if estimate_tokens(source_code) <= max_tokens:
+                return source_code
+
+    lines = source_code.splitlines()
+    kept, used = [], 0
+    for line in lines:
+        cost = estimate_tokens(line + "\n")
+        if used + cost > max_tokens and kept:
+            break
+        kept.append(line)
+        used += cost
+    elided = len(lines) - len(kept)
+    if elided:
+        kept.append(f"{_comment(language)} ... {elided} more line(s) elided")
+    return "\n".join(kept)
+
+
+def _python_outline(source_code: str) -> Optional[str]:
+    """Python source with every function body replaced by its docstring and ``...``."""
+    try:
+        tree = ast.parse(textwrap.dedent(source_code))
+    except SyntaxError:
+        return None
+
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            docstring = ast.get_docstring(node, clean=False)
+            body = [ast.Expr(value=ast.Constant(value=docstring))] if docstring else []
+            node.body = body + [ast.Expr(value=ast.Constant(value=Ellipsis))]
+    return astunparse.unparse(tree).strip()
+
+
+def _comment(language: str) -> str:
+    return "#" if language == "python" else "//"
+
+
+@dataclass
+class SkipPolicy:
+    """💰 Rules for symbols that are not worth an AI request.
+
+    Attributes:
+        skip_documented: Skip symbols whose docstring is already rich
+        skip_trivial: Skip one-line getters, setters and empty bodies
+        skip_tests: Skip test files and ``test_*`` functions
+        min_docstring_words: Docstrings with at least this many words (or with
+            Args/Returns style sections) count as rich
+    """
+    skip_documented: bool = True
+    skip_trivial: bool = True
+    skip_tests: bool = True
+    min_docstring_words: int = 25
+
+    def reason(self, kind: str, symbol: Dict[str, Any], file_path: str, language: str) -> Optional[str]:
+        """Why ``symbol`` should not be enhanced, or ``None`` to enhance it.
+
+        Returns:
+            ``"test"``, ``"documented"`` or ``"trivial"``
+        """
+        if self.skip_tests and (is_test_file(file_path) or symbol.get("name", "").startswith("test_")):
+            return "test"
+        if self.skip_documented and self.is_rich_docstring(symbol.get("docstring")):
+            return "documented"
+        if self.skip_trivial and kind == "function" and is_trivial(symbol.get("source_code", ""), language):
+            return "trivial"
+        return None
+
+    def is_rich_docstring(self, docstring: Optional[str]) -> bool:
+        """Whether a docstring already documents the symbol well."""
+        if not docstring:
+            return False
+        return len(docstring.split()) >= self.min_docstring_words or bool(_DOCSTRING_SECTIONS.search(docstring))
+
+
+def is_test_file(file_path: str) -> bool:
+    """Whether a path looks like a test module."""
+    path = PurePath(str(file_path).replace("\\", "/"))
+    return bool(_TEST_FILE.search(path.name)) or any(part in ("tests", "test", "__tests__") for part in path.parts[:-1])
+
+
+def is_trivial(source_code: str, language: str = "python") -> bool:
+    """Whether a function body is a single attribute return/assignment, ``pass`` or empty."""
+    if language == "python":
+        try:
+            tree = ast.parse(textwrap.dedent(source_code))
+        except SyntaxError:
+            return False
+        if len(tree.body) != 1 or not isinstance(tree.body[0], (ast.FunctionDef, ast.AsyncFunctionDef)):
+            return False
+        body = tree.body[0].body
+        if ast.get_docstring(tree.body[0]) is not None:
+            body = body[1:]
+        if not body:
+            return True
+        if len(body) != 1:
+            return False
+        statement = body[0]
+        if isinstance(statement, ast.Pass):
+            return True
+        if isinstance(statement, ast.Expr) and isinstance(statement.value, ast.Constant):
+            return True
+        if isinstance(statement, ast.Return):
+            return statement.value is None or isinstance(statement.value, (ast.Attribute, ast.Name, ast.Constant))
+        if isinstance(statement, ast.Assign):
+            return (len(statement.targets) == 1 and isinstance(statement.targets[0], ast.Attribute)
+                    and isinstance(statement.value, (ast.Name, ast.Constant)))
+        return False
+
+    start, end = source_code.find("{"), source_code.rfind("}")
+    if start == -1 or end <= start:
+        return False
+    body = source_code[start + 1:end]
+    return body.count(";") <= 1 and "\n" not in body.strip() and bool(_TRIVIAL_JS_BODY.match(body))
@@ -0,0 +1,169 @@
+"""
+AI Response Cache Module 💾
+
+Persists AI responses on disk so unchanged symbols cost no API calls on
+later runs. Entries are keyed by provider, model, prompt template version
+and a hash of the whitespace-normalized prompt (which embeds the source).
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+
+DEFAULT_TTL = 30 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 50000
+
+
+def default_cache_path() -> str:
+    """``$XDG_CACHE_HOME/codedoc/ai-cache.sqlite3`` (``~/.cache`` if unset)."""
+    base = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "codedoc", "ai-cache.sqlite3")
+
+
+def normalize_text(text: str) -> str:
+    """Normalize line endings and trailing whitespace so they do not bust the cache."""
+    lines = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    return "\n".join(line.rstrip() for line in lines).strip()
+
+
+def make_key(provider: str, model: str, prompt_version: str, kind: str, prompt: str) -> str:
+    """Cache key of one AI request."""
+    prompt_hash = hashlib.sha256(normalize_text(prompt).encode("utf-8")).hexdigest()
+    return hashlib.sha256("\0".join((provider, model, prompt_version, kind, prompt_hash)).encode("utf-8")).hexdigest()
+
+
+def _now() -> float:
+    return time.time()
+
+
+class AIResponseCache:
+    """💾 SQLite-backed AI response cache with TTL and LRU size bound.
+
+    Safe to share between the synchronous API and the async enhancement
+    loop, which runs in another thread.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttl: Optional[float] = DEFAULT_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES
+    ):
+        """Open (or create) a cache.
+
+        Args:
+            path: Database file (defaults to ``default_cache_path()``)
+            ttl: Seconds an entry stays valid; ``None`` keeps entries forever
+            max_entries: Least recently used entries beyond this are evicted
+        """
+        if max_entries < 1:
+            raise ValueError("Cache size must be at least 1 entry")
+
+        self.path = path or default_cache_path()
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses (last_used)")
+        self.purge_expired()
+        self._entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for ``key``, or ``None`` on a miss."""
+        with self._lock:
+            row = self._conn.execute("SELECT response, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            now = _now()
+            if row is not None and self.ttl is not None and row[1] + self.ttl < now:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                self._entries -= 1
+                row = None
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, response: str) -> None:
+        """Store a response, evicting the least recently used entries if full."""
+        with self._lock:
+            now = _now()
+            existed = self._conn.execute("SELECT 1 FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, created_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, response, now, now)
+            )
+            if not existed:
+                self._entries += 1
+            overflow = self._entries - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM responses WHERE key IN "
+                    "(SELECT key FROM responses ORDER BY last_used LIMIT ?)",
+                    (overflow,)
+                )
+                self._entries -= overflow
+                self.evictions += overflow
+            self._conn.commit()
+
+    def purge_expired(self) -> int:
+        """Delete expired entries and return how many were removed."""
+        if self.ttl is None:
+            return 0
+        with self._lock:
+            removed = self._conn.execute(
+                "DELETE FROM responses WHERE created_at < ?", (_now() - self.ttl,)
+            ).rowcount
+            self._conn.commit()
+        return removed
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+            self._entries = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss/eviction counters of this session and the current size."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": self._entries,
+        }
+
+    def close(self) -> None:
+        """Close the database."""
+        self._conn.close()
+
+    def __enter__(self) -> "AIResponseCache":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
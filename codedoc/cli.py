@@ -7,11 +7,15 @@ Command-line interface for generating AI-powered documentation.
 import click
 import os
 from pathlib import Path
+from typing import Optional
 from rich.console import Console
 from rich.panel import Panel
 from rich.text import Text
 
+from .clients import PoolConfig
 from .core import DocumentationGenerator
+from .routing import DEFAULT_ROUTES, ModelRouter
+from .shard import parse_shard_spec
 from . import __version__
 
 
@@ -31,38 +35,166 @@ def cli():
 @cli.command()
 @click.argument('source_path', type=click.Path(exists=True))
 @click.option('--output', '-o', default='./docs', help='Output directory for documentation')
-@click.option('--format', '-f', type=click.Choice(['html', 'markdown', 'both']), 
-              default='html', help='Output format (html, markdown, or both)')
+@click.option('--format', '-f', type=click.Choice(['html', 'markdown', 'both', 'site']), 
+              default='html', help='Output format (html, markdown, both, or site: a multi-page site in the output directory)')
 @click.option('--language', '-l', type=click.Choice(['python', 'javascript', 'typescript', 'auto']),
               default='auto', help='Programming language (auto-detect if not specified)')
 @click.option('--api-key', '-k', help='OpenAI API key (or set OPENAI_API_KEY env var)')
 @click.option('--no-ai', is_flag=True, help='Generate basic documentation without AI features')
+@click.option('--ai-provider', type=click.Choice(['openai', 'heuristic']), default='openai', show_default=True,
+              help='Source of examples: an OpenAI-compatible API, or offline heuristics from signatures and docstrings')
+@click.option('--ai-base-url', help='OpenAI-compatible endpoint to use instead of the default (e.g. "codedoc standin")')
+@click.option('--ai-concurrency', type=click.IntRange(min=1), default=8, show_default=True,
+              help='Maximum number of AI requests in flight at once')
+@click.option('--ai-batch-tokens', type=click.IntRange(min=0), default=2000, show_default=True,
+              help='Token budget for packing small symbols into one AI request (0 disables batching)')
+@click.option('--ai-max-source-tokens', type=click.IntRange(min=50), default=1500, show_default=True,
+              help='Compact source code beyond this many tokens to signatures, docstrings and elided bodies')
+@click.option('--ai-rpm', type=click.FloatRange(min=0, min_open=True),
+              help='Maximum AI requests per minute (unlimited if not set)')
+@click.option('--ai-tpm', type=click.FloatRange(min=0, min_open=True),
+              help='Maximum AI tokens per minute (unlimited if not set)')
+@click.option('--ai-max-retries', type=click.IntRange(min=0), default=4, show_default=True,
+              help='Retries of rate-limited or failed AI requests, with exponential backoff')
+@click.option('--ai-max-connections', type=click.IntRange(min=1), default=100, show_default=True,
+              help='Maximum pooled connections to the AI provider')
+@click.option('--ai-timeout', type=click.FloatRange(min=0, min_open=True), default=60.0, show_default=True,
+              help='AI request timeout in seconds')
+@click.option('--ai-time-budget', type=click.FloatRange(min=0), metavar='SECONDS',
+              help='Stop sending AI requests after this many seconds; the rest keep baseline docs '
+                   '(files are enhanced in order, most valuable symbols of each file first)')
+@click.option('--ai-max-calls', type=click.IntRange(min=0),
+              help='Send at most this many AI requests; files are enhanced in order, '
+                   'most valuable symbols of each file first')
+@click.option('--ai-deadline', type=click.FloatRange(min=0, min_open=True), metavar='SECONDS',
+              help='Give up on an AI call after this many seconds, retries included, and use offline examples')
+@click.option('--ai-hedge', is_flag=True,
+              help='Duplicate AI requests slower than the p95 latency so far; the first answer wins')
+@click.option('--no-ai-reuse', is_flag=True,
+              help='Send structurally identical symbols to the AI separately instead of reusing one answer')
+@click.option('--ai-model', default='gpt-3.5-turbo', show_default=True,
+              help='Model for symbols that are not routed elsewhere')
+@click.option('--ai-route', 'ai_route_spec', metavar='TIER=MODEL,...',
+              help='Route symbols by complexity (tiers: trivial, simple, complex; model "heuristic" answers '
+                   f'offline), or "auto" for {DEFAULT_ROUTES}')
+@click.option('--ai-stream', is_flag=True,
+              help='Receive AI completions as streamed chunks (for slow or long answers)')
+@click.option('--ai-all', is_flag=True,
+              help='Also enhance tests, richly documented symbols and trivial getters/setters')
+@click.option('--ai-cache', 'ai_cache_path', type=click.Path(dir_okay=False),
+              help='AI response cache database (defaults to the user cache directory)')
+@click.option('--ai-cache-ttl', type=click.FloatRange(min=0), default=30, show_default=True,
+              help='Days a cached AI response stays valid')
+@click.option('--no-ai-cache', is_flag=True, help='Always call the AI API instead of reusing cached responses')
+@click.option('--ai-cache-only', is_flag=True,
+              help='Send no AI requests; use cached responses (e.g. ingested with "codedoc batch ingest") only')
+@click.option('--ai-usage', 'ai_usage_path', type=click.Path(dir_okay=False),
+              help='Write per-call AI tokens, cost, latency histogram, retries, cache hits and errors as JSON')
+@click.option('--journal', 'journal_path', type=click.Path(dir_okay=False),
+              help='Journal of completed AI enhancements and files, removed once the run succeeds '
+                   '[default: OUTPUT.journal for paid AI runs]')
+@click.option('--no-journal', is_flag=True, help='Do not journal completed work')
+@click.option('--resume', is_flag=True,
+              help='Skip the files and AI enhancements an interrupted run with the same settings journaled')
+@click.option('--shard', 'shard_spec', metavar='INDEX/COUNT',
+              help='Only document shard INDEX of COUNT and write a partial result for "codedoc merge"')
+@click.option('--spill', is_flag=True,
+              help='Keep parsed symbols in an on-disk store instead of memory and stream documents to the output (for very large projects)')
+@click.option('--index', 'index_path', type=click.Path(dir_okay=False),
+              help='Write a SQLite symbol index usable with "codedoc query"')
+@click.option('--no-search', is_flag=True, help='Do not write a search index next to HTML output')
+@click.option('--no-dedupe', is_flag=True, help='Document byte-identical files separately instead of once')
 @click.option('--verbose', '-v', is_flag=True, help='Enable verbose output')
-def generate(source_path, output, format, language, api_key, no_ai, verbose):
+def generate(source_path, output, format, language, api_key, no_ai, ai_provider, ai_base_url, ai_concurrency,
+             ai_batch_tokens, ai_max_source_tokens, ai_rpm, ai_tpm, ai_max_retries, ai_max_connections, ai_timeout,
+             ai_time_budget, ai_max_calls, ai_deadline, ai_hedge, no_ai_reuse, ai_model, ai_route_spec, ai_stream,
+             ai_all, ai_cache_path, ai_cache_ttl, no_ai_cache, ai_cache_only, ai_usage_path, journal_path, no_journal,
+             resume, shard_spec, spill, index_path, no_search, no_dedupe, verbose):
     """Generate AI-powered documentation for Python code.
     
     SOURCE_PATH: Path to Python file or directory to document
     """
     
+    shard = None
+    if shard_spec:
+        try:
+            shard = parse_shard_spec(shard_spec)
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint="'--shard'")
+    
+    router = None
+    if ai_route_spec:
+        try:
+            router = ModelRouter.from_spec(ai_route_spec)
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint="'--ai-route'")
+    
     # Display header
     console.print(Panel.fit(
         Text("🚀 CodeDoc AI - Smart Documentation Generator", style="bold blue"),
         border_style="blue"
     ))
     
+    if ai_cache_only:
+        if no_ai_cache:
+            raise click.UsageError("--ai-cache-only cannot be combined with --no-ai-cache")
+        ai_max_calls = 0
+    
     # Validate API key if AI is enabled
-    if not no_ai:
-        openai_key = api_key or os.getenv('OPENAI_API_KEY')
+    openai_key = api_key or os.getenv('OPENAI_API_KEY')
+    if ai_cache_only and not openai_key:
+        openai_key = "not-needed"  # No request is sent
+    if not no_ai and ai_provider == 'openai':
+        if not openai_key and ai_base_url:
+            openai_key = "not-needed"  # Local OpenAI-compatible endpoints do not check keys
         if not openai_key:
             console.print("⚠️  No OpenAI API key found!", style="yellow")
             console.print("Set OPENAI_API_KEY environment variable or use --api-key option", style="yellow")
-            console.print("Continuing without AI features (use --no-ai to suppress this warning)", style="yellow")
-            no_ai = True
+            console.print("Using offline heuristic examples (use --ai-provider heuristic to suppress this warning)",
+                          style="yellow")
+            ai_provider = 'heuristic'
+    
+    # Journal by default only when requests cost money; nothing else is worth resuming
+    paid_ai = not no_ai and ai_provider == 'openai' and not ai_cache_only and openai_key != "not-needed"
+    if no_journal:
+        if resume:
+            raise click.UsageError("--resume cannot be combined with --no-journal")
+        journal_path = None
+    elif not journal_path and (resume or paid_ai):
+        journal_path = f"{output}.journal"
     
     try:
         # Initialize generator
         generator = DocumentationGenerator(
-            use_ai=not no_ai
+            use_ai=not no_ai,
+            ai_provider=ai_provider,
+            spill=spill,
+            index_path=index_path,
+            search_index=not no_search,
+            dedupe=not no_dedupe,
+            journal_path=journal_path,
+            resume=resume,
+            ai_concurrency=ai_concurrency,
+            ai_api_key=openai_key,
+            ai_base_url=ai_base_url,
+            ai_batch_tokens=ai_batch_tokens,
+            ai_max_source_tokens=ai_max_source_tokens,
+            ai_skip=not ai_all,
+            ai_requests_per_minute=ai_rpm,
+            ai_tokens_per_minute=ai_tpm,
+            ai_max_retries=ai_max_retries,
+            ai_pool=PoolConfig(max_connections=ai_max_connections, timeout=ai_timeout),
+            ai_stream=ai_stream,
+            ai_time_budget=ai_time_budget,
+            ai_max_calls=ai_max_calls,
+            ai_deadline=ai_deadline,
+            ai_hedge=ai_hedge,
+            ai_reuse_structures=not no_ai_reuse,
+            ai_model=ai_model,
+            ai_router=router,
+            ai_cache=not no_ai_cache,
+            ai_cache_path=ai_cache_path,
+            ai_cache_ttl=ai_cache_ttl * 24 * 3600
         )
         
         # Display configuration
@@ -70,7 +202,8 @@ def generate(source_path, output, format, language, api_key, no_ai, verbose):
 📁 Source: {source_path}
 📄 Output: {output}
 🎨 Format: {format}
-🤖 AI Enhanced: {'Yes' if not no_ai else 'No'}
+🤖 AI Enhanced: {'No' if no_ai else ai_provider}
+🧩 Shard: {shard_spec or 'All files'}
         """
         console.print(Panel(config_text.strip(), title="Configuration", border_style="green"))
         
@@ -78,9 +211,14 @@ def generate(source_path, output, format, language, api_key, no_ai, verbose):
         content = generator.generate_documentation(
             source_path=source_path,
             output_format=format,
-            output_path=output
+            output_path=output,
+            shard=shard
         )
         
+        # The journal only serves to resume an interrupted run
+        if journal_path and os.path.exists(journal_path):
+            os.remove(journal_path)
+        
         # Display success summary
         summary_text = f"""
 ✅ Documentation generated successfully!
@@ -88,15 +226,18 @@ def generate(source_path, output, format, language, api_key, no_ai, verbose):
 📊 Summary:
 • Format: {format.upper()}
 • Output: {output}
-• AI enhanced: {'No' if no_ai else 'Yes'}
+• AI enhanced: {'No' if no_ai else ai_provider}
 • File: {source_path}
 
 🌐 Open documentation:
-• File: {output}
+• File: {content if format == 'site' else output}
         """
         
         console.print(Panel(summary_text.strip(), title="🎉 Success!", border_style="green"))
         
+        if not no_ai:
+            _print_ai_summary(generator, ai_usage_path)
+        
         if verbose:
             console.print("\n📄 Generated content preview:", style="dim")
             console.print(content[:500] + "..." if len(content) > 500 else content)
@@ -110,6 +251,258 @@ def generate(source_path, output, format, language, api_key, no_ai, verbose):
         raise click.Abort()
 
 
+def _print_ai_summary(generator: DocumentationGenerator, ai_usage_path: Optional[str]) -> None:
+    """Print what the AI enhancement of a run skipped, reused, sent and cached."""
+    skipped = getattr(generator, 'ai_skipped', None) or {}
+    if skipped:
+        reasons = ", ".join(f"{count} {reason}" for reason, count in sorted(skipped.items()))
+        console.print(f"⏭️  AI skipped {sum(skipped.values())} symbol(s): {reasons}", style="dim")
+    
+    if generator.ai_enhancer and generator.ai_enhancer.structure_reuses:
+        console.print(f"🧬 Reused AI output for {generator.ai_enhancer.structure_reuses} "
+                      f"structurally identical symbol(s)", style="dim")
+    
+    if generator.ai_budget and generator.use_ai and not generator.offline:
+        console.print(f"⏱️  AI budget: {generator.ai_budget.calls} request(s) sent", style="dim")
+    
+    usage = generator.ai_usage.summary()
+    if usage['calls']:
+        cost = f", ${usage['cost']:.4f}" if usage['cost'] is not None else ""
+        console.print(f"📈 AI usage: {usage['calls']} request(s) for {usage['symbols']} symbol(s), "
+                      f"{usage['prompt_tokens']} prompt + {usage['completion_tokens']} completion tokens{cost}, "
+                      f"latency p50 {usage['latency']['p50']:.2f}s / p95 {usage['latency']['p95']:.2f}s, "
+                      f"{usage['retries']} retries, {usage['errors']} errors", style="dim")
+    if usage['fallbacks'] or usage['hedges']:
+        console.print(f"⏳ AI deadline: {usage['fallbacks']} symbol(s) fell back to offline examples, "
+                      f"{usage['hedges']} hedged request(s)", style="dim")
+    if usage['routes']:
+        routes = ", ".join(f"{count} {model}" for model, count in sorted(usage['routes'].items()))
+        console.print(f"🧭 AI routing: {routes}", style="dim")
+    if ai_usage_path:
+        generator.ai_usage.export(ai_usage_path)
+        console.print(f"📈 AI usage written to {ai_usage_path}", style="dim")
+    
+    if generator.ai_cache:
+        stats = generator.ai_cache.stats()
+        console.print(f"💾 AI cache: {stats['hits']} hits, {stats['misses']} misses, "
+                      f"{stats['entries']} entries", style="dim")
+
+
+@cli.command()
+@click.argument('shard_files', nargs=-1, required=True, type=click.Path(exists=True, dir_okay=False))
+@click.option('--output', '-o', default='./docs', help='Output file for the merged documentation')
+@click.option('--format', '-f', type=click.Choice(['html', 'markdown', 'json', 'site']),
+              default='html', help='Output format (html, markdown, json, or site: a multi-page site in the output directory)')
+@click.option('--index', 'index_path', type=click.Path(dir_okay=False),
+              help='Write a SQLite symbol index of the merged project')
+@click.option('--no-search', is_flag=True, help='Do not write a search index next to HTML output')
+def merge(shard_files, output, format, index_path, no_search):
+    """Merge partial results from "generate --shard" runs into project docs.
+    
+    SHARD_FILES: Partial result files, one per shard
+    """
+    
+    console.print(Panel.fit(
+        Text("🧩 CodeDoc AI - Merge Shards", style="bold blue"),
+        border_style="blue"
+    ))
+    
+    try:
+        generator = DocumentationGenerator(use_ai=False, index_path=index_path, search_index=not no_search)
+        generator.merge_shards(list(shard_files), output_format=format, output_path=output)
+        
+        console.print(f"✅ Merged {len(shard_files)} shard(s) into {output}", style="green")
+    
+    except Exception as e:
+        console.print(f"❌ Error merging shards: {str(e)}", style="red")
+        raise click.Abort()
+
+
+@cli.command()
+@click.argument('index_path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--name', '-n', help='Exact symbol name or Class.method')
+@click.option('--prefix', '-p', help='Symbol name prefix')
+@click.option('--file', '-f', 'file_path', help='All symbols defined in a file')
+@click.option('--undocumented', '-u', is_flag=True, help='Symbols without a docstring')
+@click.option('--limit', default=50, show_default=True, help='Maximum results for prefix/undocumented queries')
+def query(index_path, name, prefix, file_path, undocumented, limit):
+    """Look up symbols in an index written by "generate --index".
+    
+    INDEX_PATH: Path to the SQLite symbol index
+    """
+    
+    from .index import SymbolIndex
+    
+    try:
+        with SymbolIndex(index_path) as index:
+            if name:
+                records = index.lookup(name)
+            elif prefix:
+                records = index.search_prefix(prefix, limit=limit)
+            elif file_path:
+                records = index.symbols_in_file(file_path)
+            elif undocumented:
+                records = index.undocumented(limit=limit)
+            else:
+                stats = index.stats()
+                console.print(f"📊 {stats['symbols']} symbols in {stats['files']} files "
+                              f"({stats['undocumented']} undocumented)")
+                return
+    except Exception as e:
+        console.print(f"❌ Error querying index: {str(e)}", style="red")
+        raise click.Abort()
+    
+    if not records:
+        console.print("⚠️  No matching symbols", style="yellow")
+        return
+    
+    for record in records:
+        console.print(f"  • [{record.kind}] {record.qualname}  {record.file_path}:{record.line_number}", markup=False)
+        console.print(f"    {record.signature}", style="dim", markup=False)
+
+
+@cli.command()
+@click.option('--host', default='127.0.0.1', show_default=True, help='Interface to listen on')
+@click.option('--port', default=8765, show_default=True, help='Port to listen on')
+@click.option('--latency', default='0', show_default=True,
+              help='Latency in ms: N, fixed:N, uniform:LO:HI, normal:MEAN:SD or exp:MEAN')
+@click.option('--error-rate', type=click.FloatRange(0, 1), default=0.0, help='Fraction of requests failing with 500')
+@click.option('--rate-limit-rate', type=click.FloatRange(0, 1), default=0.0, help='Fraction of requests rejected with 429')
+@click.option('--retry-after', type=click.FloatRange(min=0), default=1.0, show_default=True,
+              help='Retry-After seconds sent with 429 responses')
+@click.option('--seed', default=0, show_default=True, help='Seed for latency and error injection')
+def standin(host, port, latency, error_rate, rate_limit_rate, retry_after, seed):
+    """Serve a local OpenAI-compatible stand-in for offline AI benchmarks.
+    
+    Point "generate --ai-base-url" at the printed URL.
+    """
+    
+    from .standin import StandInConfig, StandInServer
+    
+    try:
+        config = StandInConfig(latency=latency, error_rate=error_rate, rate_limit_rate=rate_limit_rate,
+                               retry_after=retry_after, seed=seed)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+    
+    server = StandInServer(config, host=host, port=port)
+    console.print(f"🧪 Stand-in AI server listening on {server.base_url} (Ctrl+C to stop)", style="green")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        stats = server.stats
+        console.print(f"📊 {stats['requests']} requests over {stats['connections']} connections, "
+                      f"{stats['rate_limited']} rate limited, "
+                      f"{stats['errors']} errors, peak {stats['peak_in_flight']} in flight")
+
+
+@cli.group()
+def batch():
+    """Bulk AI enhancement through batch files instead of live requests.
+    
+    "batch prepare" writes the pending prompts as an OpenAI Batch API input
+    file, "batch ingest" loads the results file into the AI response cache,
+    and "generate --ai-cache-only" then renders without any API round trips.
+    Use the same model, routing and source limits for prepare and generate.
+    """
+
+
+@batch.command('prepare')
+@click.argument('source_path', type=click.Path(exists=True))
+@click.option('--output', '-o', default='batch-requests.jsonl', show_default=True, type=click.Path(dir_okay=False),
+              help='JSONL batch request file to write')
+@click.option('--language', '-l', type=click.Choice(['python', 'javascript', 'typescript', 'auto']),
+              default='auto', help='Programming language (auto-detect if not specified)')
+@click.option('--ai-model', default='gpt-3.5-turbo', show_default=True,
+              help='Model for symbols that are not routed elsewhere')
+@click.option('--ai-route', 'ai_route_spec', metavar='TIER=MODEL,...', help='Route symbols by complexity')
+@click.option('--ai-max-source-tokens', type=click.IntRange(min=50), default=1500, show_default=True,
+              help='Compact source code beyond this many tokens to signatures, docstrings and elided bodies')
+@click.option('--ai-all', is_flag=True,
+              help='Also enhance tests, richly documented symbols and trivial getters/setters')
+@click.option('--no-ai-reuse', is_flag=True,
+              help='Request structurally identical symbols separately instead of reusing one answer')
+@click.option('--ai-cache', 'ai_cache_path', type=click.Path(dir_okay=False),
+              help='AI response cache database; symbols already cached are left out')
+def batch_prepare(source_path, output, language, ai_model, ai_route_spec, ai_max_source_tokens, ai_all, no_ai_reuse,
+                  ai_cache_path):
+    """Write the AI prompts a run over SOURCE_PATH would send as a JSONL batch file."""
+    
+    router = None
+    if ai_route_spec:
+        try:
+            router = ModelRouter.from_spec(ai_route_spec)
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint="'--ai-route'")
+    
+    try:
+        generator = DocumentationGenerator(
+            use_ai=True,
+            search_index=False,
+            ai_api_key=os.getenv('OPENAI_API_KEY') or "not-needed",  # Nothing is sent
+            ai_max_source_tokens=ai_max_source_tokens,
+            ai_skip=not ai_all,
+            ai_reuse_structures=not no_ai_reuse,
+            ai_model=ai_model,
+            ai_router=router,
+            ai_cache_path=ai_cache_path
+        )
+        count = generator.prepare_ai_batch(source_path, output, language=None if language == 'auto' else language)
+    except Exception as e:
+        console.print(f"❌ Error preparing batch: {str(e)}", style="red")
+        raise click.Abort()
+    
+    console.print(f"📦 Wrote {count} AI request(s) to {output}", style="green")
+
+
+@batch.command('standin')
+@click.argument('requests_path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--output', '-o', default='batch-results.jsonl', show_default=True, type=click.Path(dir_okay=False),
+              help='JSONL batch results file to write')
+def batch_standin(requests_path, output):
+    """Answer a batch request file locally with deterministic stand-in responses."""
+    
+    from .batchfile import process_batch_file
+    
+    try:
+        count = process_batch_file(requests_path, output)
+    except (OSError, ValueError) as e:
+        console.print(f"❌ Error processing batch: {str(e)}", style="red")
+        raise click.Abort()
+    
+    console.print(f"🧪 Answered {count} request(s) into {output}", style="green")
+
+
+@batch.command('ingest')
+@click.argument('results_path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--ai-cache', 'ai_cache_path', type=click.Path(dir_okay=False),
+              help='AI response cache database (defaults to the user cache directory)')
+@click.option('--ai-cache-ttl', type=click.FloatRange(min=0), default=30, show_default=True,
+              help='Days an ingested response stays valid')
+def batch_ingest(results_path, ai_cache_path, ai_cache_ttl):
+    """Load a batch results file into the AI response cache."""
+    
+    from .cache import AIResponseCache
+    from .batchfile import ingest_batch_results
+    
+    try:
+        cache = AIResponseCache(ai_cache_path, ttl=ai_cache_ttl * 24 * 3600)
+        try:
+            counts = ingest_batch_results(results_path, cache)
+        finally:
+            cache.close()
+    except (OSError, ValueError) as e:
+        console.print(f"❌ Error ingesting batch results: {str(e)}", style="red")
+        raise click.Abort()
+    
+    console.print(f"💾 Ingested {counts['ingested']} response(s) into the AI cache", style="green")
+    if counts['failed']:
+        console.print(f"⚠️  {counts['failed']} request(s) failed; they will be sent live or skipped", style="yellow")
+
+
 @cli.command()
 @click.argument('source_path', type=click.Path(exists=True))
 def parse(source_path):
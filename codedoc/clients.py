@@ -0,0 +1,154 @@
+"""
+AI Client Registry Module 🔌
+
+Process-wide OpenAI clients with keep-alive connection pools, shared by
+every generator so repeated runs (e.g. web uploads) reuse warm connections,
+together with the rate limiters and circuit breakers that guard them.
+"""
+
+import asyncio
+import atexit
+import concurrent.futures
+import threading
+from dataclasses import dataclass
+from typing import Any, Coroutine, Dict, Optional, Tuple
+
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI, Timeout
+
+from .ratelimit import CircuitBreaker, RateLimiter
+
+
+@dataclass(frozen=True)
+class PoolConfig:
+    """🔌 Connection pool limits and timeouts of a shared client.
+
+    Attributes:
+        max_connections: Maximum open connections per client
+        max_keepalive_connections: Idle connections kept for reuse
+        keepalive_expiry: Seconds an idle connection is kept
+        timeout: Overall request timeout in seconds
+        connect_timeout: Connection (and TLS handshake) timeout in seconds
+    """
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    timeout: float = 60.0
+    connect_timeout: float = 10.0
+
+    def http_options(self) -> Dict[str, Any]:
+        """Keyword arguments for the underlying HTTP client."""
+        return {
+            "limits": httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+            "timeout": Timeout(self.timeout, connect=self.connect_timeout),
+        }
+
+
+_ClientKey = Tuple[Optional[str], Optional[str], PoolConfig]
+# (provider, base URL, model)
+_EndpointKey = Tuple[str, Optional[str], str]
+
+
+class ClientRegistry:
+    """🔌 Hands out one pooled sync and async client per (key, endpoint, pool config).
+
+    Rate limiters and circuit breakers are shared per (provider, endpoint,
+    model), so every generator talking to the same model draws from the same
+    limits and sees the same outages. Async clients are bound to the
+    registry's event loop, which runs in a background thread for the
+    lifetime of the process.
+    """
+
+    def __init__(self):
+        self._sync: Dict[_ClientKey, OpenAI] = {}
+        self._async: Dict[_ClientKey, AsyncOpenAI] = {}
+        self._limiters: Dict[Tuple[_EndpointKey, Optional[float], Optional[float]], RateLimiter] = {}
+        self._breakers: Dict[_EndpointKey, CircuitBreaker] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    def sync_client(self, api_key: Optional[str], base_url: Optional[str] = None,
+                    pool: PoolConfig = PoolConfig()) -> OpenAI:
+        """The shared synchronous client for these settings."""
+        key = (api_key, base_url, pool)
+        with self._lock:
+            if key not in self._sync:
+                # Retries are handled by ``RetryPolicy`` so they share the rate limits
+                self._sync[key] = OpenAI(api_key=api_key, base_url=base_url, max_retries=0,
+                                         http_client=DefaultHttpxClient(**pool.http_options()))
+            return self._sync[key]
+
+    def async_client(self, api_key: Optional[str], base_url: Optional[str] = None,
+                     pool: PoolConfig = PoolConfig()) -> AsyncOpenAI:
+        """The shared async client for these settings (use it on ``loop`` only)."""
+        key = (api_key, base_url, pool)
+        with self._lock:
+            if key not in self._async:
+                self._async[key] = AsyncOpenAI(api_key=api_key, base_url=base_url, max_retries=0,
+                                               http_client=DefaultAsyncHttpxClient(**pool.http_options()))
+            return self._async[key]
+
+    def rate_limiter(self, provider: str, base_url: Optional[str], model: str,
+                     requests_per_minute: Optional[float] = None,
+                     tokens_per_minute: Optional[float] = None) -> RateLimiter:
+        """The shared rate limiter of a model endpoint with these limits."""
+        key = ((provider, base_url, model), requests_per_minute, tokens_per_minute)
+        with self._lock:
+            if key not in self._limiters:
+                self._limiters[key] = RateLimiter(requests_per_minute, tokens_per_minute)
+            return self._limiters[key]
+
+    def circuit_breaker(self, provider: str, base_url: Optional[str], model: str) -> CircuitBreaker:
+        """The shared circuit breaker of a model endpoint."""
+        key = (provider, base_url, model)
+        with self._lock:
+            if key not in self._breakers:
+                self._breakers[key] = CircuitBreaker()
+            return self._breakers[key]
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The registry's event loop, started on first use."""
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="codedoc-ai", daemon=True).start()
+            return self._loop
+
+    def submit(self, coroutine: Coroutine) -> concurrent.futures.Future:
+        """Schedule a coroutine on the registry loop without waiting for it."""
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    def run(self, coroutine: Coroutine) -> Any:
+        """Run a coroutine on the registry loop and wait for its result.
+
+        Works from plain threads and from code that already runs its own
+        event loop (e.g. the web interface).
+        """
+        return self.submit(coroutine).result()
+
+    def close(self) -> None:
+        """Close every client, forget the limiters and breakers and stop the loop."""
+        with self._lock:
+            sync_clients, async_clients, loop = list(self._sync.values()), list(self._async.values()), self._loop
+            self._sync, self._async, self._loop = {}, {}, None
+            self._limiters, self._breakers = {}, {}
+        for client in sync_clients:
+            client.close()
+        if loop is not None:
+            for client in async_clients:
+                asyncio.run_coroutine_threadsafe(client.close(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+
+
+_registry = ClientRegistry()
+atexit.register(_registry.close)
+
+
+def get_registry() -> ClientRegistry:
+    """The process-wide client registry."""
+    return _registry
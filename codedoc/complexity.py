@@ -0,0 +1,128 @@
+"""
+Complexity Metrics Module 📐
+
+Cheap per-symbol metrics (cyclomatic complexity, lines of code, parameter
+count and nesting depth) computed from the AST the parsers already built,
+used to route simple symbols to cheaper models.
+"""
+
+import ast
+from dataclasses import dataclass
+from typing import Any, Dict, Union
+
+
+@dataclass
+class Complexity:
+    """Complexity metrics of one function or class."""
+    cyclomatic: int
+    loc: int
+    params: int
+    nesting: int
+
+
+# Python nodes that add a branch, and those that open a nested block
+_PY_DECISIONS = (ast.If, ast.For, ast.AsyncFor, ast.While, ast.IfExp, ast.ExceptHandler, ast.comprehension)
+_PY_BLOCKS = (ast.If, ast.For, ast.AsyncFor, ast.While, ast.With, ast.AsyncWith, ast.Try)
+# Match statements exist from Python 3.10
+if hasattr(ast, "match_case"):
+    _PY_DECISIONS += (ast.match_case,)
+    _PY_BLOCKS += (ast.Match,)
+
+_JS_DECISIONS = frozenset({
+    "IfStatement", "ForStatement", "ForInStatement", "ForOfStatement", "WhileStatement", "DoWhileStatement",
+    "ConditionalExpression", "CatchClause",
+})
+_JS_BLOCKS = frozenset({
+    "IfStatement", "ForStatement", "ForInStatement", "ForOfStatement", "WhileStatement", "DoWhileStatement",
+    "TryStatement", "SwitchStatement",
+})
+_JS_LOGICAL_OPERATORS = frozenset({"&&", "||", "??"})
+_JS_SKIPPED_KEYS = frozenset({"loc", "leadingComments", "trailingComments", "innerComments"})
+
+
+def python_complexity(node: Union[ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef]) -> Complexity:
+    """Metrics of a Python function or class node.
+
+    Classes count the branches of all their methods and the parameters of
+    ``__init__``; ``self`` and ``cls`` are not counted as parameters.
+    """
+    cyclomatic, nesting = 1, 0
+
+    def walk(current: ast.AST, depth: int) -> None:
+        nonlocal cyclomatic, nesting
+        for child in ast.iter_child_nodes(current):
+            if isinstance(child, _PY_DECISIONS):
+                cyclomatic += 1
+            if isinstance(child, ast.comprehension):
+                cyclomatic += len(child.ifs)
+            elif isinstance(child, ast.BoolOp):
+                cyclomatic += len(child.values) - 1
+            if isinstance(child, _PY_BLOCKS):
+                nesting = max(nesting, depth + 1)
+                walk(child, depth + 1)
+            else:
+                walk(child, depth)
+
+    walk(node, 0)
+    return Complexity(
+        cyclomatic=cyclomatic,
+        loc=(getattr(node, "end_lineno", None) or node.lineno) - node.lineno + 1,
+        params=_python_params(node),
+        nesting=nesting,
+    )
+
+
+def js_complexity(node: Dict[str, Any]) -> Complexity:
+    """Metrics of a Babel function, arrow function, class or method node."""
+    cyclomatic, nesting = 1, 0
+
+    def walk(value: Any, depth: int) -> None:
+        nonlocal cyclomatic, nesting
+        if isinstance(value, list):
+            for item in value:
+                walk(item, depth)
+            return
+        if not isinstance(value, dict):
+            return
+        node_type = value.get("type")
+        if node_type in _JS_DECISIONS or (node_type == "SwitchCase" and value.get("test") is not None):
+            cyclomatic += 1
+        elif node_type == "LogicalExpression" and value.get("operator") in _JS_LOGICAL_OPERATORS:
+            cyclomatic += 1
+        if node_type in _JS_BLOCKS:
+            depth += 1
+            nesting = max(nesting, depth)
+        for key, child in value.items():
+            if key not in _JS_SKIPPED_KEYS:
+                walk(child, depth)
+
+    walk(node, 0)
+    location = node.get("loc") or {}
+    start = location.get("start", {}).get("line", 1)
+    return Complexity(
+        cyclomatic=cyclomatic,
+        loc=location.get("end", {}).get("line", start) - start + 1,
+        params=_js_params(node),
+        nesting=nesting,
+    )
+
+
+def _python_params(node: ast.AST) -> int:
+    if isinstance(node, ast.ClassDef):
+        init = next((item for item in node.body
+                     if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)) and item.name == "__init__"), None)
+        return _python_params(init) if init else 0
+    arguments = node.args
+    names = [arg.arg for arg in getattr(arguments, "posonlyargs", []) + arguments.args + arguments.kwonlyargs]
+    names += [arg.arg for arg in (arguments.vararg, arguments.kwarg) if arg]
+    return len([name for name in names if name not in ("self", "cls")])
+
+
+def _js_params(node: Dict[str, Any]) -> int:
+    if node.get("type") in ("ClassDeclaration", "ClassExpression"):
+        constructor = next((member for member in node.get("body", {}).get("body", [])
+                            if member.get("kind") == "constructor"), None)
+        return _js_params(constructor) if constructor else 0
+    function = node.get("value") if node.get("type") in ("MethodDefinition", "ClassMethod") else node
+    return len((function or {}).get("params", []))
+
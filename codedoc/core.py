@@ -4,47 +4,195 @@ Core Documentation Generator Module 🚀
 Main orchestrator that combines parsing, AI generation, and output formatting.
 """
 
+import hashlib
+import io
 import os
 import json
+import sqlite3
+from collections import Counter
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Union
+from typing import Callable, Dict, Any, Iterable, Iterator, List, Optional, TextIO, Tuple, Union
 from datetime import datetime
-from jinja2 import Template
 from rich.console import Console
 from rich.progress import track
 from dataclasses import asdict
 
 from .parser import CodeParser
 from .js_parser import JavaScriptParser, JSFileInfo
-from .ai import AIExampleGenerator
+from .ai import AIExampleGenerator, FallbackEnhancement
+from .budget import SkipPolicy
+from .heuristic import HeuristicExampleGenerator
+from .cache import AIResponseCache, DEFAULT_TTL
+from .clients import PoolConfig, get_registry
+from .ratelimit import BudgetExhaustedError, CallBudget, RetryPolicy
+from .batchfile import ingest_batch_results, write_jsonl
+from .routing import ModelRouter
+from .usage import UsageTracker
 from .templates import HTMLTemplate, MarkdownTemplate
+from .shard import select_shard, build_partial, load_partial, merge_partials
+from .store import SymbolStore
+from .index import SymbolIndex
+from .journal import RunJournal, symbol_key
+from .xref import CrossReferenceIndex, symbol_anchor
+from .search import SearchIndexBuilder
+from .site import StaticSiteWriter
 
 
 class DocumentationGenerator:
     """🚀 Main Documentation Generator - The heart of CodeDoc AI."""
     
-    def __init__(self, use_ai: bool = True, ai_provider: str = "openai"):
+    def __init__(
+        self,
+        use_ai: bool = True,
+        ai_provider: str = "openai",
+        spill: bool = False,
+        index_path: Optional[str] = None,
+        search_index: bool = True,
+        dedupe: bool = True,
+        journal_path: Optional[str] = None,
+        resume: bool = False,
+        ai_concurrency: int = 8,
+        ai_api_key: Optional[str] = None,
+        ai_base_url: Optional[str] = None,
+        ai_batch_tokens: int = 2000,
+        ai_max_source_tokens: int = 1500,
+        ai_skip: bool = True,
+        ai_requests_per_minute: Optional[float] = None,
+        ai_tokens_per_minute: Optional[float] = None,
+        ai_max_retries: int = 4,
+        ai_pool: Optional[PoolConfig] = None,
+        ai_stream: bool = False,
+        ai_time_budget: Optional[float] = None,
+        ai_max_calls: Optional[int] = None,
+        ai_deadline: Optional[float] = None,
+        ai_hedge: bool = False,
+        ai_reuse_structures: bool = True,
+        ai_model: str = "gpt-3.5-turbo",
+        ai_router: Optional[ModelRouter] = None,
+        ai_cache: bool = True,
+        ai_cache_path: Optional[str] = None,
+        ai_cache_ttl: Optional[float] = DEFAULT_TTL
+    ):
         """Initialize the documentation generator.
         
         Args:
             use_ai: Whether to use AI for enhancing documentation
-            ai_provider: AI provider to use ('openai', 'anthropic', etc.)
+            ai_provider: ``"openai"``, or ``"heuristic"`` for offline examples,
+                parameter tables and return notes without any API (also used
+                when the OpenAI client cannot be created, e.g. without a key)
+            spill: Keep per-file data of directory runs in an on-disk SQLite
+                store instead of memory, for projects larger than RAM; with an
+                output path, documents are streamed to it and the path is
+                returned instead of the content
+            index_path: Optional SQLite symbol index updated by every run
+            search_index: Write a prebuilt client-side search index next to
+                HTML output files and add a search box to the page
+            dedupe: Parse and enhance byte-identical files of a directory run
+                once and mark the copies as duplicates of the first one
+            journal_path: Append-only journal of the symbol enhancements and
+                file data each run completes (see ``RunJournal``)
+            resume: Reuse what the journal recorded for unchanged files and
+                requests instead of redoing it, e.g. after a crash
+            ai_concurrency: Maximum number of AI requests in flight at once
+            ai_api_key: API key (defaults to ``OPENAI_API_KEY``)
+            ai_base_url: OpenAI-compatible endpoint to use instead of the default
+            ai_batch_tokens: Token budget for packing small symbols of a file
+                into one AI request (0 disables batching)
+            ai_max_source_tokens: Source beyond this estimate is compacted to
+                signatures, docstrings and elided bodies before it is sent
+            ai_skip: Skip AI for test code, richly documented symbols and
+                trivial getters/setters (see ``SkipPolicy``)
+            ai_requests_per_minute: Client-side request rate limit (``None``: unlimited)
+            ai_tokens_per_minute: Client-side token rate limit (``None``: unlimited)
+            ai_max_retries: Retries of rate-limited or failed AI requests, with
+                jittered exponential backoff honoring Retry-After
+            ai_pool: Connection pool limits and timeouts of the AI clients, which
+                are shared by every generator in the process
+            ai_stream: Receive AI completions as streamed chunks
+            ai_time_budget: Seconds per run after which no further AI request is
+                sent; the symbols left out keep their baseline docs. Files are
+                enhanced in discovery order and each file's symbols by priority,
+                so a budget spent early leaves later files without AI
+            ai_max_calls: Maximum AI requests per run, dispatched the same way
+            ai_deadline: Seconds a single AI call may take, retries included,
+                before its symbols get offline heuristic content instead
+            ai_hedge: Duplicate AI requests still unanswered after the p95
+                latency of earlier ones and use whichever answers first
+            ai_reuse_structures: Give symbols that are structurally identical up
+                to names (same ``structure_hash``) the AI output of the first
+                one, renamed, instead of a request of their own
+            ai_model: Model for symbols the router does not route
+            ai_router: Send each symbol to a model (or the offline heuristic)
+                by the complexity metrics the parsers computed
+            ai_cache: Reuse AI responses of earlier runs for unchanged symbols
+            ai_cache_path: Cache database (defaults to the user cache directory)
+            ai_cache_ttl: Seconds a cached response stays valid (``None``: forever)
         """
         self.console = Console()
         self.use_ai = use_ai
+        self.spill = spill
+        self.index_path = index_path
+        self.search_index = search_index
+        self.dedupe = dedupe
+        self.journal_path = journal_path
+        self.resume = resume
+        self.journal: Optional[RunJournal] = None
+        self._symbol_index: Optional[SymbolIndex] = None
+        self.ai_budget: Optional[CallBudget] = None
+        if ai_time_budget is not None or ai_max_calls is not None:
+            self.ai_budget = CallBudget(ai_time_budget, ai_max_calls)
+        # Tokens, latency, retries, cache hits and errors of the AI requests of a run
+        self.ai_usage = UsageTracker(ai_model)
         self.python_parser = CodeParser()
         self.js_parser = JavaScriptParser()
+        if ai_provider not in ("openai", "heuristic"):
+            raise ValueError(f"Unsupported AI provider: {ai_provider}")
         try:
-            self.ai_enhancer = AIExampleGenerator() if use_ai else None
-        except Exception:
-            self.ai_enhancer = None
-            self.use_ai = False
+            self.ai_enhancer = HeuristicExampleGenerator() if ai_provider == "heuristic" else AIExampleGenerator(
+                api_key=ai_api_key,
+                concurrency=ai_concurrency,
+                base_url=ai_base_url,
+                batch_tokens=ai_batch_tokens,
+                max_source_tokens=ai_max_source_tokens,
+                rate_limiter=get_registry().rate_limiter(
+                    AIExampleGenerator.provider, ai_base_url, ai_model, ai_requests_per_minute, ai_tokens_per_minute
+                ),
+                retry_policy=RetryPolicy(max_attempts=ai_max_retries + 1),
+                pool=ai_pool,
+                stream=ai_stream,
+                budget=self.ai_budget,
+                deadline=ai_deadline,
+                hedge=ai_hedge,
+                reuse_structures=ai_reuse_structures,
+                usage=self.ai_usage,
+                model=ai_model,
+                router=ai_router
+            ) if use_ai else None
+        except Exception as e:
+            self.console.print(f"⚠️  AI provider unavailable ({e}); using offline heuristic examples",
+                               style="yellow")
+            self.ai_enhancer = HeuristicExampleGenerator()
+        self.offline = isinstance(self.ai_enhancer, HeuristicExampleGenerator)
+        # Offline enhancement costs nothing, so every symbol gets it
+        self.skip_policy: Optional[SkipPolicy] = SkipPolicy() if ai_skip and not self.offline else None
+        self.ai_skipped: Counter = Counter()
+        self.ai_cache: Optional[AIResponseCache] = None
+        if self.ai_enhancer and ai_cache and not self.offline:
+            try:
+                self.ai_cache = AIResponseCache(ai_cache_path, ttl=ai_cache_ttl)
+                self.ai_enhancer.cache = self.ai_cache
+            except (OSError, sqlite3.Error) as e:
+                self.console.print(f"⚠️  AI cache unavailable ({e}); continuing without it", style="yellow")
         self.html_template = HTMLTemplate()
         self.markdown_template = MarkdownTemplate()
         
         if use_ai:
             try:
-                self.console.print("🤖 AI Generator initialized!", style="green")
+                if self.offline:
+                    self.console.print("🧮 Offline heuristic generator initialized!", style="green")
+                else:
+                    self.console.print("🤖 AI Generator initialized!", style="green")
             except Exception as e:
                 self.console.print(f"⚠️  AI Generator failed to initialize: {str(e)}", style="yellow")
                 self.console.print("📝 Continuing without AI features...", style="yellow")
@@ -58,33 +206,213 @@ class DocumentationGenerator:
         output_format: str = "html",
         output_path: Optional[str] = None,
         include_private: bool = False,
-        language: Optional[str] = None
+        language: Optional[str] = None,
+        shard: Optional[Tuple[int, int]] = None
     ) -> str:
         """Generate documentation for source code.
         
         Args:
             source_path: Path to source file or directory
-            output_format: Output format ('html', 'markdown', 'json')
+            output_format: Output format ('html', 'markdown', 'json', or 'site'
+                for a multi-page static site written into the ``output_path``
+                directory)
             output_path: Optional output path
             include_private: Whether to include private methods/functions
             language: Force specific language ('python', 'javascript', 'typescript')
+            shard: Optional 1-based ``(index, count)``; only that shard's files are
+                documented and a partial JSON result is produced for ``merge_shards``
             
         Returns:
-            Generated documentation as string
+            Generated documentation as string (the index page path for 'site')
         """
+        if self.ai_budget:
+            self.ai_budget.start()
+        self.ai_usage.reset()
+        
         # Determine if it's a file or directory
         path = Path(source_path)
+        if shard and not path.is_dir():
+            raise ValueError("Sharding requires a directory source path")
         if path.is_file():
-            return self._generate_file_documentation(
-                source_path, output_format, output_path, include_private, language
-            )
+            with self._indexing(), self._journaling(include_private, language):
+                return self._generate_file_documentation(
+                    source_path, output_format, output_path, include_private, language
+                )
         elif path.is_dir():
-            return self._generate_directory_documentation(
-                source_path, output_format, output_path, include_private, language
-            )
+            # A full directory run rebuilds the index; shards only upsert their files
+            with self._indexing(rebuild=not shard), self._journaling(include_private, language):
+                return self._generate_directory_documentation(
+                    source_path, output_format, output_path, include_private, language, shard
+                )
         else:
             raise ValueError(f"Invalid source path: {source_path}")
     
+    def generate_documentation_chunks(
+        self,
+        source_path: str,
+        output_format: str = "html",
+        include_private: bool = False,
+        language: Optional[str] = None
+    ) -> Iterator[str]:
+        """Generate documentation for a file and return it in chunks as it is rendered.
+        
+        Parsing and AI enhancement finish before this returns; the document
+        itself is rendered only as the chunks are consumed, so e.g. an HTTP
+        response can start sending it before it is complete.
+        
+        Args:
+            source_path: Path to the source file
+            output_format: Output format ('html', 'markdown', 'json')
+            include_private: Whether to include private methods/functions
+            language: Force specific language ('python', 'javascript', 'typescript')
+            
+        Returns:
+            Iterator over the document's chunks (see ``RENDER_CHUNK_SIZE``)
+        """
+        if not Path(source_path).is_file():
+            raise ValueError("Chunked output requires a file source path")
+        if output_format not in ("html", "markdown", "json"):
+            raise ValueError(f"Unsupported output format: {output_format}")
+        if self.ai_budget:
+            self.ai_budget.start()
+        self.ai_usage.reset()
+        with self._indexing(), self._journaling(include_private, language):
+            return self._file_chunks(source_path, output_format, None, include_private, language)
+    
+    def generate_documentation_stream(
+        self,
+        source_path: str,
+        output_format: str = "html",
+        include_private: bool = False,
+        language: Optional[str] = None
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Generate documentation for a file progressively.
+        
+        The documentation without AI sections is yielded as soon as the file is
+        parsed; each symbol is re-rendered as its AI result arrives, so callers
+        (e.g. the web interface) can show useful docs immediately and patch
+        them in place.
+        
+        Args:
+            source_path: Path to the source file
+            output_format: Output format ('html', 'markdown', 'json')
+            include_private: Whether to include private methods/functions
+            language: Force specific language ('python', 'javascript', 'typescript')
+            
+        Yields:
+            ``(event, payload)`` pairs, in this order:
+            ``("base", {"content"})`` once, then ``("symbol", {"kind", "name",
+            "anchor", "content"})`` per enhanced symbol (``content`` replaces the
+            element with id ``anchor``), then ``("done", {"content"})`` with the
+            complete documentation
+        """
+        if not Path(source_path).is_file():
+            raise ValueError("Streaming requires a file source path")
+        if self.ai_budget:
+            self.ai_budget.start()
+        self.ai_usage.reset()
+        if output_format not in ("html", "markdown", "json"):
+            raise ValueError(f"Unsupported output format: {output_format}")
+        language = language or self._detect_language(source_path)
+        data = self._parse_source(source_path, language, include_private)
+        file_path = str(data.get("file_path", ""))
+        xref = CrossReferenceIndex.build([data])
+        
+        yield "base", {"content": self._render_file(data, output_format, xref)}
+        
+        enhanced_data = dict(data, functions=list(data.get("functions", [])), classes=list(data.get("classes", [])))
+        if self.use_ai and self.ai_enhancer:
+            requests, targets = self._ai_requests(data, language)
+            for position, result in self.ai_enhancer.iter_enhancements(requests):
+                kind, _ = requests[position]
+                key, index = targets[position]
+                if not self._merge_enhancement(enhanced_data[key], index, kind, result):
+                    continue
+                symbol = enhanced_data[key][index]
+                yield "symbol", {
+                    "kind": kind,
+                    "name": symbol["name"],
+                    "anchor": symbol_anchor(file_path, symbol["name"]),
+                    "content": self._render_symbol(kind, symbol, file_path, output_format, xref),
+                }
+        
+        with self._indexing():
+            self._index_file(enhanced_data)
+        yield "done", {"content": self._render_file(enhanced_data, output_format, xref)}
+    
+    def _render_file(self, data: Dict[str, Any], output_format: str, xref: CrossReferenceIndex) -> str:
+        """Render one file's data without writing side files."""
+        if output_format == "html":
+            return self.html_template.render(data, xref)
+        if output_format == "markdown":
+            return self.markdown_template.render(data, xref)
+        return json.dumps(data, indent=2, default=str)
+    
+    def _render_symbol(
+        self,
+        kind: str,
+        symbol: Dict[str, Any],
+        file_path: str,
+        output_format: str,
+        xref: CrossReferenceIndex
+    ) -> str:
+        """Render one function or class in the requested format."""
+        if output_format == "html":
+            return self.html_template.render_symbol(kind, symbol, file_path, xref)
+        if output_format == "markdown":
+            return self.markdown_template.render_symbol(kind, symbol, file_path, xref)
+        return json.dumps(symbol, indent=2, default=str)
+    
+    @contextmanager
+    def _indexing(self, rebuild: bool = False) -> Iterator[None]:
+        """Keep the symbol index open for the duration of a run."""
+        if not self.index_path:
+            yield
+            return
+        
+        with SymbolIndex(self.index_path) as index:
+            if rebuild:
+                index.clear()
+            self._symbol_index = index
+            try:
+                yield
+            finally:
+                self._symbol_index = None
+    
+    @contextmanager
+    def _journaling(self, include_private: bool, language: Optional[str]) -> Iterator[None]:
+        """Keep the run journal open for the duration of a run."""
+        if not self.journal_path:
+            yield
+            return
+        
+        options = {
+            "include_private": include_private,
+            "language": language,
+            "ai": getattr(self.ai_enhancer, "provider", None) if self.use_ai else None,
+            "model": getattr(self.ai_enhancer, "model", None) if self.use_ai else None,
+            "ai_skip": self.skip_policy is not None,
+            "routes": getattr(getattr(self.ai_enhancer, "router", None), "routes", None) if self.use_ai else None,
+            "max_source_tokens": getattr(self.ai_enhancer, "max_source_tokens", None) if self.use_ai else None,
+            "batch_tokens": getattr(self.ai_enhancer, "batch_tokens", None) if self.use_ai else None,
+        }
+        with RunJournal(self.journal_path, resume=self.resume, options=options) as journal:
+            if journal.restarted:
+                self.console.print("⚠️  Journal is from a run with other settings; starting over", style="yellow")
+            self.journal = journal
+            try:
+                yield
+            finally:
+                self.journal = None
+        if journal.reused:
+            self.console.print(f"📓 Resumed {journal.reused['files']} file(s) and {journal.reused['symbols']} "
+                               f"symbol enhancement(s) from the journal", style="dim")
+    
+    def _index_file(self, file_data: Dict[str, Any]) -> None:
+        """Record a finished file in the symbol index, if one is open."""
+        if self._symbol_index is not None:
+            self._symbol_index.add_file(file_data)
+    
     def _generate_file_documentation(
         self, 
         file_path: str, 
@@ -94,19 +422,32 @@ class DocumentationGenerator:
         language: Optional[str]
     ) -> str:
         """Generate documentation for a single file."""
+        if output_format == "site":
+            enhanced_data = self._prepare_file(file_path, include_private, language)
+            combined_data = self._build_project_data(Path(file_path).stem, [enhanced_data])
+            return self._write_site(combined_data, lambda: [enhanced_data], output_path)
+        
+        chunks = self._file_chunks(file_path, output_format, output_path, include_private, language)
+        if not output_path:
+            return "".join(chunks)
+        
+        # Written chunk by chunk as rendered; spilled runs never hold the document
+        written = []
+        with open(output_path, 'w', encoding='utf-8') as f:
+            for chunk in chunks:
+                f.write(chunk)
+                if not self.spill:
+                    written.append(chunk)
+        
+        return output_path if self.spill else "".join(written)
+    
+    def _prepare_file(self, file_path: str, include_private: bool, language: Optional[str]) -> Dict[str, Any]:
+        """Parse and (if enabled) AI-enhance a single file, recording it in the symbol index."""
         # Detect language if not specified
         if not language:
             language = self._detect_language(file_path)
         
-        # Parse the file based on language
-        if language == "python":
-            python_result = self.python_parser.parse_file(file_path)
-            parsed_data = self._prepare_python_data(python_result, file_path, include_private)
-        elif language in ["javascript", "typescript"]:
-            js_file_info = self.js_parser.parse_file(file_path)
-            parsed_data = self._prepare_javascript_data(js_file_info, include_private)
-        else:
-            raise ValueError(f"Unsupported language: {language}")
+        parsed_data = self._parse_source(file_path, language, include_private)
         
         # Enhance with AI if enabled
         if self.use_ai and self.ai_enhancer:
@@ -114,16 +455,65 @@ class DocumentationGenerator:
         else:
             enhanced_data = parsed_data
         
+        self._index_file(enhanced_data)
+        return enhanced_data
+    
+    def _file_chunks(
+        self,
+        file_path: str,
+        output_format: str,
+        output_path: Optional[str],
+        include_private: bool,
+        language: Optional[str]
+    ) -> Iterator[str]:
+        """Prepare a single file and return its document, rendered lazily in chunks."""
+        if output_format not in ("html", "markdown", "json"):
+            raise ValueError(f"Unsupported output format: {output_format}")
+        enhanced_data = self._prepare_file(file_path, include_private, language)
+        
         # Generate output
         if output_format == "html":
-            content = self.html_template.render(enhanced_data)
+            search_url = self._write_search_index([enhanced_data], output_path)
+            return self.html_template.render_chunks(enhanced_data, search_url=search_url)
         elif output_format == "markdown":
-            content = self.markdown_template.render(enhanced_data)
-        elif output_format == "json":
-            import json
-            content = json.dumps(enhanced_data, indent=2, default=str)
+            return self.markdown_template.render_chunks(enhanced_data)
+        return iter([json.dumps(enhanced_data, indent=2, default=str)])
+    
+    def _generate_directory_documentation(
+        self, 
+        dir_path: str, 
+        output_format: str,
+        output_path: Optional[str],
+        include_private: bool,
+        language: Optional[str],
+        shard: Optional[Tuple[int, int]] = None
+    ) -> str:
+        """Generate documentation for all files in a directory."""
+        path = Path(dir_path)
+        all_files_data = []
+        
+        source_files = self._discover_source_files(path, language)
+        if shard:
+            source_files = select_shard(source_files, path, *shard)
+        
+        if self.spill:
+            return self._generate_spilled_documentation(
+                path, source_files, output_format, output_path, include_private, language, shard
+            )
+        
+        for file_data in self._iter_file_data(source_files, language, include_private):
+            all_files_data.append(file_data)
+        
+        if shard:
+            # Shards always emit partial JSON so ``merge`` can rebuild the project
+            partial = build_partial(path.name, all_files_data, *shard)
+            content = json.dumps(partial, indent=2, default=str)
+        elif output_format == "site":
+            combined_data = self._build_project_data(path.name, all_files_data)
+            return self._write_site(combined_data, lambda: all_files_data, output_path)
         else:
-            raise ValueError(f"Unsupported output format: {output_format}")
+            combined_data = self._build_project_data(path.name, all_files_data)
+            content = self._render_project(combined_data, output_format, output_path)
         
         # Save to file if output path specified
         if output_path:
@@ -132,90 +522,406 @@ class DocumentationGenerator:
         
         return content
     
-    def _generate_directory_documentation(
-        self, 
-        dir_path: str, 
+    def _generate_spilled_documentation(
+        self,
+        path: Path,
+        source_files: List[Path],
         output_format: str,
         output_path: Optional[str],
         include_private: bool,
-        language: Optional[str]
+        language: Optional[str],
+        shard: Optional[Tuple[int, int]]
     ) -> str:
-        """Generate documentation for all files in a directory."""
-        path = Path(dir_path)
-        all_files_data = []
+        """Directory run that keeps file data on disk instead of in memory.
+        
+        With an output path the document is streamed straight to the file and
+        the output path is returned; otherwise the rendered content is returned.
+        """
+        with SymbolStore() as store:
+            for file_data in self._iter_file_data(source_files, language, include_private):
+                store.add_file(file_data)
+            
+            if output_format == "site" and not shard:
+                combined_data = self._build_project_data(
+                    path.name, [], total_files=store.count(), languages=store.languages()
+                )
+                return self._write_site(combined_data, store.iter_files, output_path)
+            
+            stream = open(output_path, 'w', encoding='utf-8') if output_path else io.StringIO()
+            try:
+                if shard:
+                    partial = build_partial(path.name, [], *shard)
+                    self._write_json_streaming(stream, partial, store.iter_files())
+                else:
+                    combined_data = self._build_project_data(
+                        path.name, [], total_files=store.count(), languages=store.languages()
+                    )
+                    # Extra passes over the store collect definitions for cross-file
+                    # links and terms for the search index
+                    xref = CrossReferenceIndex.build(store.iter_files())
+                    search_url = None
+                    if output_format == "html":
+                        search_url = self._write_search_index(store.iter_files(), output_path)
+                    self._write_project_streaming(
+                        stream, combined_data, store.iter_files(), output_format, xref, search_url
+                    )
+            finally:
+                if output_path:
+                    stream.close()
+        
+        return output_path if output_path else stream.getvalue()
+    
+    def _write_project_streaming(
+        self,
+        stream: TextIO,
+        combined_data: Dict[str, Any],
+        files: Iterable[Dict[str, Any]],
+        output_format: str,
+        xref: Optional[CrossReferenceIndex] = None,
+        search_url: Optional[str] = None
+    ) -> None:
+        """Render project output file by file, matching ``_render_project``."""
+        if output_format == "json":
+            self._write_json_streaming(stream, combined_data, files)
+            return
+        
+        if output_format == "html":
+            for chunk in self.html_template.render_project_chunks(combined_data, files, xref, search_url):
+                stream.write(chunk)
+            return
+        
+        if output_format != "markdown":
+            raise ValueError(f"Unsupported output format: {output_format}")
+        
+        for index, file_data in enumerate(files):
+            if index:
+                stream.write("\n\n")
+            self.markdown_template.render_to(stream, file_data, xref)
+    
+    def _write_json_streaming(
+        self,
+        stream: TextIO,
+        data: Dict[str, Any],
+        files: Iterable[Dict[str, Any]]
+    ) -> None:
+        """Write ``data`` as indented JSON with its ``files`` list taken from an iterator."""
+        marker = json.dumps("__codedoc_files__")
+        envelope = json.dumps(
+            {key: ("__codedoc_files__" if key == "files" else value) for key, value in data.items()},
+            indent=2,
+            default=str
+        )
+        before, after = envelope.split(marker, 1)
+        
+        stream.write(before + "[")
+        wrote_any = False
+        for file_data in files:
+            stream.write(",\n    " if wrote_any else "\n    ")
+            stream.write(json.dumps(file_data, indent=2, default=str).replace("\n", "\n    "))
+            wrote_any = True
+        stream.write("\n  ]" if wrote_any else "]")
+        stream.write(after)
+    
+    def merge_shards(
+        self,
+        shard_paths: List[str],
+        output_format: str = "html",
+        output_path: Optional[str] = None
+    ) -> str:
+        """Merge partial results from ``--shard`` runs into project documentation.
+        
+        Args:
+            shard_paths: Paths of the partial JSON results, one per shard
+            output_format: Output format ('html', 'markdown', 'json', 'site')
+            output_path: Optional output path (a directory for 'site')
+            
+        Returns:
+            Generated documentation as string (the index page path for 'site')
+        """
+        partials = [load_partial(shard_path) for shard_path in shard_paths]
+        project_name, files = merge_partials(partials)
+        
+        with self._indexing(rebuild=True):
+            for file_data in files:
+                self._index_file(file_data)
+        
+        combined_data = self._build_project_data(project_name, files)
+        if output_format == "site":
+            return self._write_site(combined_data, lambda: files, output_path)
+        content = self._render_project(combined_data, output_format, output_path)
+        
+        if output_path:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+        
+        return content
+    
+    def prepare_ai_batch(
+        self,
+        source_path: str,
+        batch_path: str,
+        include_private: bool = False,
+        language: Optional[str] = None
+    ) -> int:
+        """Write the AI requests a run over ``source_path`` would send as a JSONL batch file.
+        
+        Symbols the skip policy rejects, cached symbols and symbols answered
+        without a request are left out. Process the file with the OpenAI Batch
+        API (or ``process_batch_file``), load the results with
+        ``ingest_ai_batch`` and run again to render from the cache.
         
-        # Find all supported source files
+        Returns:
+            Number of requests written
+        """
+        if not isinstance(self.ai_enhancer, AIExampleGenerator):
+            raise ValueError("Batch files need AI enhancement with the OpenAI provider")
+        
+        path = Path(source_path)
+        if path.is_file():
+            source_files = [path]
+        elif path.is_dir():
+            source_files = self._discover_source_files(path, language)
+        else:
+            raise ValueError(f"Invalid source path: {source_path}")
+        
+        requests = []
+        for file_path in source_files:
+            file_lang = language or self._detect_language(str(file_path))
+            if file_lang not in ("python", "javascript", "typescript"):
+                continue
+            try:
+                file_data = self._parse_source(str(file_path), file_lang, include_private)
+            except Exception as e:
+                print(f"Warning: Failed to process {file_path}: {e}")
+                continue
+            requests.extend(self._ai_requests(file_data, file_lang)[0])
+        
+        return write_jsonl(self.ai_enhancer.batch_requests(requests), batch_path)
+    
+    def ingest_ai_batch(self, results_path: str) -> Dict[str, int]:
+        """Store the answers of a batch results file in the AI response cache.
+        
+        Returns:
+            Counts of ``ingested`` and ``failed`` results
+        """
+        if not self.ai_cache:
+            raise ValueError("Ingesting batch results needs the AI response cache")
+        return ingest_batch_results(results_path, self.ai_cache)
+    
+    def close(self) -> None:
+        """Release the AI enhancer and close the AI response cache.
+        
+        Long-lived processes such as the web interface create a generator
+        per request and must close it, or every request leaks a database
+        connection.
+        """
+        if self.ai_enhancer:
+            self.ai_enhancer.close()
+        if self.ai_cache:
+            self.ai_cache.close()
+            self.ai_cache = None
+    
+    def _discover_source_files(self, path: Path, language: Optional[str]) -> List[Path]:
+        """Find all supported source files below ``path`` in a stable order."""
         if language == "python":
-            pattern = "**/*.py"
+            patterns = ["**/*.py"]
         elif language == "javascript":
-            pattern = "**/*.js"
+            patterns = ["**/*.js"]
         elif language == "typescript":
-            pattern = "**/*.ts"
+            patterns = ["**/*.ts"]
         else:
             # Auto-detect: include all supported extensions
-            python_files = list(path.glob("**/*.py"))
-            js_files = list(path.glob("**/*.js"))
-            ts_files = list(path.glob("**/*.ts"))
-            all_source_files = python_files + js_files + ts_files
+            patterns = ["**/*.py", "**/*.js", "**/*.ts"]
         
-        if language:
-            source_files = list(path.glob(pattern))
-        else:
-            source_files = all_source_files
+        source_files = []
+        for pattern in patterns:
+            for file_path in path.glob(pattern):
+                # Skip __pycache__ and similar directories
+                relative_parts = file_path.relative_to(path).parts
+                if any(part.startswith('.') or part == '__pycache__' for part in relative_parts):
+                    continue
+                source_files.append(file_path)
         
+        # Sorted so every run (and every shard) sees the same order
+        return sorted(source_files, key=lambda file_path: file_path.parts)
+    
+    def _hash_files(self, source_files: List[Path]) -> Dict[Path, str]:
+        """Content digests of the files, qualified by extension (which selects the parser)."""
+        digests = {}
         for file_path in source_files:
+            sha = hashlib.sha256()
             try:
-                # Skip __pycache__ and similar directories
-                if any(part.startswith('.') or part == '__pycache__' for part in file_path.parts):
-                    continue
-                
-                file_lang = language or self._detect_language(str(file_path))
-                
-                # Parse based on detected language
-                if file_lang == "python":
-                    python_result = self.python_parser.parse_file(str(file_path))
-                    file_data = self._prepare_python_data(python_result, str(file_path), include_private)
-                elif file_lang in ["javascript", "typescript"]:
-                    js_file_info = self.js_parser.parse_file(str(file_path))
-                    file_data = self._prepare_javascript_data(js_file_info, include_private)
-                else:
-                    continue  # Skip unsupported files
-                
-                # Enhance with AI if enabled
-                if self.use_ai and self.ai_enhancer:
-                    file_data = self._enhance_with_ai(file_data, file_lang)
-                
-                all_files_data.append(file_data)
+                with open(file_path, 'rb') as f:
+                    for chunk in iter(lambda: f.read(1 << 20), b''):
+                        sha.update(chunk)
+            except OSError:
+                continue
+            digests[file_path] = f"{file_path.suffix.lower()}:{sha.hexdigest()}"
+        return digests
+    
+    def _iter_file_data(
+        self,
+        source_files: List[Path],
+        language: Optional[str],
+        include_private: bool
+    ) -> Iterator[Dict[str, Any]]:
+        """Process files in order, doing the heavy work once per distinct content.
+        
+        Byte-identical copies reuse the data of the first file with the same
+        content and are marked ``duplicate_of`` it. Only data that still has
+        copies pending is kept around.
+        """
+        digests = self._hash_files(source_files) if self.dedupe else {}
+        pending = Counter(digests.values())
+        originals: Dict[str, Tuple[str, Optional[Dict[str, Any]]]] = {}
+        reused = 0
+        
+        for file_path in source_files:
+            digest = digests.get(file_path)
+            if digest:
+                pending[digest] -= 1
+            
+            if digest in originals:
+                original_path, original_data = originals[digest]
+                if not pending[digest]:
+                    del originals[digest]
+                if original_data is None:
+                    continue  # The original failed to process; so would the copy
                 
-            except Exception as e:
-                print(f"Warning: Failed to process {file_path}: {e}")
+                duplicate = dict(original_data, file_path=str(file_path), duplicate_of=original_path)
+                self._index_file(duplicate)
+                reused += 1
+                yield duplicate
                 continue
+            
+            file_data = self._process_file(file_path, language, include_private, digest)
+            if digest and pending[digest]:
+                originals[digest] = (str(file_path), file_data)
+            if file_data is not None:
+                yield file_data
         
-        # Combine all file data
-        combined_data = {
-            "project_name": path.name,
-            "files": all_files_data,
-            "total_files": len(all_files_data),
-            "languages": list(set(file_data.get("language", "unknown") for file_data in all_files_data))
-        }
+        if reused:
+            self.console.print(f"♻️  Reused results for {reused} duplicate file(s)", style="dim")
+    
+    def _process_file(
+        self,
+        file_path: Path,
+        language: Optional[str],
+        include_private: bool,
+        digest: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Parse, prepare and enhance a single file of a directory run.
         
-        # Generate output
+        With a journal, the data of a file whose content (``digest``) is
+        unchanged since it was journaled is reused as is.
+        """
+        try:
+            file_lang = language or self._detect_language(str(file_path))
+            
+            if file_lang not in ("python", "javascript", "typescript"):
+                return None  # Skip unsupported files
+            if self.journal is not None:
+                digest = digest or self._hash_files([file_path]).get(file_path)
+                journaled = self.journal.file(str(file_path), digest) if digest else None
+                if journaled is not None:
+                    self._index_file(journaled)
+                    return journaled
+            file_data = self._parse_source(str(file_path), file_lang, include_private)
+            fallbacks = self.ai_usage.fallbacks[str(file_data.get("file_path", ""))]
+            
+            # Enhance with AI if enabled
+            if self.use_ai and self.ai_enhancer:
+                file_data = self._enhance_with_ai(file_data, file_lang)
+            
+            self._index_file(file_data)
+            # A file with deadline fallbacks is not finished: a resumed run redoes it
+            complete = self.ai_usage.fallbacks[str(file_data.get("file_path", ""))] == fallbacks
+            if self.journal is not None and digest and complete:
+                self.journal.record_file(str(file_path), digest, file_data)
+            return file_data
+            
+        except Exception as e:
+            print(f"Warning: Failed to process {file_path}: {e}")
+            return None
+    
+    def _parse_source(self, file_path: str, language: str, include_private: bool) -> Dict[str, Any]:
+        """Parse a file with the parser for ``language`` and prepare its data."""
+        if language == "python":
+            python_result = self.python_parser.parse_file(file_path)
+            return self._prepare_python_data(python_result, file_path, include_private)
+        elif language in ["javascript", "typescript"]:
+            js_file_info = self.js_parser.parse_file(file_path)
+            return self._prepare_javascript_data(js_file_info, include_private)
+        else:
+            raise ValueError(f"Unsupported language: {language}")
+    
+    def _build_project_data(
+        self,
+        project_name: str,
+        files: List[Dict[str, Any]],
+        total_files: Optional[int] = None,
+        languages: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Combine per-file data into the project-level structure.
+        
+        ``total_files`` and ``languages`` may be passed in when ``files`` is not
+        held in memory (spilled runs aggregate them from the store).
+        """
+        if total_files is None:
+            total_files = len(files)
+        if languages is None:
+            languages = sorted(set(file_data.get("language", "unknown") for file_data in files))
+        return {
+            "project_name": project_name,
+            "files": files,
+            "total_files": total_files,
+            "languages": languages
+        }
+    
+    def _render_project(
+        self,
+        combined_data: Dict[str, Any],
+        output_format: str,
+        output_path: Optional[str] = None
+    ) -> str:
+        """Render combined project data in the requested format."""
         if output_format == "html":
-            content = self.html_template.render_project(combined_data)
+            search_url = self._write_search_index(combined_data["files"], output_path)
+            return self.html_template.render_project(combined_data, search_url=search_url)
         elif output_format == "markdown":
-            content = self.markdown_template.render_project(combined_data)
+            return self.markdown_template.render_project(combined_data)
         elif output_format == "json":
-            import json
-            content = json.dumps(combined_data, indent=2, default=str)
+            return json.dumps(combined_data, indent=2, default=str)
         else:
             raise ValueError(f"Unsupported output format: {output_format}")
+    
+    def _write_site(
+        self,
+        combined_data: Dict[str, Any],
+        files: Callable[[], Iterable[Dict[str, Any]]],
+        output_path: Optional[str]
+    ) -> str:
+        """Write a multi-page static site into the ``output_path`` directory.
         
-        # Save to file if output path specified
-        if output_path:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+        Returns the path of the site's index page.
+        """
+        if not output_path:
+            raise ValueError("Site output requires an output directory")
+        return StaticSiteWriter(search_index=self.search_index).write(output_path, combined_data, files)
+    
+    def _write_search_index(self, files: Iterable[Dict[str, Any]], output_path: Optional[str]) -> Optional[str]:
+        """Write the client-side search index beside an HTML output file.
         
-        return content
+        Returns the index location relative to the page, or None when search
+        is disabled or there is no output file to put it next to.
+        """
+        if not self.search_index or not output_path:
+            return None
+        
+        output = Path(output_path)
+        index_dir = output.with_name(f"{output.stem}-search")
+        SearchIndexBuilder.build(files).write(str(index_dir))
+        return index_dir.name
     
     def _detect_language(self, file_path: str) -> str:
         """Detect programming language from file extension."""
@@ -252,7 +958,7 @@ class DocumentationGenerator:
             "file_path": file_path,
             "functions": [asdict(f) for f in functions],
             "classes": [asdict(c) for c in classes],
-            "imports": [],  # CodeParser doesn't extract imports yet
+            "imports": python_result.get('imports', []),
             "total_functions": len(functions),
             "total_classes": len(classes)
         }
@@ -285,63 +991,122 @@ class DocumentationGenerator:
         }
     
     def _enhance_with_ai(self, data: Dict[str, Any], language: str) -> Dict[str, Any]:
-        """Enhance documentation data with AI-generated content."""
-        enhanced_data = data.copy()
+        """Enhance documentation data with AI-generated content.
         
-        # Enhance functions
-        enhanced_functions = []
-        for func_data in data.get("functions", []):
-            try:
-                if language == "python":
-                    enhanced_func = self.ai_enhancer.enhance_function_documentation(
-                        func_data["name"],
-                        func_data["params"],
-                        func_data.get("docstring"),
-                        func_data["source_code"],
-                        language="python",
-                        return_type=func_data.get("return_type")
-                    )
-                else:  # JavaScript/TypeScript
-                    enhanced_func = self.ai_enhancer.enhance_function_documentation(
-                        func_data["name"],
-                        func_data["params"],
-                        func_data.get("docstring"),
-                        func_data["source_code"],
-                        language=language,
-                        return_type=func_data.get("return_type"),
-                        is_async=func_data.get("is_async", False)
-                    )
-                
-                # Merge with original data
-                func_data.update(enhanced_func)
-                enhanced_functions.append(func_data)
-                
-            except Exception as e:
-                print(f"Warning: Failed to enhance function {func_data['name']}: {e}")
-                enhanced_functions.append(func_data)
+        All functions and classes of the file are sent concurrently (bounded by
+        ``ai_concurrency``) and the results are merged back in source order.
+        """
+        enhanced_data = dict(data, functions=list(data.get("functions", [])), classes=list(data.get("classes", [])))
+        requests, targets = self._ai_requests(data, language)
+        if self.journal is not None:
+            results = self._enhance_journaled(requests)
+        else:
+            results = self.ai_enhancer.enhance_many(requests)
         
-        enhanced_data["functions"] = enhanced_functions
+        for (kind, _), (key, index), result in zip(requests, targets, results):
+            self._merge_enhancement(enhanced_data[key], index, kind, result)
         
-        # Enhance classes
-        enhanced_classes = []
-        for class_data in data.get("classes", []):
-            try:
-                enhanced_class = self.ai_enhancer.enhance_class_documentation(
-                    class_data["name"],
-                    [m["name"] for m in class_data.get("methods", [])],
-                    class_data.get("docstring"),
-                    class_data["source_code"],
-                    language=language
-                )
-                
-                # Merge with original data
-                class_data.update(enhanced_class)
-                enhanced_classes.append(class_data)
-                
-            except Exception as e:
-                print(f"Warning: Failed to enhance class {class_data['name']}: {e}")
-                enhanced_classes.append(class_data)
+        return enhanced_data
+    
+    def _enhance_journaled(self, requests: List[Tuple[str, Dict[str, Any]]]) -> List[Any]:
+        """``enhance_many`` that reuses journaled results and journals each new one as it arrives."""
+        results: List[Any] = [None] * len(requests)
+        keys = [symbol_key(kind, kwargs) for kind, kwargs in requests]
+        todo = []
+        for position, key in enumerate(keys):
+            results[position] = self.journal.symbol(key)
+            if results[position] is None:
+                todo.append(position)
+        
+        for index, result in self.ai_enhancer.iter_enhancements([requests[position] for position in todo]):
+            results[todo[index]] = result
+            # Deadline fallbacks are left out, so a resumed run asks the provider again
+            if not isinstance(result, (Exception, FallbackEnhancement)):
+                self.journal.record_symbol(keys[todo[index]], result)
+        return results
+    
+    def _ai_requests(
+        self,
+        data: Dict[str, Any],
+        language: str
+    ) -> Tuple[List[Tuple[str, Dict[str, Any]]], List[Tuple[str, int]]]:
+        """Build the AI requests for a file's symbols that the skip policy lets through.
         
-        enhanced_data["classes"] = enhanced_classes
+        Requests are ordered by ``_ai_priority`` so that, under a budget, the
+        symbols of this file that gain most from AI are sent first. The order
+        is per file: files are parsed, enhanced and streamed out one at a time
+        (spilled runs never hold the whole project), so the budget is not
+        shared by priority across files.
         
-        return enhanced_data 
\ No newline at end of file
+        Returns:
+            The ``enhance_many`` requests, and for each one the ``("functions" |
+            "classes", index)`` of its symbol in ``data``
+        """
+        file_path = str(data.get("file_path", ""))
+        requests, targets = [], []
+        for index, func_data in enumerate(data.get("functions", [])):
+            if self._skip_reason("function", func_data, file_path, language):
+                continue
+            requests.append(("function", {
+                "file_path": file_path,
+                "name": func_data["name"],
+                "params": func_data.get("params", func_data.get("args", [])),
+                "docstring": func_data.get("docstring"),
+                "source_code": func_data.get("source_code", ""),
+                "language": language,
+                "return_type": func_data.get("return_type") or func_data.get("return_annotation"),
+                "is_async": func_data.get("is_async", False),
+                "structure_hash": func_data.get("structure_hash"),
+                "complexity": func_data.get("complexity"),
+                "jsdoc_tags": func_data.get("jsdoc_tags")
+            }))
+            targets.append(("functions", index))
+        for index, class_data in enumerate(data.get("classes", [])):
+            if self._skip_reason("class", class_data, file_path, language):
+                continue
+            requests.append(("class", {
+                "file_path": file_path,
+                "name": class_data["name"],
+                "methods": [m["name"] for m in class_data.get("methods", [])],
+                "docstring": class_data.get("docstring"),
+                "source_code": class_data.get("source_code", ""),
+                "language": language,
+                "structure_hash": class_data.get("structure_hash"),
+                "complexity": class_data.get("complexity"),
+                "jsdoc_tags": class_data.get("jsdoc_tags")
+            }))
+            targets.append(("classes", index))
+        
+        exports = set(data.get("exports") or [])
+        order = sorted(range(len(requests)), key=lambda i: self._ai_priority(
+            data[targets[i][0]][targets[i][1]], exports
+        ))
+        return [requests[i] for i in order], [targets[i] for i in order]
+    
+    def _ai_priority(self, symbol: Dict[str, Any], exports: Iterable[str]) -> Tuple[bool, bool, bool, int]:
+        """Sort key for AI requests: public, undocumented, exported and larger symbols first."""
+        exported = bool(symbol.get("is_exported")) or symbol["name"] in exports
+        return (
+            symbol["name"].startswith("_"),
+            bool(symbol.get("docstring")),
+            not exported,
+            -len(symbol.get("source_code") or "")
+        )
+    
+    def _skip_reason(self, kind: str, symbol: Dict[str, Any], file_path: str, language: str) -> Optional[str]:
+        """Why the skip policy leaves ``symbol`` alone (counted in ``ai_skipped``), if it does."""
+        reason = self.skip_policy.reason(kind, symbol, file_path, language) if self.skip_policy else None
+        if reason:
+            self.ai_skipped[reason] += 1
+        return reason
+    
+    def _merge_enhancement(self, symbols: List[Dict[str, Any]], index: int, kind: str, result: Any) -> bool:
+        """Merge one AI result into ``symbols[index]``; returns whether it succeeded."""
+        if isinstance(result, BudgetExhaustedError):
+            self.ai_skipped["budget"] += 1
+            return False
+        if isinstance(result, Exception):
+            print(f"Warning: Failed to enhance {kind} {symbols[index]['name']}: {result}")
+            return False
+        symbols[index] = dict(symbols[index], **result)
+        return True
@@ -0,0 +1,372 @@
+"""
+Heuristic Example Generator Module 🧮
+
+Offline stand-in for the AI provider: usage examples, parameter tables and
+return-value notes synthesized from signatures, annotations, defaults,
+docstring sections and JSDoc tags, in microseconds per symbol.
+"""
+
+import ast
+import re
+import textwrap
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import astunparse
+
+from .parser import ClassInfo, FunctionInfo
+
+
+# Placeholder values for required arguments, by annotation and by parameter name
+_TYPE_PLACEHOLDERS = {
+    "int": "1", "float": "1.0", "complex": "1j", "str": '"text"', "bytes": 'b"data"', "bool": "True",
+    "list": "[]", "dict": "{}", "set": "set()", "tuple": "()", "none": "None",
+    "number": "1", "string": '"text"', "boolean": "true", "array": "[]", "object": "{}",
+}
+_NAME_PLACEHOLDERS = [
+    (re.compile(r"(^|_)(path|file|filename|dir|directory)$", re.IGNORECASE), '"path/to/file"'),
+    (re.compile(r"(^|_)(url|uri|endpoint)$", re.IGNORECASE), '"https://example.com"'),
+    (re.compile(r"(^|_)(name|title|label|text|message|key)$", re.IGNORECASE), '"example"'),
+    (re.compile(r"(^|_)(id|count|size|limit|index|n|num|number)$", re.IGNORECASE), "1"),
+    (re.compile(r"^(is|has|should|enable|use)(_|[A-Z])"), "True"),
+]
+
+_GOOGLE_SECTION = re.compile(r"^\s*(Args|Arguments|Parameters|Params|Returns?|Yields?|Raises|Examples?)\s*:\s*$",
+                             re.IGNORECASE)
+_GOOGLE_PARAM = re.compile(r"^\s*\*{0,2}(\w+)\s*(?:\(([^)]*)\))?\s*:\s*(.*)$")
+_REST_FIELD = re.compile(r"^\s*:(param|type|returns?|rtype)\s*(\w+)?\s*:\s*(.*)$")
+_JSDOC_TYPED = re.compile(r"^\s*(?:\{([^}]*)\})?\s*(.*)$", re.DOTALL)
+
+_RESULT_VARIABLES = {"python": "result", "javascript": "const result", "typescript": "const result"}
+
+
+class HeuristicExampleGenerator:
+    """🧮 Offline example generator with the interface of ``AIExampleGenerator``."""
+
+    provider = "heuristic"
+
+    def __init__(self):
+        """Create the generator; it needs no key, network or cache."""
+        self.cache = None
+        self.structure_reuses = 0
+
+    def enhance_function_documentation(
+        self,
+        name: str,
+        params: List[str],
+        docstring: Optional[str],
+        source_code: str,
+        language: str = "python",
+        return_type: Optional[str] = None,
+        is_async: bool = False,
+        jsdoc_tags: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Synthesize examples, a parameter table and a return note for a function.
+
+        Returns:
+            ``examples`` plus ``parameters`` (name, type, default, description)
+            and ``returns`` (type, description) where anything is known
+        """
+        parameters = self._parameters(params, docstring, source_code, language, jsdoc_tags)
+        returns = self._returns(return_type, docstring, source_code, language, jsdoc_tags)
+
+        call = f"{name}({self._arguments(parameters, language)})"
+        if is_async:
+            call = f"await {call}"
+        if returns and (returns.get("type") or "").lower() in ("none", "void"):
+            example = call
+        else:
+            example = f"{_RESULT_VARIABLES.get(language, 'result')} = {call}"
+        if language != "python":
+            example += ";"
+
+        examples = self._docstring_examples(docstring, jsdoc_tags) or [example]
+        result: Dict[str, Any] = {"examples": examples}
+        if parameters:
+            result["parameters"] = parameters
+        if returns:
+            result["returns"] = returns
+        return result
+
+    def enhance_class_documentation(
+        self,
+        name: str,
+        methods: List[str],
+        docstring: Optional[str],
+        source_code: str,
+        language: str = "python",
+        jsdoc_tags: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Synthesize an example that constructs the class and calls its public methods."""
+        constructor, signatures = self._class_signatures(source_code, language)
+        if language == "python":
+            instance = re.sub(r"(?<!^)(?=[A-Z])", "_", name).lower()
+        else:
+            instance = name[:1].lower() + name[1:]
+        if instance == name:
+            instance = f"{instance}_instance" if language == "python" else f"{instance}Instance"
+
+        arguments = self._arguments(self._parameters(constructor, None, "", language, None), language)
+        if language == "python":
+            lines = [f"{instance} = {name}({arguments})"]
+        else:
+            lines = [f"const {instance} = new {name}({arguments});"]
+        for method in methods:
+            if method.startswith("_") or method in ("__init__", "constructor"):
+                continue
+            params = self._parameters(signatures.get(method, []), None, "", language, None)
+            call = f"{instance}.{method}({self._arguments(params, language)})"
+            lines.append(call if language == "python" else f"{call};")
+
+        return {"examples": self._docstring_examples(docstring, jsdoc_tags) or ["\n".join(lines)]}
+
+    async def aenhance_function_documentation(self, *args: Any, **kwargs: Any) -> Dict[str, Any]:
+        """Async version of ``enhance_function_documentation``."""
+        return self.enhance_function_documentation(*args, **kwargs)
+
+    async def aenhance_class_documentation(self, *args: Any, **kwargs: Any) -> Dict[str, Any]:
+        """Async version of ``enhance_class_documentation``."""
+        return self.enhance_class_documentation(*args, **kwargs)
+
+    def enhance_many(self, requests: Sequence[Tuple[str, Dict[str, Any]]]) -> List[Any]:
+        """Enhance every request (see ``AIExampleGenerator.enhance_many``)."""
+        results: List[Any] = [None] * len(requests)
+        for position, result in self.iter_enhancements(requests):
+            results[position] = result
+        return results
+
+    def iter_enhancements(self, requests: Sequence[Tuple[str, Dict[str, Any]]]) -> Iterator[Tuple[int, Any]]:
+        """Yield ``(position, result)`` per request, in request order."""
+        for position, (kind, kwargs) in enumerate(requests):
+            try:
+                yield position, self._enhance(kind, kwargs)
+            except Exception as e:
+                yield position, e
+
+    def generate_function_examples(self, function: FunctionInfo) -> Dict[str, Any]:
+        """Generate examples for a parsed Python function."""
+        return self.enhance_function_documentation(
+            function.name, function.args, function.docstring, function.source_code,
+            return_type=function.return_annotation
+        )
+
+    def generate_class_examples(self, class_info: ClassInfo) -> Dict[str, Any]:
+        """Generate examples for a parsed Python class."""
+        return self.enhance_class_documentation(
+            class_info.name, [method.name for method in class_info.methods],
+            class_info.docstring, class_info.source_code
+        )
+
+    def close(self) -> None:
+        """Nothing to release; present for interface parity."""
+
+    def _enhance(self, kind: str, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Dispatch one ``enhance_many`` request, ignoring keys only the AI provider uses."""
+        if kind == "class":
+            return self.enhance_class_documentation(
+                kwargs["name"], kwargs.get("methods", []), kwargs.get("docstring"), kwargs.get("source_code", ""),
+                kwargs.get("language", "python"), kwargs.get("jsdoc_tags")
+            )
+        return self.enhance_function_documentation(
+            kwargs["name"], kwargs.get("params", []), kwargs.get("docstring"), kwargs.get("source_code", ""),
+            kwargs.get("language", "python"), kwargs.get("return_type"), kwargs.get("is_async", False),
+            kwargs.get("jsdoc_tags")
+        )
+
+    def _parameters(
+        self,
+        params: Sequence[str],
+        docstring: Optional[str],
+        source_code: str,
+        language: str,
+        jsdoc_tags: Optional[Dict[str, Any]]
+    ) -> List[Dict[str, Optional[str]]]:
+        """Parameter table rows from the signature, annotations, defaults and documentation."""
+        described = self._docstring_params(docstring)
+        tags = (jsdoc_tags or {}).get("param") or []
+        for tag in [tags] if isinstance(tags, str) else tags:
+            match = _JSDOC_TYPED.match(str(tag))
+            words = match.group(2).split(None, 1)
+            if words:
+                described.setdefault(words[0].strip("[]").split("=")[0], (
+                    match.group(1), words[1].lstrip("- ") if len(words) > 1 else None
+                ))
+
+        signature = _python_signature(source_code) if language == "python" else None
+        rows = []
+        for param in params:
+            name, _, default = str(param).partition("=")
+            name = name.strip()
+            annotation, python_default = signature.get(name, (None, None)) if signature else (None, None)
+            if name in ("self", "cls"):
+                continue
+            doc_type, description = described.get(name.lstrip("*"), (None, None))
+            rows.append({
+                "name": name,
+                "type": annotation or doc_type,
+                "default": python_default or (default.strip() or None),
+                "description": description,
+            })
+        return rows
+
+    def _returns(
+        self,
+        return_type: Optional[str],
+        docstring: Optional[str],
+        source_code: str,
+        language: str,
+        jsdoc_tags: Optional[Dict[str, Any]]
+    ) -> Optional[Dict[str, Optional[str]]]:
+        """Return-value note from the annotation and the documented return section."""
+        doc_type, description = _docstring_returns(docstring)
+        if jsdoc_tags:
+            tag = jsdoc_tags.get("returns") or jsdoc_tags.get("return")
+            if isinstance(tag, str):
+                match = _JSDOC_TYPED.match(tag)
+                doc_type, description = match.group(1) or doc_type, match.group(2).strip() or description
+        if not return_type and language == "python":
+            return_type = (_python_signature(source_code) or {}).get("return", (None, None))[0]
+        if not (return_type or doc_type or description):
+            return None
+        return {"type": return_type or doc_type, "description": description}
+
+    def _arguments(self, parameters: List[Dict[str, Optional[str]]], language: str) -> str:
+        """Call arguments for the required parameters (those without a default)."""
+        arguments = []
+        for row in parameters:
+            if row["default"] is not None or row["name"].startswith("*") or row["name"].startswith("..."):
+                continue
+            arguments.append(_placeholder(row["name"], row["type"], language))
+        return ", ".join(arguments)
+
+    def _docstring_params(self, docstring: Optional[str]) -> Dict[str, Tuple[Optional[str], Optional[str]]]:
+        """``name -> (type, description)`` from Google-style Args or reST ``:param:`` fields."""
+        described: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+        for line in _section_lines(docstring, ("args", "arguments", "parameters", "params")):
+            match = _GOOGLE_PARAM.match(line)
+            if match:
+                described[match.group(1)] = (match.group(2), match.group(3).strip() or None)
+        for field, name, text in _rest_fields(docstring):
+            if field == "param" and name:
+                described[name] = (described.get(name, (None, None))[0], text or None)
+            elif field == "type" and name:
+                described[name] = (text or None, described.get(name, (None, None))[1])
+        return described
+
+    def _docstring_examples(self, docstring: Optional[str], jsdoc_tags: Optional[Dict[str, Any]]) -> List[str]:
+        """Examples the author already wrote (``Example:`` sections, doctests, ``@example``)."""
+        if jsdoc_tags and jsdoc_tags.get("example"):
+            return [str(jsdoc_tags["example"]).strip()]
+        lines = _section_lines(docstring, ("example", "examples"), keep_indent=True)
+        if lines:
+            return [textwrap.dedent("\n".join(lines)).strip()]
+        doctest = [line.strip()[4:] for line in (docstring or "").splitlines() if line.strip().startswith(">>> ")]
+        return ["\n".join(doctest)] if doctest else []
+
+    def _class_signatures(self, source_code: str, language: str) -> Tuple[List[str], Dict[str, List[str]]]:
+        """Constructor parameters and per-method parameters of a Python class source."""
+        if language != "python":
+            return [], {}
+        try:
+            tree = ast.parse(textwrap.dedent(source_code))
+        except SyntaxError:
+            return [], {}
+        classes = [node for node in tree.body if isinstance(node, ast.ClassDef)]
+        if not classes:
+            return [], {}
+        signatures = {}
+        for item in classes[0].body:
+            if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                args = item.args.args
+                defaults = [None] * (len(args) - len(item.args.defaults)) + list(item.args.defaults)
+                signatures[item.name] = [
+                    arg.arg if default is None else f"{arg.arg}={_unparse(default)}"
+                    for arg, default in zip(args, defaults)
+                ]
+        return signatures.get("__init__", []), signatures
+
+
+def _python_signature(source_code: str) -> Optional[Dict[str, Tuple[Optional[str], Optional[str]]]]:
+    """``name -> (annotation, default)`` of the first function in ``source_code``, plus ``"return"``."""
+    try:
+        tree = ast.parse(textwrap.dedent(source_code))
+    except SyntaxError:
+        return None
+    functions = [node for node in tree.body if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))]
+    if not functions:
+        return None
+    node = functions[0]
+
+    def text(expression: Optional[ast.AST]) -> Optional[str]:
+        return _unparse(expression) if expression is not None else None
+
+    args = node.args.posonlyargs + node.args.args
+    defaults = [None] * (len(args) - len(node.args.defaults)) + list(node.args.defaults)
+    signature = {arg.arg: (text(arg.annotation), text(default)) for arg, default in zip(args, defaults)}
+    for arg, default in zip(node.args.kwonlyargs, node.args.kw_defaults):
+        signature[arg.arg] = (text(arg.annotation), text(default))
+    signature["return"] = (text(node.returns), None)
+    return signature
+
+
+def _unparse(expression: ast.AST) -> str:
+    return astunparse.unparse(expression).strip()
+
+
+def _section_lines(docstring: Optional[str], names: Sequence[str], keep_indent: bool = False) -> List[str]:
+    """Lines of the Google-style docstring sections called ``names``."""
+    lines, inside, indent = [], False, 0
+    for line in (docstring or "").splitlines():
+        header = _GOOGLE_SECTION.match(line)
+        if header:
+            inside = header.group(1).lower() in names
+            indent = len(line) - len(line.lstrip())
+            continue
+        if inside:
+            if line.strip() and len(line) - len(line.lstrip()) <= indent:
+                inside = False
+                continue
+            if line.strip() or keep_indent:
+                lines.append(line if keep_indent else line.strip())
+    return lines
+
+
+def _rest_fields(docstring: Optional[str]) -> List[Tuple[str, Optional[str], str]]:
+    """``(field, name, text)`` of reST ``:param x:`` style fields."""
+    fields = []
+    for line in (docstring or "").splitlines():
+        match = _REST_FIELD.match(line)
+        if match:
+            fields.append((match.group(1), match.group(2), match.group(3).strip()))
+    return fields
+
+
+def _docstring_returns(docstring: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """``(type, description)`` of a Google-style Returns section or reST ``:returns:``/``:rtype:``."""
+    lines = _section_lines(docstring, ("return", "returns", "yield", "yields"))
+    doc_type, description = None, " ".join(lines) or None
+    if description:
+        typed = re.match(r"^(\w[\w\[\], .]*?)\s*:\s+(.*)$", description)
+        if typed:
+            doc_type, description = typed.group(1), typed.group(2)
+    for field, _, text in _rest_fields(docstring):
+        if field in ("return", "returns"):
+            description = text or description
+        elif field == "rtype":
+            doc_type = text or doc_type
+    return doc_type, description
+
+
+def _placeholder(name: str, type_name: Optional[str], language: str) -> str:
+    """A plausible literal for a required argument, or its name when nothing fits."""
+    if type_name:
+        base = re.split(r"[\[\]|<, ]", type_name.strip().lower().replace("typing.", ""), 1)[0]
+        base = {"optional": "none", "list": "list", "sequence": "list", "mapping": "dict"}.get(base, base)
+        if base in _TYPE_PLACEHOLDERS:
+            value = _TYPE_PLACEHOLDERS[base]
+            if language != "python":
+                value = {"True": "true", "None": "null", "set()": "new Set()"}.get(value, value)
+            return value
+    for pattern, value in _NAME_PLACEHOLDERS:
+        if pattern.search(name):
+            return value if language == "python" else {"True": "true"}.get(value, value)
+    return name
@@ -0,0 +1,223 @@
+"""
+Symbol Index Module 🗂️
+
+Persistent SQLite index of every documented symbol, for fast lookups by
+name, prefix or file without regenerating the documentation.
+"""
+
+import hashlib
+import sqlite3
+from dataclasses import dataclass
+from typing import Dict, Any, Iterable, Iterator, List, Optional
+
+
+SCHEMA_VERSION = 1
+
+
+@dataclass
+class SymbolRecord:
+    """A single indexed symbol."""
+    name: str
+    qualname: str
+    kind: str
+    file_path: str
+    line_number: int
+    signature: str
+    docstring: Optional[str]
+    source_hash: str
+    language: str
+
+
+def format_signature(func_data: Dict[str, Any]) -> str:
+    """Build a display signature from prepared Python or JavaScript function data."""
+    params = func_data.get("params")
+    if params is None:
+        annotations = func_data.get("arg_annotations") or {}
+        params = [
+            f"{arg}: {annotations[arg]}" if arg in annotations else arg
+            for arg in func_data.get("args", [])
+        ]
+
+    signature = f"{func_data['name']}({', '.join(params)})"
+    return_type = func_data.get("return_annotation") or func_data.get("return_type")
+    if return_type:
+        signature += f" -> {return_type}"
+    if func_data.get("is_async"):
+        signature = f"async {signature}"
+    return signature
+
+
+def source_hash(source_code: Optional[str]) -> str:
+    """Content hash of a symbol's source code."""
+    return hashlib.sha1((source_code or "").encode("utf-8")).hexdigest()
+
+
+def iter_symbols(file_data: Dict[str, Any]) -> Iterator[SymbolRecord]:
+    """Yield index records for every function, class and method of a file."""
+    file_path = str(file_data.get("file_path", ""))
+    language = file_data.get("language", "unknown")
+
+    for func in file_data.get("functions", []):
+        yield _function_record(func, func["name"], "function", file_path, language)
+
+    for cls in file_data.get("classes", []):
+        bases = cls.get("bases") or ([cls["extends"]] if cls.get("extends") else [])
+        yield SymbolRecord(
+            name=cls["name"],
+            qualname=cls["name"],
+            kind="class",
+            file_path=file_path,
+            line_number=cls.get("line_number", 0),
+            signature=f"class {cls['name']}({', '.join(bases)})" if bases else f"class {cls['name']}",
+            docstring=cls.get("docstring"),
+            source_hash=source_hash(cls.get("source_code")),
+            language=language,
+        )
+        for method in cls.get("methods", []):
+            yield _function_record(method, f"{cls['name']}.{method['name']}", "method", file_path, language)
+
+
+def _function_record(func: Dict[str, Any], qualname: str, kind: str, file_path: str, language: str) -> SymbolRecord:
+    return SymbolRecord(
+        name=func["name"],
+        qualname=qualname,
+        kind=kind,
+        file_path=file_path,
+        line_number=func.get("line_number", 0),
+        signature=format_signature(func),
+        docstring=func.get("docstring"),
+        source_hash=source_hash(func.get("source_code")),
+        language=language,
+    )
+
+
+class SymbolIndex:
+    """🗂️ Persistent, queryable index of documented symbols."""
+
+    _COLUMNS = "name, qualname, kind, file_path, line_number, signature, docstring, source_hash, language"
+
+    def __init__(self, path: str):
+        """Open or create the index database at ``path``."""
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.executescript(
+            f"""
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS symbols (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                qualname TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                file_path TEXT NOT NULL,
+                line_number INTEGER NOT NULL,
+                signature TEXT NOT NULL,
+                docstring TEXT,
+                source_hash TEXT NOT NULL,
+                language TEXT NOT NULL,
+                documented INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_symbols_name ON symbols (name);
+            CREATE INDEX IF NOT EXISTS idx_symbols_qualname ON symbols (qualname);
+            CREATE INDEX IF NOT EXISTS idx_symbols_file ON symbols (file_path, line_number);
+            CREATE INDEX IF NOT EXISTS idx_symbols_hash ON symbols (source_hash);
+            CREATE INDEX IF NOT EXISTS idx_symbols_undocumented
+                ON symbols (file_path, line_number) WHERE documented = 0;
+            INSERT OR IGNORE INTO meta (key, value) VALUES ('schema_version', '{SCHEMA_VERSION}');
+            """
+        )
+        version = self._conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()[0]
+        if int(version) != SCHEMA_VERSION:
+            self._conn.close()
+            raise ValueError(f"Symbol index {path} has unsupported schema version {version}")
+
+    def add_file(self, file_data: Dict[str, Any]) -> int:
+        """Index (or re-index) one file's symbols; returns the number indexed."""
+        file_path = str(file_data.get("file_path", ""))
+        self._conn.execute("DELETE FROM symbols WHERE file_path = ?", (file_path,))
+        rows = [
+            (
+                record.name, record.qualname, record.kind, record.file_path, record.line_number,
+                record.signature, record.docstring, record.source_hash, record.language,
+                1 if record.docstring else 0,
+            )
+            for record in iter_symbols(file_data)
+        ]
+        self._conn.executemany(
+            f"INSERT INTO symbols ({self._COLUMNS}, documented) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows
+        )
+        return len(rows)
+
+    def add_files(self, files: Iterable[Dict[str, Any]]) -> int:
+        """Index many files; returns the total number of symbols indexed."""
+        return sum(self.add_file(file_data) for file_data in files)
+
+    def clear(self) -> None:
+        """Remove every indexed symbol."""
+        self._conn.execute("DELETE FROM symbols")
+
+    def commit(self) -> None:
+        """Persist pending changes."""
+        self._conn.commit()
+
+    def lookup(self, name: str) -> List[SymbolRecord]:
+        """Find symbols whose name or qualified name (``Class.method``) is ``name``."""
+        return self._query(
+            "WHERE name = ? UNION SELECT {columns} FROM symbols WHERE qualname = ? "
+            "ORDER BY file_path, line_number",
+            (name, name)
+        )
+
+    def search_prefix(self, prefix: str, limit: int = 50) -> List[SymbolRecord]:
+        """Find symbols whose name starts with ``prefix`` (case-sensitive)."""
+        # A range scan uses the name index, unlike LIKE with the default collation
+        return self._query(
+            "WHERE name >= ? AND name < ? ORDER BY name, file_path, line_number LIMIT ?",
+            (prefix, prefix + "\U0010ffff", limit)
+        )
+
+    def symbols_in_file(self, file_path: str) -> List[SymbolRecord]:
+        """All symbols of a file in source order."""
+        return self._query("WHERE file_path = ? ORDER BY line_number", (file_path,))
+
+    def undocumented(self, limit: Optional[int] = None) -> List[SymbolRecord]:
+        """Symbols without a docstring, grouped by file."""
+        return self._query(
+            "WHERE documented = 0 ORDER BY file_path, line_number LIMIT ?",
+            (-1 if limit is None else limit,)
+        )
+
+    def stats(self) -> Dict[str, int]:
+        """Counts of indexed files and symbols."""
+        files, symbols, undocumented = self._conn.execute(
+            "SELECT COUNT(DISTINCT file_path), COUNT(*), COALESCE(SUM(1 - documented), 0) FROM symbols"
+        ).fetchone()
+        return {"files": files, "symbols": symbols, "undocumented": undocumented}
+
+    def _query(self, clause: str, params: tuple) -> List[SymbolRecord]:
+        columns = self._COLUMNS
+        sql = f"SELECT {columns} FROM symbols " + clause.format(columns=columns)
+        return [SymbolRecord(*row) for row in self._conn.execute(sql, params)]
+
+    def rollback(self) -> None:
+        """Discard pending changes."""
+        self._conn.rollback()
+
+    def close(self) -> None:
+        """Commit and close the index."""
+        self._conn.commit()
+        self._conn.close()
+
+    def __enter__(self) -> "SymbolIndex":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            # A failed run (possibly after clear()) must not replace the persisted index.
+            self.rollback()
+            self._conn.close()
+        else:
+            self.close()
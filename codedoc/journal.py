@@ -0,0 +1,141 @@
+"""
+Run Journal Module 📓
+
+Append-only JSONL record of the work a long run has completed: every
+per-symbol AI enhancement and every finished file's data, written as the run
+progresses, so a crashed or preempted run can resume without repeating that
+work (or its API spend).
+"""
+
+import hashlib
+import json
+import os
+from collections import Counter
+from typing import Any, BinaryIO, Dict, Optional, Tuple
+
+
+JOURNAL_VERSION = 1
+
+
+def symbol_key(kind: str, kwargs: Dict[str, Any]) -> str:
+    """Journal key of one ``enhance_many`` request (changes whenever the request does)."""
+    payload = json.dumps([kind, kwargs], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class RunJournal:
+    """📓 Completed symbol enhancements and file data of a run, one JSON line each.
+
+    The first line describes the run's ``options``. Resuming a journal written
+    with other options (or another journal version) starts a new one, as does
+    not resuming at all. A last line cut off by a crash is ignored.
+
+    Only the position of each file's entry is kept in memory; file data is read
+    back from the journal when it is reused, so journaling does not hold a
+    run's data that ``spill`` keeps out of memory. Entries are flushed as they
+    are written, which is enough to survive the process crashing; the journal
+    is synced to disk once per finished file and when it is closed.
+    """
+
+    def __init__(self, path: str, resume: bool = False, options: Optional[Dict[str, Any]] = None):
+        """Open the journal for appending.
+
+        Args:
+            path: Journal file
+            resume: Load what an earlier run with the same options completed
+                instead of starting over
+            options: Settings that change the journaled results (e.g. whether
+                private symbols are included)
+        """
+        self.path = path
+        # As read back from JSON, so it compares equal to an earlier run's
+        self.options = json.loads(json.dumps(options or {}, default=str))
+        self.reused: Counter = Counter()
+        self._symbols: Dict[str, Dict[str, Any]] = {}
+        # Byte offset of each journaled file's entry
+        self._files: Dict[Tuple[str, str], int] = {}
+        self._reader: Optional[BinaryIO] = None
+        resumed = resume and os.path.exists(path) and self._load()
+        self.restarted = resume and not resumed
+        self._stream = open(path, "ab" if resumed else "wb")
+        if not resumed:
+            self._write({"type": "run", "version": JOURNAL_VERSION, "options": self.options}, sync=True)
+
+    def _load(self) -> bool:
+        """Read an earlier journal; returns whether it belongs to a compatible run."""
+        header = {"type": "run", "version": JOURNAL_VERSION, "options": self.options}
+        offset = 0
+        line = b""
+        with open(self.path, "rb") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    entry = None  # Cut off mid-write
+                if offset == 0 and entry != header:
+                    return False
+                if isinstance(entry, dict) and entry.get("type") == "symbol":
+                    self._symbols[entry["key"]] = entry["result"]
+                elif isinstance(entry, dict) and entry.get("type") == "file":
+                    self._files[(entry["path"], entry["digest"])] = offset
+                offset += len(line)
+        if offset == 0:
+            return False
+        if not line.endswith(b"\n"):
+            with open(self.path, "ab") as f:
+                f.write(b"\n")  # Keep the next entry off the truncated line
+        return True
+
+    def symbol(self, key: str) -> Optional[Dict[str, Any]]:
+        """The journaled enhancement of a request (see ``symbol_key``), if any."""
+        result = self._symbols.get(key)
+        if result is not None:
+            self.reused["symbols"] += 1
+        return result
+
+    def file(self, path: str, digest: str) -> Optional[Dict[str, Any]]:
+        """The journaled data of a file with content ``digest``, if any."""
+        offset = self._files.get((path, digest))
+        if offset is None:
+            return None
+        if self._reader is None:
+            self._reader = open(self.path, "rb")
+        self._reader.seek(offset)
+        self.reused["files"] += 1
+        return json.loads(self._reader.readline())["data"]
+
+    def record_symbol(self, key: str, result: Dict[str, Any]) -> None:
+        """Journal a completed symbol enhancement."""
+        self._symbols[key] = result
+        self._write({"type": "symbol", "key": key, "result": result})
+
+    def record_file(self, path: str, digest: str, data: Dict[str, Any]) -> None:
+        """Journal a finished file's data."""
+        self._files[(path, digest)] = self._write(
+            {"type": "file", "path": path, "digest": digest, "data": data}, sync=True
+        )
+
+    def _write(self, entry: Dict[str, Any], sync: bool = False) -> int:
+        """Append an entry; returns its byte offset."""
+        offset = self._stream.tell()
+        self._stream.write(json.dumps(entry, default=str).encode("utf-8") + b"\n")
+        self._stream.flush()
+        if sync:
+            os.fsync(self._stream.fileno())
+        return offset
+
+    def close(self) -> None:
+        """Sync and close the journal file."""
+        if not self._stream.closed:
+            self._stream.flush()
+            os.fsync(self._stream.fileno())
+            self._stream.close()
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+    def __enter__(self) -> "RunJournal":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
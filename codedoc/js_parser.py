@@ -17,6 +17,9 @@ from dataclasses import dataclass
 from typing import List, Optional, Dict, Any
 from pathlib import Path
 
+from .complexity import Complexity, js_complexity
+from .structure import js_structure_hash
+
 
 @dataclass
 class JSFunctionInfo:
@@ -31,6 +34,8 @@ class JSFunctionInfo:
     line_number: int
     source_code: str
     jsdoc_tags: Dict[str, Any]
+    structure_hash: Optional[str] = None
+    complexity: Optional[Complexity] = None
 
 
 @dataclass
@@ -45,6 +50,8 @@ class JSClassInfo:
     line_number: int
     source_code: str
     jsdoc_tags: Dict[str, Any]
+    structure_hash: Optional[str] = None
+    complexity: Optional[Complexity] = None
 
 
 @dataclass
@@ -242,7 +249,9 @@ console.log(JSON.stringify(ast, null, 2));
                 is_exported=False,  # Will be updated if part of export
                 line_number=line_number,
                 source_code=source_code,
-                jsdoc_tags=jsdoc_tags
+                jsdoc_tags=jsdoc_tags,
+                structure_hash=js_structure_hash(node),
+                complexity=js_complexity(node)
             )
         
         except Exception:
@@ -279,7 +288,9 @@ console.log(JSON.stringify(ast, null, 2));
                 is_exported=False,
                 line_number=line_number,
                 source_code=source_code,
-                jsdoc_tags=jsdoc_tags
+                jsdoc_tags=jsdoc_tags,
+                structure_hash=js_structure_hash(arrow_func),
+                complexity=js_complexity(arrow_func)
             )
         
         except Exception:
@@ -327,7 +338,9 @@ console.log(JSON.stringify(ast, null, 2));
                 is_exported=False,
                 line_number=line_number,
                 source_code=source_code,
-                jsdoc_tags=jsdoc_tags
+                jsdoc_tags=jsdoc_tags,
+                structure_hash=js_structure_hash(node),
+                complexity=js_complexity(node)
             )
         
         except Exception:
@@ -364,7 +377,9 @@ console.log(JSON.stringify(ast, null, 2));
                 is_exported=False,
                 line_number=line_number,
                 source_code=source_code,
-                jsdoc_tags=jsdoc_tags
+                jsdoc_tags=jsdoc_tags,
+                structure_hash=js_structure_hash(node),
+                complexity=js_complexity(node)
             )
         
         except Exception:
@@ -397,7 +412,11 @@ console.log(JSON.stringify(ast, null, 2));
         return docstring, jsdoc_tags
     
     def _parse_jsdoc(self, jsdoc_content: str) -> tuple[Optional[str], Dict[str, Any]]:
-        """Parse JSDoc content to extract description and tags."""
+        """Parse JSDoc content to extract description and tags.
+        
+        A tag that appears more than once (e.g. ``@param``) maps to the list
+        of its values.
+        """
         lines = jsdoc_content.split('\n')
         description_lines = []
         tags = {}
@@ -415,7 +434,7 @@ console.log(JSON.stringify(ast, null, 2));
             if line.startswith('@'):
                 # Save previous tag
                 if current_tag:
-                    tags[current_tag] = ' '.join(current_tag_content)
+                    self._add_jsdoc_tag(tags, current_tag, ' '.join(current_tag_content))
                 
                 # Parse new tag
                 parts = line[1:].split(None, 1)
@@ -428,11 +447,20 @@ console.log(JSON.stringify(ast, null, 2));
         
         # Save last tag
         if current_tag:
-            tags[current_tag] = ' '.join(current_tag_content)
+            self._add_jsdoc_tag(tags, current_tag, ' '.join(current_tag_content))
         
         description = ' '.join(description_lines).strip() if description_lines else None
         return description, tags
     
+    def _add_jsdoc_tag(self, tags: Dict[str, Any], tag: str, content: str) -> None:
+        """Record a tag's content, collecting repeated tags into a list."""
+        if tag not in tags:
+            tags[tag] = content
+        elif isinstance(tags[tag], list):
+            tags[tag].append(content)
+        else:
+            tags[tag] = [tags[tag], content]
+    
     def _extract_import_info(self, node: Dict[str, Any]) -> str:
         """Extract import information."""
         source = node.get('source', {}).get('value', '')
@@ -10,6 +10,9 @@ from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 import astunparse
 
+from .complexity import Complexity, python_complexity
+from .structure import python_structure_hash
+
 
 @dataclass
 class FunctionInfo:
@@ -21,6 +24,8 @@ class FunctionInfo:
     line_number: int
     return_annotation: Optional[str] = None
     arg_annotations: Dict[str, str] = None
+    structure_hash: Optional[str] = None
+    complexity: Optional[Complexity] = None
     
     def __post_init__(self):
         if self.arg_annotations is None:
@@ -36,6 +41,8 @@ class ClassInfo:
     source_code: str
     line_number: int
     bases: List[str] = None
+    structure_hash: Optional[str] = None
+    complexity: Optional[Complexity] = None
     
     def __post_init__(self):
         if self.bases is None:
@@ -48,6 +55,7 @@ class CodeParser:
     def __init__(self):
         self.functions: List[FunctionInfo] = []
         self.classes: List[ClassInfo] = []
+        self.imports: List[str] = []
     
     def parse_file(self, file_path: str) -> Dict[str, Any]:
         """Parse a Python file and extract all functions and classes."""
@@ -65,6 +73,7 @@ class CodeParser:
             tree = ast.parse(source_code)
             self.functions = []
             self.classes = []
+            self.imports = []
             
             # First pass: collect all classes and their methods
             class_methods = set()
@@ -80,10 +89,13 @@ class CodeParser:
                     self._parse_function(node, source_code)
                 elif isinstance(node, ast.ClassDef):
                     self._parse_class(node, source_code)
+                elif isinstance(node, (ast.Import, ast.ImportFrom)):
+                    self.imports.append(astunparse.unparse(node).strip())
             
             return {
                 'functions': self.functions,
                 'classes': self.classes,
+                'imports': self.imports,
                 'total_items': len(self.functions) + len(self.classes)
             }
         
@@ -121,7 +133,9 @@ class CodeParser:
             source_code=func_source,
             line_number=node.lineno,
             return_annotation=return_annotation,
-            arg_annotations=arg_annotations
+            arg_annotations=arg_annotations,
+            structure_hash=python_structure_hash(node),
+            complexity=python_complexity(node)
         )
         
         self.functions.append(function_info)
@@ -163,7 +177,9 @@ class CodeParser:
                     source_code=method_source,
                     line_number=item.lineno,
                     return_annotation=method_return_annotation,
-                    arg_annotations=method_arg_annotations
+                    arg_annotations=method_arg_annotations,
+                    structure_hash=python_structure_hash(item),
+                    complexity=python_complexity(item)
                 )
                 methods.append(method_info)
         
@@ -176,7 +192,9 @@ class CodeParser:
             methods=methods,
             source_code=class_source,
             line_number=node.lineno,
-            bases=bases
+            bases=bases,
+            structure_hash=python_structure_hash(node),
+            complexity=python_complexity(node)
         )
         
         self.classes.append(class_info)
@@ -0,0 +1,354 @@
+"""
+Rate Limiting Module 🚦
+
+Client-side protection for AI provider calls: token buckets for requests
+and tokens per minute, jittered exponential backoff that honors
+Retry-After, a circuit breaker that fails fast while the provider is down,
+and a per-run budget of wall time and calls.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Optional
+
+from openai import APIConnectionError
+
+
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 429})
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the provider while the circuit is open."""
+
+
+class BudgetExhaustedError(Exception):
+    """Raised instead of calling the provider once the run's budget is spent."""
+
+
+class DeadlineExceededError(Exception):
+    """Raised when a provider call is not answered within its deadline."""
+
+
+class TokenBucket:
+    """🚦 Refills ``rate_per_minute`` units per minute up to ``capacity``.
+
+    Callers reserve units and are told how long to wait before using them,
+    so the bucket works for threads and coroutines alike.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """Create a full bucket.
+
+        Args:
+            rate_per_minute: Sustained refill rate
+            capacity: Burst size (defaults to one minute's worth)
+            clock: Monotonic time source in seconds
+        """
+        if rate_per_minute <= 0:
+            raise ValueError("Rate must be positive")
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else float(rate_per_minute)
+        self._clock = clock
+        self._level = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float = 1.0) -> float:
+        """Take ``amount`` units and return the seconds to wait before using them.
+
+        Requests larger than the capacity are clamped so they can still proceed.
+        """
+        with self._lock:
+            now = self._clock()
+            self._level = min(self.capacity, self._level + (now - self._updated) * self.rate)
+            self._updated = now
+            self._level -= min(amount, self.capacity)
+            return max(0.0, -self._level / self.rate)
+
+
+class RateLimiter:
+    """🚦 Requests-per-minute and tokens-per-minute limits shared by all AI calls."""
+
+    def __init__(self, requests_per_minute: Optional[float] = None, tokens_per_minute: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """Create a limiter; a ``None`` limit is not enforced."""
+        self.requests = TokenBucket(requests_per_minute, clock=clock) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute, clock=clock) if tokens_per_minute else None
+
+    def reserve(self, tokens: int) -> float:
+        """Reserve one request of ``tokens`` tokens; returns the seconds to wait."""
+        delays = [0.0]
+        if self.requests:
+            delays.append(self.requests.reserve(1))
+        if self.tokens:
+            delays.append(self.tokens.reserve(tokens))
+        return max(delays)
+
+    def wait(self, tokens: int) -> None:
+        """Block until a request of ``tokens`` tokens may be sent."""
+        delay = self.reserve(tokens)
+        if delay:
+            time.sleep(delay)
+
+    async def acquire(self, tokens: int) -> None:
+        """Async version of ``wait``."""
+        delay = self.reserve(tokens)
+        if delay:
+            await asyncio.sleep(delay)
+
+
+@dataclass
+class RetryPolicy:
+    """🚦 Jittered exponential backoff for transient provider errors."""
+    max_attempts: int = 5
+    base_delay: float = 1.0
+    max_delay: float = 60.0
+
+    def delay(self, attempt: int, error: Optional[BaseException] = None) -> float:
+        """Seconds to wait after failed attempt number ``attempt`` (0-based).
+
+        A Retry-After header on the error wins over the computed backoff.
+        """
+        retry_after = retry_after_seconds(error) if error is not None else None
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Whether an error is transient: rate limits, timeouts, conflicts, server and connection errors."""
+    if isinstance(error, APIConnectionError):
+        return True
+    status = getattr(error, "status_code", None)
+    return status is not None and (status in RETRYABLE_STATUS_CODES or status >= 500)
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """Parse ``retry-after-ms`` / ``retry-after`` (seconds or HTTP date) from an error's response."""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        if headers.get("retry-after-ms"):
+            return max(0.0, float(headers["retry-after-ms"]) / 1000)
+        value = headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitBreaker:
+    """🚦 Opens after consecutive provider failures and fails fast until a cool-down passes.
+
+    After ``reset_timeout`` one trial call is let through (half-open); its
+    success closes the circuit, its failure opens it again. A trial that ends
+    without an answer either way (refused by the budget, cancelled) must be
+    given back with ``release_trial``.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """Create a closed breaker."""
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """``"closed"``, ``"open"`` or ``"half-open"``."""
+        if self._opened_at is None:
+            return "closed"
+        return "half-open" if self._clock() - self._opened_at >= self.reset_timeout else "open"
+
+    def before_call(self) -> bool:
+        """Raise ``CircuitOpenError`` if calls are currently not allowed.
+
+        Returns:
+            Whether this call is the half-open trial
+        """
+        with self._lock:
+            state = self.state
+            if state == "open" or (state == "half-open" and self._trial_running):
+                raise CircuitOpenError("AI provider circuit is open after repeated failures")
+            if state == "half-open":
+                self._trial_running = True
+                return True
+            return False
+
+    def release_trial(self) -> None:
+        """Let another call be the half-open trial after this one ended without an answer."""
+        with self._lock:
+            self._trial_running = False
+
+    def record_success(self) -> None:
+        """Close the circuit after a call the provider answered."""
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self) -> None:
+        """Count a provider failure, opening the circuit at the threshold."""
+        with self._lock:
+            self._failures += 1
+            if self._trial_running or self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+            self._trial_running = False
+
+
+class CallBudget:
+    """🚦 Upper bound on the wall time and number of provider calls of a run.
+
+    Every attempt (including retries) is charged right before it is sent;
+    once the deadline passes or the calls are used up, further attempts raise
+    ``BudgetExhaustedError``.
+    """
+
+    def __init__(self, time_budget: Optional[float] = None, max_calls: Optional[int] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """Create a budget and start its clock.
+
+        Args:
+            time_budget: Seconds from ``start`` after which no call is sent
+            max_calls: Maximum number of calls between ``start``s
+            clock: Monotonic time source in seconds
+        """
+        if time_budget is not None and time_budget < 0:
+            raise ValueError("Time budget must not be negative")
+        if max_calls is not None and max_calls < 0:
+            raise ValueError("Maximum calls must not be negative")
+        self.time_budget = time_budget
+        self.max_calls = max_calls
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.start()
+
+    def start(self) -> None:
+        """Restart the clock and the call count (at the beginning of a run)."""
+        with self._lock:
+            self.calls = 0
+            self._deadline = self._clock() + self.time_budget if self.time_budget is not None else None
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left before the deadline (``None`` without a time budget)."""
+        return None if self._deadline is None else max(0.0, self._deadline - self._clock())
+
+    @property
+    def exhausted(self) -> bool:
+        """Whether no further call may be sent."""
+        return ((self.max_calls is not None and self.calls >= self.max_calls)
+                or (self._deadline is not None and self._clock() >= self._deadline))
+
+    def charge(self) -> None:
+        """Account for one call, or raise ``BudgetExhaustedError`` if none is left."""
+        with self._lock:
+            if self.exhausted:
+                raise BudgetExhaustedError("AI budget exhausted")
+            self.calls += 1
+
+
+def call_with_retry(
+    call: Callable[[], Any],
+    tokens: int,
+    limiter: Optional[RateLimiter] = None,
+    policy: Optional[RetryPolicy] = None,
+    breaker: Optional[CircuitBreaker] = None,
+    sleep: Callable[[float], None] = time.sleep
+) -> Any:
+    """Run ``call`` under the limiter, retrying transient errors per ``policy``."""
+    attempts = policy.max_attempts if policy else 1
+    for attempt in range(attempts):
+        trial = breaker.before_call() if breaker else False
+        settled = False  # Whether the breaker heard how the call went
+        try:
+            if limiter:
+                limiter.wait(tokens)
+            try:
+                result = call()
+            except BudgetExhaustedError:
+                raise  # Refused client-side; the provider was never asked
+            except DeadlineExceededError:
+                if breaker:
+                    breaker.record_failure()  # A provider too slow to answer is not healthy
+                    settled = True
+                raise
+            except Exception as e:
+                if not is_retryable(e):
+                    if breaker:
+                        breaker.record_success()  # The provider answered; the request itself was bad
+                        settled = True
+                    raise
+                if breaker:
+                    breaker.record_failure()
+                    settled = True
+                if attempt + 1 >= attempts:
+                    raise
+                sleep(policy.delay(attempt, e))
+            else:
+                if breaker:
+                    breaker.record_success()
+                    settled = True
+                return result
+        finally:
+            if trial and not settled:
+                breaker.release_trial()  # Budget refusals and cancellations (not an ``Exception``)
+
+
+async def acall_with_retry(
+    call: Callable[[], Awaitable[Any]],
+    tokens: int,
+    limiter: Optional[RateLimiter] = None,
+    policy: Optional[RetryPolicy] = None,
+    breaker: Optional[CircuitBreaker] = None
+) -> Any:
+    """Async version of ``call_with_retry``."""
+    attempts = policy.max_attempts if policy else 1
+    for attempt in range(attempts):
+        trial = breaker.before_call() if breaker else False
+        settled = False  # Whether the breaker heard how the call went
+        try:
+            if limiter:
+                await limiter.acquire(tokens)
+            try:
+                result = await call()
+            except BudgetExhaustedError:
+                raise  # Refused client-side; the provider was never asked
+            except DeadlineExceededError:
+                if breaker:
+                    breaker.record_failure()  # A provider too slow to answer is not healthy
+                    settled = True
+                raise
+            except Exception as e:
+                if not is_retryable(e):
+                    if breaker:
+                        breaker.record_success()  # The provider answered; the request itself was bad
+                        settled = True
+                    raise
+                if breaker:
+                    breaker.record_failure()
+                    settled = True
+                if attempt + 1 >= attempts:
+                    raise
+                await asyncio.sleep(policy.delay(attempt, e))
+            else:
+                if breaker:
+                    breaker.record_success()
+                    settled = True
+                return result
+        finally:
+            if trial and not settled:
+                breaker.release_trial()  # Budget refusals and cancellations (not an ``Exception``)
@@ -0,0 +1,77 @@
+"""
+Model Routing Module 🧭
+
+Sends each symbol to a model that fits its complexity: trivial symbols to
+the offline heuristic or a small model, complex ones to a larger model.
+"""
+
+from typing import Dict, Optional
+
+
+TIERS = ("trivial", "simple", "complex")
+
+# Route target that answers with ``HeuristicExampleGenerator`` instead of a model
+HEURISTIC = "heuristic"
+
+DEFAULT_ROUTES = "trivial=heuristic,simple=gpt-4o-mini,complex=gpt-4o"
+
+# A symbol is trivial within all of these limits, and complex beyond any of the second set
+TRIVIAL_LIMITS = {"cyclomatic": 1, "loc": 5, "params": 2, "nesting": 0}
+COMPLEX_THRESHOLDS = {"cyclomatic": 10, "loc": 50, "params": 6, "nesting": 4}
+
+
+def complexity_tier(complexity: Dict[str, int]) -> str:
+    """``"trivial"``, ``"simple"`` or ``"complex"`` for a symbol's metrics (see ``Complexity``)."""
+    if any(complexity.get(metric, 0) >= threshold for metric, threshold in COMPLEX_THRESHOLDS.items()):
+        return "complex"
+    if all(complexity.get(metric, 0) <= limit for metric, limit in TRIVIAL_LIMITS.items()):
+        return "trivial"
+    return "simple"
+
+
+def parse_route_spec(spec: str) -> Dict[str, str]:
+    """Parse ``"TIER=MODEL,..."`` (or ``"auto"`` for ``DEFAULT_ROUTES``) into routes by tier.
+
+    Raises:
+        ValueError: For unknown tiers, missing models or malformed entries
+    """
+    if spec.strip() == "auto":
+        spec = DEFAULT_ROUTES
+    routes = {}
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        tier, separator, model = (part.strip() for part in entry.partition("="))
+        if not separator or not model:
+            raise ValueError(f"Route must look like TIER=MODEL, got {entry!r}")
+        if tier not in TIERS:
+            raise ValueError(f"Unknown complexity tier {tier!r} (expected one of {', '.join(TIERS)})")
+        routes[tier] = model
+    if not routes:
+        raise ValueError("Route spec is empty")
+    return routes
+
+
+class ModelRouter:
+    """🧭 Picks a model, or the offline heuristic, per symbol from its complexity metrics."""
+
+    def __init__(self, routes: Dict[str, str]):
+        """Create a router.
+
+        Args:
+            routes: Model (or ``HEURISTIC``) by complexity tier; tiers left out
+                use the generator's default model
+        """
+        unknown = set(routes) - set(TIERS)
+        if unknown:
+            raise ValueError(f"Unknown complexity tiers: {', '.join(sorted(unknown))}")
+        self.routes = dict(routes)
+
+    @classmethod
+    def from_spec(cls, spec: str) -> "ModelRouter":
+        """Router for a ``parse_route_spec`` string."""
+        return cls(parse_route_spec(spec))
+
+    def route(self, complexity: Optional[Dict[str, int]]) -> Optional[str]:
+        """Model for a symbol, or ``None`` for the default model (unknown metrics or unrouted tier)."""
+        if not complexity:
+            return None
+        return self.routes.get(complexity_tier(complexity))
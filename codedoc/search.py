@@ -0,0 +1,196 @@
+"""
+Search Index Module 🔎
+
+Builds a compact inverted index of symbol names, signatures and docstring
+terms at generation time. The index is written as small, lazily loaded
+script shards so the browser never tokenizes the documentation itself.
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Callable, Dict, Any, Iterable, List, Optional
+
+from .index import iter_symbols
+from .xref import Definition, symbol_anchor
+
+
+# Field weights, packed into postings as ``doc_id * 4 + weight``
+NAME_WEIGHT = 3
+SIGNATURE_WEIGHT = 2
+DOCSTRING_WEIGHT = 1
+
+DOCS_PER_CHUNK = 500
+# Shard files are named "<kind>-<key>.js"
+SHARD_KINDS = ("terms", "docs")
+MAX_DOCSTRING_TERMS = 64
+
+_WORD = re.compile(r"[A-Za-z0-9]+")
+_CAMEL = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|[0-9]+")
+_STOP_WORDS = frozenset(
+    "an and are as at be by for from if in is it of on or the this to was with".split()
+)
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Split text into lowercase search terms, breaking up camelCase and snake_case."""
+    terms = []
+    for word in _WORD.findall(text or ""):
+        parts = _CAMEL.findall(word)
+        if len(parts) > 1:
+            terms.append(word.lower())
+        terms.extend(part.lower() for part in parts)
+    return [term for term in terms if len(term) >= 2 and term not in _STOP_WORDS]
+
+
+def _default_href(definition: Definition) -> str:
+    return f"#{definition.anchor}"
+
+
+class SearchIndexBuilder:
+    """🔎 Accumulates symbols and writes the sharded search index."""
+
+    def __init__(self, href: Callable[[Definition], str] = _default_href):
+        """Create an empty builder.
+
+        Args:
+            href: Maps a symbol's definition to the URL search results link to
+        """
+        self.href = href
+        self.docs: List[List[str]] = []
+        self.postings: Dict[str, List[int]] = {}
+
+    @classmethod
+    def build(cls, files: Iterable[Dict[str, Any]], **kwargs) -> "SearchIndexBuilder":
+        """Index every symbol of the given files."""
+        builder = cls(**kwargs)
+        for file_data in files:
+            builder.add_file(file_data)
+        return builder
+
+    def add_file(self, file_data: Dict[str, Any]) -> None:
+        """Add one file's symbols to the index (duplicate files are skipped)."""
+        if file_data.get("duplicate_of"):
+            return
+        for record in iter_symbols(file_data):
+            owner = record.qualname.split(".")[0] if record.kind == "method" else record.qualname
+            definition = Definition(
+                name=record.name,
+                qualname=record.qualname,
+                kind=record.kind,
+                file_path=record.file_path,
+                anchor=symbol_anchor(record.file_path, owner),
+            )
+            doc_id = len(self.docs)
+            self.docs.append([record.qualname, record.kind, record.file_path, self.href(definition), record.signature])
+
+            weights: Dict[str, int] = {}
+            for term in tokenize(record.docstring)[:MAX_DOCSTRING_TERMS]:
+                weights[term] = DOCSTRING_WEIGHT
+            for term in tokenize(record.signature):
+                weights[term] = SIGNATURE_WEIGHT
+            for term in tokenize(record.qualname.replace(".", " ")) + [re.sub(r"[^a-z0-9]", "", record.name.lower())]:
+                if len(term) >= 2:
+                    weights[term] = NAME_WEIGHT
+
+            for term, weight in weights.items():
+                self.postings.setdefault(term, []).append(doc_id * 4 + weight)
+
+    def write(self, directory: str) -> None:
+        """Write term shards (by two-letter prefix) and document chunks to ``directory``."""
+        target = Path(directory)
+        target.mkdir(parents=True, exist_ok=True)
+        # Other scripts may share the directory; only our own shards are stale
+        for kind in SHARD_KINDS:
+            for stale in target.glob(f"{kind}-*.js"):
+                stale.unlink()
+
+        shards: Dict[str, Dict[str, List[int]]] = {}
+        for term, postings in self.postings.items():
+            shards.setdefault(term[:2], {})[term] = postings
+
+        for prefix, terms in shards.items():
+            self._write_shard(target / f"terms-{prefix}.js", "terms", prefix, terms)
+
+        for start in range(0, len(self.docs), DOCS_PER_CHUNK):
+            chunk = start // DOCS_PER_CHUNK
+            self._write_shard(target / f"docs-{chunk}.js", "docs", str(chunk), self.docs[start:start + DOCS_PER_CHUNK])
+
+    def _write_shard(self, path: Path, kind: str, key: str, payload: Any) -> None:
+        body = json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(f'window.codedocSearch.register("{kind}","{key}",{body});\n')
+
+
+# Query script embedded in HTML output. Shards are loaded with <script> tags
+# so search also works for documentation opened from file:// URLs.
+SEARCH_SCRIPT = """
+(function () {
+  var base = document.getElementById('codedoc-search').getAttribute('data-index') + '/';
+  var input = document.getElementById('codedoc-search');
+  var out = document.getElementById('codedoc-search-results');
+  var stores = {terms: {}, docs: {}}, waiting = {}, timer = null;
+  window.codedocSearch = {register: function (kind, key, data) {
+    stores[kind][key] = data;
+    (waiting[kind + key] || []).forEach(function (f) { f(); });
+    delete waiting[kind + key];
+  }};
+  function load(kind, key, done) {
+    if (key in stores[kind]) { return done(); }
+    if (waiting[kind + key]) { return waiting[kind + key].push(done); }
+    waiting[kind + key] = [done];
+    var s = document.createElement('script');
+    s.src = base + kind + '-' + key + '.js';
+    s.onerror = function () { window.codedocSearch.register(kind, key, kind === 'docs' ? [] : {}); };
+    document.head.appendChild(s);
+  }
+  function loadAll(kind, keys, done) {
+    var left = keys.length;
+    if (!left) { return done(); }
+    keys.forEach(function (k) { load(kind, k, function () { if (--left === 0) { done(); } }); });
+  }
+  function words(q) {
+    return q.toLowerCase().split(/[^a-z0-9]+/).filter(function (w) { return w.length >= 2; });
+  }
+  function escapeHtml(t) {
+    return String(t).replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;');
+  }
+  function search(q) {
+    var ws = words(q);
+    if (!ws.length) { out.innerHTML = ''; return; }
+    var prefixes = ws.map(function (w) { return w.slice(0, 2); });
+    loadAll('terms', prefixes, function () {
+      var scores = null;
+      ws.forEach(function (w) {
+        var shard = stores.terms[w.slice(0, 2)] || {}, found = {};
+        Object.keys(shard).forEach(function (term) {
+          if (term.lastIndexOf(w, 0) !== 0) { return; }
+          var bonus = term === w ? 2 : 1;
+          shard[term].forEach(function (code) {
+            var id = code >> 2, s = (code & 3) * bonus;
+            if (!found[id] || found[id] < s) { found[id] = s; }
+          });
+        });
+        if (scores === null) { scores = found; return; }
+        var merged = {};
+        Object.keys(found).forEach(function (id) { if (id in scores) { merged[id] = scores[id] + found[id]; } });
+        scores = merged;
+      });
+      var ids = Object.keys(scores).sort(function (a, b) { return scores[b] - scores[a] || a - b; }).slice(0, 20);
+      var chunks = ids.map(function (id) { return String(Math.floor(id / %(chunk)d)); })
+        .filter(function (c, i, all) { return all.indexOf(c) === i; });
+      loadAll('docs', chunks, function () {
+        out.innerHTML = ids.length ? ids.map(function (id) {
+          var d = stores.docs[Math.floor(id / %(chunk)d)][id %% %(chunk)d];
+          return '<li><a href="' + escapeHtml(d[3]) + '">' + escapeHtml(d[0]) + '</a> <span class="tag">' +
+            escapeHtml(d[1]) + '</span><br><small>' + escapeHtml(d[4]) + ' &mdash; ' + escapeHtml(d[2]) + '</small></li>';
+        }).join('') : '<li>No matches</li>';
+      });
+    });
+  }
+  input.addEventListener('input', function () {
+    clearTimeout(timer);
+    timer = setTimeout(function () { search(input.value); }, 80);
+  });
+})();
+""" % {"chunk": DOCS_PER_CHUNK}
@@ -0,0 +1,140 @@
+"""
+Sharding Module 🧩
+
+Splits a project's source files across several machines and merges the
+partial results back into one documentation set.
+"""
+
+import hashlib
+import heapq
+import json
+from pathlib import Path
+from typing import Dict, Any, List, Tuple
+
+
+SHARD_FORMAT_VERSION = 1
+
+
+def parse_shard_spec(spec: str) -> Tuple[int, int]:
+    """Parse a shard spec such as ``"2/8"`` into ``(index, count)``.
+
+    Indices are 1-based, so valid specs run from ``1/N`` to ``N/N``.
+    """
+    try:
+        index_text, count_text = spec.split("/", 1)
+        index, count = int(index_text), int(count_text)
+    except ValueError:
+        raise ValueError(f"Invalid shard spec '{spec}', expected INDEX/COUNT (e.g. 1/4)")
+
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"Invalid shard spec '{spec}': index must be between 1 and {max(count, 1)}")
+
+    return index, count
+
+
+def stable_hash(relative_path: str) -> int:
+    """Hash a path identically on every machine and Python process."""
+    return int(hashlib.sha1(relative_path.encode("utf-8")).hexdigest()[:16], 16)
+
+
+def assign_shards(files: List[Path], root: Path, count: int) -> List[List[Path]]:
+    """Partition files into ``count`` shards balanced by file size.
+
+    Files are placed largest first onto the least loaded shard (ties broken
+    by the stable hash of their path relative to ``root``), so every machine
+    computes the same assignment from the same file list.
+    """
+    weighted = []
+    for file_path in files:
+        try:
+            size = file_path.stat().st_size
+        except OSError:
+            size = 0
+        relative = _relative_posix(file_path, root)
+        weighted.append((max(size, 1), stable_hash(relative), relative, file_path))
+
+    weighted.sort(key=lambda item: (-item[0], item[1], item[2]))
+
+    shards: List[List[Path]] = [[] for _ in range(count)]
+    loads = [(0, shard) for shard in range(count)]
+    heapq.heapify(loads)
+
+    for size, _, _, file_path in weighted:
+        load, shard = heapq.heappop(loads)
+        shards[shard].append(file_path)
+        heapq.heappush(loads, (load + size, shard))
+
+    return shards
+
+
+def select_shard(files: List[Path], root: Path, index: int, count: int) -> List[Path]:
+    """Return the files belonging to shard ``index`` of ``count``, in input order."""
+    selected = set(assign_shards(files, root, count)[index - 1])
+    return [file_path for file_path in files if file_path in selected]
+
+
+def build_partial(project_name: str, files: List[Dict[str, Any]], index: int, count: int) -> Dict[str, Any]:
+    """Wrap one shard's file data in the partial-result envelope."""
+    return {
+        "codedoc_shard": {
+            "version": SHARD_FORMAT_VERSION,
+            "index": index,
+            "count": count,
+        },
+        "project_name": project_name,
+        "files": files,
+    }
+
+
+def load_partial(path: str) -> Dict[str, Any]:
+    """Load a partial result written by ``codedoc generate --shard``."""
+    with open(path, 'r', encoding='utf-8') as f:
+        partial = json.load(f)
+
+    header = partial.get("codedoc_shard") if isinstance(partial, dict) else None
+    if not header:
+        raise ValueError(f"{path} is not a CodeDoc shard result")
+    if header.get("version") != SHARD_FORMAT_VERSION:
+        raise ValueError(f"{path} has unsupported shard format version {header.get('version')}")
+
+    return partial
+
+
+def merge_partials(partials: List[Dict[str, Any]]) -> Tuple[str, List[Dict[str, Any]]]:
+    """Merge shard partials into ``(project_name, files)``.
+
+    Raises ValueError if the shards disagree on the shard count, if a shard
+    is missing or supplied twice, or if they document different projects.
+    """
+    if not partials:
+        raise ValueError("No shard results to merge")
+
+    counts = {p["codedoc_shard"]["count"] for p in partials}
+    if len(counts) != 1:
+        raise ValueError(f"Shard results disagree on shard count: {sorted(counts)}")
+    count = counts.pop()
+
+    indices = [p["codedoc_shard"]["index"] for p in partials]
+    duplicates = sorted({i for i in indices if indices.count(i) > 1})
+    if duplicates:
+        raise ValueError(f"Shard(s) supplied more than once: {duplicates}")
+    missing = sorted(set(range(1, count + 1)) - set(indices))
+    if missing:
+        raise ValueError(f"Missing shard(s) {missing} of {count}")
+
+    project_names = {p.get("project_name") for p in partials}
+    if len(project_names) != 1:
+        raise ValueError(f"Shard results come from different projects: {sorted(map(str, project_names))}")
+
+    files = [file_data for p in partials for file_data in p.get("files", [])]
+    files.sort(key=lambda file_data: Path(file_data.get("file_path", "")).parts)
+
+    return project_names.pop(), files
+
+
+def _relative_posix(file_path: Path, root: Path) -> str:
+    """Path relative to the project root in POSIX form, for machine-independent hashing."""
+    try:
+        return file_path.relative_to(root).as_posix()
+    except ValueError:
+        return file_path.as_posix()
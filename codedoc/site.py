@@ -0,0 +1,209 @@
+"""
+Static Site Module 🌐
+
+Writes project documentation as a multi-page static site: a navigation
+index, one page per module (split into numbered pages for huge modules),
+and one stylesheet and search script shared by every page, so browsers
+download and cache them once instead of with every document.
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Set, TextIO
+
+from markupsafe import Markup
+
+from .search import SEARCH_SCRIPT, SearchIndexBuilder
+from .templates import STYLESHEET, HTMLTemplate, chunked, template_environment
+from .xref import CrossReferenceIndex, Definition, file_anchor, symbol_anchor
+
+
+SYMBOLS_PER_PAGE = 200
+ASSETS_DIR = "assets"
+SEARCH_DIR = "search"
+# Pages the writer produced, so a later run removes only its own stale pages
+MANIFEST_NAME = "codedoc-pages.json"
+
+
+def page_names(file_path: str, pages: int) -> List[str]:
+    """File names of a module's pages; later pages are numbered (``file-pkg-mod-py.2.html``)."""
+    stem = file_anchor(file_path)
+    return [f"{stem}.html" if page == 1 else f"{stem}.{page}.html" for page in range(1, pages + 1)]
+
+
+def paginate(file_data: Dict[str, Any], per_page: int = SYMBOLS_PER_PAGE) -> List[Dict[str, Any]]:
+    """Split a file's data into pages of at most ``per_page`` functions and classes.
+
+    Functions come first, then classes; imports are shown on the first page
+    only. Duplicates and small files stay on a single page.
+    """
+    functions = file_data.get("functions") or []
+    classes = file_data.get("classes") or []
+    if file_data.get("duplicate_of") or len(functions) + len(classes) <= per_page:
+        return [file_data]
+    pages = []
+    for start in range(0, len(functions) + len(classes), per_page):
+        end = start + per_page
+        pages.append(dict(
+            file_data,
+            functions=functions[start:end],
+            classes=classes[max(start - len(functions), 0):max(end - len(functions), 0)],
+            imports=file_data.get("imports", []) if start == 0 else [],
+        ))
+    return pages
+
+
+class SiteTemplate(HTMLTemplate):
+    """🌐 HTML renderer for site pages, linking across pages instead of within one document."""
+
+    def __init__(self, pages: Dict[str, str]):
+        """Create a renderer.
+
+        Args:
+            pages: Maps every file and symbol anchor to the page it is on
+        """
+        self.pages = pages
+
+    def href(self, target: Definition) -> str:
+        """URL of a definition, relative to any page of the site."""
+        return f"{self.pages.get(target.anchor, '')}#{target.anchor}"
+
+    def _href(self, target: Definition) -> str:
+        return self.href(target)
+
+    def _file_href(self, file_path: str) -> str:
+        anchor = file_anchor(file_path)
+        return f"{self.pages.get(anchor, '')}#{anchor}"
+
+    def render_page_to(
+        self,
+        stream: TextIO,
+        data: Dict[str, Any],
+        site: Dict[str, Any],
+        xref: CrossReferenceIndex,
+        page: int = 1,
+        pages: Iterable[str] = ()
+    ) -> None:
+        """Write one page of a module to ``stream`` chunk by chunk.
+
+        Args:
+            stream: Output file
+            data: The page's file data (see ``paginate``)
+            site: Variables shared by all pages (project name, assets, search)
+            xref: Project-wide cross-references
+            page: 1-based page number
+            pages: File names of all of the module's pages
+        """
+        template = template_environment().get_template("site-page.html")
+        context = dict(self._module_context(data, xref), page=page, pages=list(pages), **site)
+        for chunk in chunked(template.generate(context)):
+            stream.write(chunk)
+
+
+class StaticSiteWriter:
+    """🌐 Writes a project's documentation as a multi-page static site."""
+
+    def __init__(self, symbols_per_page: int = SYMBOLS_PER_PAGE, search_index: bool = True):
+        """Create a writer.
+
+        Args:
+            symbols_per_page: Functions and classes per page before a module
+                is split into numbered pages
+            search_index: Write the client-side search index and add a
+                search box to every page
+        """
+        if symbols_per_page < 1:
+            raise ValueError("symbols_per_page must be at least 1")
+        self.symbols_per_page = symbols_per_page
+        self.search_index = search_index
+
+    def write(
+        self,
+        directory: str,
+        combined_data: Dict[str, Any],
+        files: Callable[[], Iterable[Dict[str, Any]]]
+    ) -> str:
+        """Write the site into ``directory`` (created if needed).
+
+        Args:
+            directory: Output directory
+            combined_data: Project name, total files and languages
+            files: Returns a fresh iterable of the project's file data; it is
+                read several times, so spilled runs can stream it from their store
+
+        Returns:
+            Path of the index page
+        """
+        target = Path(directory)
+        target.mkdir(parents=True, exist_ok=True)
+        previous = self._read_manifest(target)
+
+        pages: Dict[str, str] = {}
+        modules = []
+        for file_data in files():
+            file_path = str(file_data.get("file_path", ""))
+            names = page_names(file_path, len(paginate(file_data, self.symbols_per_page)))
+            pages[file_anchor(file_path)] = names[0]
+            if not file_data.get("duplicate_of"):
+                symbols = (file_data.get("functions") or []) + (file_data.get("classes") or [])
+                for position, symbol in enumerate(symbols):
+                    pages[symbol_anchor(file_path, symbol["name"])] = names[position // self.symbols_per_page]
+            modules.append({
+                "file_path": file_path,
+                "href": names[0],
+                "pages": len(names),
+                "language": file_data.get("language", "unknown"),
+                "functions": file_data.get("total_functions", len(file_data.get("functions") or [])),
+                "classes": file_data.get("total_classes", len(file_data.get("classes") or [])),
+                "duplicate_of": file_data.get("duplicate_of"),
+            })
+
+        template = SiteTemplate(pages)
+        xref = CrossReferenceIndex.build(files())
+        search_url = None
+        if self.search_index:
+            SearchIndexBuilder.build(files(), href=template.href).write(str(target / SEARCH_DIR))
+            search_url = SEARCH_DIR
+
+        assets = target / ASSETS_DIR
+        assets.mkdir(exist_ok=True)
+        (assets / "codedoc.css").write_text(STYLESHEET, encoding="utf-8")
+        (assets / "search.js").write_text(SEARCH_SCRIPT, encoding="utf-8")
+
+        site = {
+            "project_name": combined_data.get("project_name", "Documentation"),
+            "assets": ASSETS_DIR,
+            "generated": datetime.now().strftime('%Y-%m-%d %H:%M'),
+            "search_url": search_url,
+            "search_script": Markup(f'<script src="{ASSETS_DIR}/search.js"></script>'),
+        }
+        written = set()
+        for file_data in files():
+            page_data = paginate(file_data, self.symbols_per_page)
+            names = page_names(str(file_data.get("file_path", "")), len(page_data))
+            for page, (name, data) in enumerate(zip(names, page_data), start=1):
+                with open(target / name, "w", encoding="utf-8") as stream:
+                    template.render_page_to(stream, data, site, xref, page, names)
+                written.add(name)
+        for stale in previous - written:
+            (target / stale).unlink(missing_ok=True)
+        (target / MANIFEST_NAME).write_text(json.dumps({"pages": sorted(written)}, indent=2), encoding="utf-8")
+
+        index = target / "index.html"
+        index.write_text(template_environment().get_template("site-index.html").render(
+            site,
+            modules=modules,
+            total_files=combined_data.get("total_files", len(modules)),
+            languages=combined_data.get("languages", []),
+        ), encoding="utf-8")
+        return str(index)
+
+    @staticmethod
+    def _read_manifest(target: Path) -> Set[str]:
+        """Pages an earlier run wrote into ``target``; names that are not plain page files are ignored."""
+        try:
+            pages = json.loads((target / MANIFEST_NAME).read_text(encoding="utf-8")).get("pages", [])
+        except (OSError, ValueError, AttributeError):
+            return set()
+        return {name for name in pages if isinstance(name, str) and name == Path(name).name and name.endswith(".html")}
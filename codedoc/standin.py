@@ -0,0 +1,251 @@
+"""
+AI Stand-in Server Module 🧪
+
+A local, OpenAI-compatible chat-completions endpoint with configurable
+latency, injected errors and deterministic canned answers, for measuring
+and regression-testing the AI path offline.
+"""
+
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional
+
+
+# Characters per streamed chunk when a request asks for ``stream: true``
+STREAM_CHUNK_CHARS = 16
+
+_SIGNATURE = re.compile(r"^(?:Signature|Function Name|Class Name): (.*)$", re.MULTILINE)
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """Parse a latency distribution in milliseconds into a sampler returning seconds.
+
+    Accepted forms: ``"100"`` or ``"fixed:100"``, ``"uniform:50:150"``,
+    ``"normal:100:20"`` (mean, standard deviation) and ``"exp:100"`` (mean).
+    """
+    kind, _, rest = spec.partition(":") if ":" in spec else ("fixed", ":", spec)
+    try:
+        values = [float(value) for value in rest.split(":")] if rest else []
+    except ValueError:
+        raise ValueError(f"Invalid latency spec: {spec!r}")
+
+    samplers = {
+        ("fixed", 1): lambda rng: values[0],
+        ("uniform", 2): lambda rng: rng.uniform(values[0], values[1]),
+        ("normal", 2): lambda rng: rng.gauss(values[0], values[1]),
+        ("exp", 1): lambda rng: rng.expovariate(1 / values[0]) if values[0] else 0.0,
+    }
+    sampler = samplers.get((kind, len(values)))
+    if sampler is None or any(value < 0 for value in values):
+        raise ValueError(f"Invalid latency spec: {spec!r}")
+    return lambda rng: max(0.0, sampler(rng)) / 1000
+
+
+@dataclass
+class StandInConfig:
+    """🧪 Behaviour of the stand-in server.
+
+    Attributes:
+        latency: Latency distribution (see ``parse_latency``)
+        error_rate: Fraction of requests answered with HTTP 500
+        rate_limit_rate: Fraction of requests answered with HTTP 429
+        retry_after: Retry-After seconds sent with injected 429s
+        seed: Seed for latency and error injection
+    """
+    latency: str = "0"
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after: float = 1.0
+    seed: int = 0
+
+    def __post_init__(self):
+        for name in ("error_rate", "rate_limit_rate"):
+            if not 0.0 <= getattr(self, name) <= 1.0:
+                raise ValueError(f"{name} must be between 0 and 1")
+        self.sample_latency = parse_latency(self.latency)
+
+
+def canned_response(prompt: str) -> str:
+    """Deterministic answer to a CodeDoc prompt.
+
+    Batched prompts get a JSON object keyed by symbol number, symbol prompts a
+    JSON document, and anything else (e.g. docstring prompts) plain text.
+    """
+    signatures = _SIGNATURE.findall(prompt)
+    if not signatures:
+        return f"Stand-in answer {hashlib.sha1(prompt.encode('utf-8')).hexdigest()[:8]}"
+
+    def answer(signature: str) -> Dict[str, Any]:
+        name = re.split(r"[\s(]", signature.strip().replace("async ", "", 1), 1)[0]
+        return {
+            "examples": [f"# Example usage of {name}\n{name}()"],
+            "explanation": f"{signature.strip()} (stand-in explanation)",
+            "use_cases": [f"Using {name}"],
+        }
+
+    if "### Symbol" in prompt:
+        return json.dumps({str(number): answer(signature) for number, signature in enumerate(signatures, 1)})
+    return json.dumps(answer(signatures[0]))
+
+
+class StandInServer:
+    """🧪 Threaded HTTP server speaking the chat-completions API."""
+
+    def __init__(self, config: Optional[StandInConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        """Create the server (port 0 picks a free port); call ``start`` or ``serve_forever``."""
+        self.config = config or StandInConfig()
+        self.stats = {"requests": 0, "connections": 0, "errors": 0, "rate_limited": 0,
+                      "in_flight": 0, "peak_in_flight": 0}
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+
+    @property
+    def base_url(self) -> str:
+        """Base URL to pass to ``AIExampleGenerator(base_url=...)``."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "StandInServer":
+        """Serve in a background thread."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="codedoc-standin", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Serve in the current thread until interrupted."""
+        self._httpd.serve_forever()
+
+    def stop(self) -> None:
+        """Shut the server down."""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> "StandInServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+    def _draw(self):
+        """Latency and outcome of the next request, drawn in arrival order."""
+        with self._lock:
+            self.stats["requests"] += 1
+            latency = self.config.sample_latency(self._rng)
+            roll = self._rng.random()
+        if roll < self.config.rate_limit_rate:
+            return latency, 429
+        if roll < self.config.rate_limit_rate + self.config.error_rate:
+            return latency, 500
+        return latency, 200
+
+    def _count(self, key: str, delta: int = 1) -> None:
+        with self._lock:
+            self.stats[key] += delta
+            self.stats["peak_in_flight"] = max(self.stats["peak_in_flight"], self.stats["in_flight"])
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep-alive, so client connection pooling can be measured
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                server._count("connections")
+
+            def do_POST(self):
+                if not self.path.rstrip("/").endswith("/chat/completions"):
+                    return self._send(404, {"error": {"message": "Not found", "type": "invalid_request_error"}})
+                try:
+                    length = int(self.headers.get("Content-Length", 0))
+                    request = json.loads(self.rfile.read(length) or b"{}")
+                    prompt = request["messages"][-1]["content"]
+                except (ValueError, KeyError, IndexError, TypeError):
+                    return self._send(400, {"error": {"message": "Malformed request", "type": "invalid_request_error"}})
+
+                latency, status = server._draw()
+                server._count("in_flight")
+                try:
+                    time.sleep(latency)
+                finally:
+                    server._count("in_flight", -1)
+
+                if status == 429:
+                    server._count("rate_limited")
+                    return self._send(429, {"error": {"message": "Rate limit reached (stand-in)",
+                                                      "type": "rate_limit_exceeded", "code": "rate_limit_exceeded"}},
+                                      {"Retry-After": f"{server.config.retry_after:g}"})
+                if status == 500:
+                    server._count("errors")
+                    return self._send(500, {"error": {"message": "Injected failure (stand-in)", "type": "server_error"}})
+
+                content = canned_response(prompt)
+                prompt_tokens = sum(len(m.get("content", "")) for m in request["messages"]) // 4 + 1
+                completion_tokens = len(content) // 4 + 1
+                completion = {
+                    "id": f"chatcmpl-standin-{server.stats['requests']}",
+                    "created": int(time.time()),
+                    "model": request.get("model", "standin"),
+                }
+                usage = {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                         "total_tokens": prompt_tokens + completion_tokens}
+                if request.get("stream"):
+                    include_usage = (request.get("stream_options") or {}).get("include_usage")
+                    return self._send_stream(completion, content, usage if include_usage else None)
+                self._send(200, dict(
+                    completion,
+                    object="chat.completion",
+                    choices=[{"index": 0, "message": {"role": "assistant", "content": content},
+                              "finish_reason": "stop"}],
+                    usage=usage,
+                ))
+
+            def _send_stream(self, completion: Dict[str, Any], content: str,
+                             usage: Optional[Dict[str, int]] = None) -> None:
+                """Answer as server-sent ``chat.completion.chunk`` events.
+
+                With ``usage``, a final chunk without choices reports it, as
+                requested by ``stream_options.include_usage``.
+                """
+                pieces = [content[i:i + STREAM_CHUNK_CHARS] for i in range(0, len(content), STREAM_CHUNK_CHARS)]
+                deltas = [{"role": "assistant", "content": ""}] + [{"content": piece} for piece in pieces]
+                events = [
+                    dict(completion, object="chat.completion.chunk",
+                         choices=[{"index": 0, "delta": delta, "finish_reason": None}])
+                    for delta in deltas
+                ]
+                events[-1]["choices"][0]["finish_reason"] = "stop"
+                if usage:
+                    events.append(dict(completion, object="chat.completion.chunk", choices=[], usage=usage))
+                payload = "".join(f"data: {json.dumps(event)}\n\n" for event in events) + "data: [DONE]\n\n"
+                self._send_raw(200, payload.encode("utf-8"), "text/event-stream")
+
+            def _send(self, status: int, body: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+                self._send_raw(status, json.dumps(body).encode("utf-8"), "application/json", headers)
+
+            def _send_raw(self, status: int, payload: bytes, content_type: str,
+                          headers: Optional[Dict[str, str]] = None) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass  # Keep benchmark output clean
+
+        return Handler
@@ -0,0 +1,123 @@
+"""
+Symbol Store Module 💾
+
+Spills per-file documentation data to an embedded SQLite database so that
+projects larger than RAM can be documented with bounded memory.
+"""
+
+import json
+import os
+import sqlite3
+import tempfile
+from typing import Dict, Any, Iterator, List, Optional
+
+
+class SymbolStore:
+    """💾 On-disk store for parsed and enhanced file data.
+
+    Files are appended as they are produced and read back in insertion order
+    in small batches, so only ``batch_size`` files are held in memory at once.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        batch_size: int = 64,
+        cache_size_kib: int = 8192,
+        commit_every: int = 100
+    ):
+        """Open (or create) a store.
+
+        Args:
+            path: Database file; a temporary file removed on ``close`` if omitted
+            batch_size: Number of files fetched per round trip when iterating
+            cache_size_kib: SQLite page cache budget
+            commit_every: Number of inserts between commits
+        """
+        self._temporary = path is None
+        if path is None:
+            fd, path = tempfile.mkstemp(prefix="codedoc-spill-", suffix=".sqlite3")
+            os.close(fd)
+
+        self.path = path
+        self.batch_size = batch_size
+        self.commit_every = commit_every
+        self._pending = 0
+
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(f"PRAGMA cache_size = -{int(cache_size_kib)}")
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = OFF")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS files (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                file_path TEXT NOT NULL,
+                language TEXT NOT NULL,
+                total_functions INTEGER NOT NULL,
+                total_classes INTEGER NOT NULL,
+                data TEXT NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def add_file(self, file_data: Dict[str, Any]) -> None:
+        """Spill one file's documentation data to disk."""
+        self._conn.execute(
+            "INSERT INTO files (file_path, language, total_functions, total_classes, data) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (
+                str(file_data.get("file_path", "")),
+                file_data.get("language", "unknown"),
+                file_data.get("total_functions", 0),
+                file_data.get("total_classes", 0),
+                json.dumps(file_data, default=str),
+            )
+        )
+        self._pending += 1
+        if self._pending >= self.commit_every:
+            self.flush()
+
+    def flush(self) -> None:
+        """Commit pending inserts."""
+        self._conn.commit()
+        self._pending = 0
+
+    def count(self) -> int:
+        """Number of files in the store."""
+        self.flush()
+        return self._conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    def languages(self) -> List[str]:
+        """Distinct languages of the stored files, sorted."""
+        self.flush()
+        rows = self._conn.execute("SELECT DISTINCT language FROM files ORDER BY language")
+        return [row[0] for row in rows]
+
+    def iter_files(self) -> Iterator[Dict[str, Any]]:
+        """Yield stored file data in insertion order, one batch at a time."""
+        self.flush()
+        cursor = self._conn.execute("SELECT data FROM files ORDER BY id")
+        while True:
+            rows = cursor.fetchmany(self.batch_size)
+            if not rows:
+                break
+            for (data,) in rows:
+                yield json.loads(data)
+
+    def close(self) -> None:
+        """Close the database, removing it if it was temporary."""
+        self._conn.close()
+        if self._temporary:
+            for suffix in ("", "-wal", "-shm"):
+                try:
+                    os.unlink(self.path + suffix)
+                except OSError:
+                    pass
+
+    def __enter__(self) -> "SymbolStore":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
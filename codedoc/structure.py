@@ -0,0 +1,91 @@
+"""
+Structural Hashing Module 🧬
+
+Normalized hashes of functions and classes that ignore identifiers,
+literals, docstrings, comments and whitespace, so symbols that differ only
+in naming (CRUD handlers, serializers, generated adapters) hash alike.
+"""
+
+import ast
+import hashlib
+from typing import Any, Dict, Optional
+
+
+# Smaller symbols are too generic to share AI output
+MIN_STRUCTURE_NODES = 20
+
+# Babel node keys that carry positions or comments rather than structure
+_JS_IGNORED_KEYS = frozenset({
+    "loc", "start", "end", "range", "extra", "comments", "leadingComments", "trailingComments", "innerComments",
+})
+# Babel node keys holding identifier names or literal values
+_JS_LITERAL_KEYS = frozenset({"name", "value", "raw", "pattern", "flags", "cooked"})
+
+
+def python_structure_hash(node: ast.AST) -> Optional[str]:
+    """Structural hash of a Python function or class node.
+
+    Node types and nesting are kept; every identifier and literal value
+    is dropped, as are docstrings.
+
+    Returns:
+        A ``"py:"``-prefixed digest, or ``None`` for symbols below
+        ``MIN_STRUCTURE_NODES``
+    """
+    count = 0
+
+    def walk(value: Any) -> str:
+        nonlocal count
+        if isinstance(value, ast.AST):
+            count += 1
+            fields = ",".join(walk(getattr(value, field, None)) for field in value._fields)
+            return f"{type(value).__name__}({fields})"
+        if isinstance(value, list):
+            if value and _is_docstring(value[0]):
+                value = value[1:]
+            return "[" + ",".join(walk(item) for item in value) + "]"
+        return "" if value is None else "_"
+
+    shape = walk(node)
+    return _digest("py", shape) if count >= MIN_STRUCTURE_NODES else None
+
+
+def js_structure_hash(node: Dict[str, Any]) -> Optional[str]:
+    """Structural hash of a Babel function, class or method node.
+
+    Operators, declaration kinds and flags such as ``async`` are kept;
+    names, literal values, positions and comments are dropped.
+
+    Returns:
+        A ``"js:"``-prefixed digest, or ``None`` for symbols below
+        ``MIN_STRUCTURE_NODES``
+    """
+    count = 0
+
+    def walk(value: Any, key: str = "") -> str:
+        nonlocal count
+        if isinstance(value, dict):
+            count += 1
+            fields = ",".join(
+                f"{field}={walk(value[field], field)}"
+                for field in sorted(value)
+                if field != "type" and field not in _JS_IGNORED_KEYS
+            )
+            return f"{value.get('type', '')}({fields})"
+        if isinstance(value, list):
+            return "[" + ",".join(walk(item) for item in value) + "]"
+        if key in _JS_LITERAL_KEYS:
+            return "_"
+        return repr(value)
+
+    shape = walk(node)
+    return _digest("js", shape) if count >= MIN_STRUCTURE_NODES else None
+
+
+def _is_docstring(statement: Any) -> bool:
+    return (isinstance(statement, ast.Expr) and isinstance(statement.value, ast.Constant)
+            and isinstance(statement.value.value, str))
+
+
+def _digest(prefix: str, shape: str) -> str:
+    return f"{prefix}:{hashlib.sha256(shape.encode('utf-8')).hexdigest()[:32]}"
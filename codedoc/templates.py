@@ -2,210 +2,711 @@
 Templates Module for CodeDoc AI 🎨
 
 Handles HTML and Markdown template rendering for documentation output.
+Pages and the symbol blocks inside them are Jinja2 templates that are
+compiled once per process (and cached as bytecode across processes); HTML
+templates autoescape every field.
 """
 
 import json
-from typing import Dict, Any, List
+import os
+import re
 from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Any, Iterable, Iterator, List, Optional, TextIO, Tuple
 
+from jinja2 import DictLoader, Environment, FileSystemBytecodeCache, Template, select_autoescape
+from markupsafe import Markup, escape
 
-class HTMLTemplate:
-    """HTML template renderer for documentation."""
-    
-    def render(self, data: Dict[str, Any]) -> str:
-        """Render data to HTML format."""
-        html = f"""
-<!DOCTYPE html>
+from .cache import default_cache_path
+from .xref import CrossReferenceIndex, Definition, file_anchor, symbol_anchor
+from .search import SEARCH_SCRIPT
+
+
+STYLESHEET = """
+        body { font-family: -apple-system, 'Segoe UI', sans-serif; margin: 40px; background: #f5f5f5; }
+        .container { max-width: 1200px; margin: 0 auto; background: white; padding: 40px; border-radius: 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }
+        h1 { color: #2563eb; border-bottom: 2px solid #2563eb; padding-bottom: 10px; }
+        h2 { color: #1e40af; margin-top: 30px; }
+        h3 { color: #3b82f6; }
+        .function, .class { background: #f8fafc; border-left: 4px solid #3b82f6; padding: 20px; margin: 20px 0; border-radius: 5px; }
+        .docstring { color: #6b7280; margin: 10px 0; font-style: italic; }
+        .params { background: #ecfdf5; padding: 10px; border-radius: 5px; margin: 10px 0; }
+        .code { background: #1e293b; color: #e2e8f0; padding: 15px; border-radius: 5px; overflow-x: auto; font-family: 'SF Mono', Monaco, monospace; }
+        .stats { background: #dbeafe; padding: 15px; border-radius: 5px; margin: 20px 0; }
+        .tag { background: #3b82f6; color: white; padding: 2px 6px; border-radius: 3px; font-size: 12px; margin-right: 5px; }
+        .search input { width: 100%; padding: 10px; font-size: 16px; border: 1px solid #cbd5e1; border-radius: 5px; box-sizing: border-box; }
+        .search ul { list-style: none; padding: 0; margin: 5px 0; max-height: 400px; overflow-y: auto; }
+        .search li { padding: 6px 10px; border-bottom: 1px solid #e5e7eb; }
+        .site-nav { margin-bottom: 20px; }
+        .site-nav .pages { margin-left: 20px; }
+        .modules li { padding: 6px 0; border-bottom: 1px solid #e5e7eb; }
+        .ai { background: #fefce8; border-left: 4px solid #eab308; padding: 10px 15px; border-radius: 5px; margin: 10px 0; }
+"""
+
+INCLUDE_PATTERN = re.compile(r'{%\s*include\s+"([^"]+)"\s*%}')
+
+# Characters gathered from the template before a chunk is handed out
+RENDER_CHUNK_SIZE = 64 * 1024
+
+# Symbol templates render ``symbol``; the ``link``, ``anchor`` and ``signature``
+# filters take ``links``, the ``FileLinks`` of the file being documented
+HTML_TEMPLATES = {
+    "codedoc.css": STYLESHEET,
+    "function.html": """{% set signature = symbol|signature(links) %}
+        <div class="function" id="{{ symbol['name']|anchor(links) }}">
+            <h3>⚡ {{ symbol['name'] }}({{ signature }})</h3>
+{% if symbol['docstring'] %}
+            <div class="docstring">"{{ symbol['docstring'] }}"</div>
+{% endif %}
+{% if signature %}
+            <div class="params"><strong>Parameters:</strong> {{ signature }}</div>
+{% endif %}
+{% set return_type = symbol['return_type'] or symbol['return_annotation'] %}
+{% if return_type %}
+            <div class="params"><strong>Returns:</strong> {{ return_type|link(links) }}</div>
+{% endif %}
+{% if symbol['source_code'] %}
+            <div class="code">{{ symbol['source_code'] }}</div>
+{% endif %}
+{% include "ai.html" %}
+        </div>
+""",
+    "class.html": """        <div class="class" id="{{ symbol['name']|anchor(links) }}">
+            <h3>🏗️ {{ symbol['name'] }}</h3>
+{% if symbol['docstring'] %}
+            <div class="docstring">"{{ symbol['docstring'] }}"</div>
+{% endif %}
+{% set bases = symbol['bases'] or ([symbol['extends']] if symbol['extends'] else []) %}
+{% if bases %}
+            <div class="params"><strong>Extends:</strong> {% for base in bases %}{{ ', ' if not loop.first }}{{ base|link(links) }}{% endfor %}</div>
+{% endif %}
+{% if symbol['methods'] %}
+            <div class="params"><strong>Methods ({{ symbol['methods']|length }}):</strong> {% for method in symbol['methods'] %}{{ ', ' if not loop.first }}{{ method['name'] }}{% endfor %}</div>
+{% endif %}
+{% if symbol['source_code'] %}
+            <div class="code">{{ symbol['source_code'] }}</div>
+{% endif %}
+{% include "ai.html" %}
+        </div>
+""",
+    "ai.html": """{% set explanation, examples, use_cases = symbol|ai_sections %}
+{% set parameters, returns = symbol|parameter_sections %}
+{% if explanation or examples or use_cases or parameters or returns %}
+            <div class="ai">
+{% if explanation %}
+                <p>✨ {{ explanation }}</p>
+{% endif %}
+{% if parameters %}
+                <table class="params"><tr><th>Parameter</th><th>Type</th><th>Default</th><th>Description</th></tr>
+{% for row in parameters %}
+                    <tr><td>{{ row['name'] }}</td><td>{{ row['type'] }}</td><td>{{ row['default'] }}</td><td>{{ row['description'] }}</td></tr>
+{% endfor %}
+                </table>
+{% endif %}
+{% if returns %}
+                <div class="params"><strong>↩️ Returns:</strong> {{ returns['type'] }}{{ ' — ' if returns['type'] and returns['description'] }}{{ returns['description'] }}</div>
+{% endif %}
+{% if examples %}
+                <strong>💡 Examples:</strong>
+{% for example in examples %}
+                <div class="code">{{ example }}</div>
+{% endfor %}
+{% endif %}
+{% if use_cases %}
+                <strong>🎯 Use cases:</strong><ul>{% for use_case in use_cases %}<li>{{ use_case }}</li>{% endfor %}</ul>
+{% endif %}
+            </div>
+{% endif %}
+""",
+    "search.html": """{% if search_url %}
+            <div class="search">
+                <input id="codedoc-search" type="search" placeholder="🔎 Search symbols..." autocomplete="off"
+                       data-index="{{ search_url }}">
+                <ul id="codedoc-search-results"></ul>
+            </div>
+            {{ search_script }}
+{% endif %}
+""",
+    "module-header.html": """        <header id="{{ file_anchor(file_path) }}">
+            <h1>📚 {{ data.get('file_path', 'Documentation') }}</h1>
+            <div class="stats">
+                <span class="tag">{{ data.get('language', 'Unknown')|upper }}</span>
+                <span class="tag">{{ data.get('total_functions', 0) }} Functions</span>
+                <span class="tag">{{ data.get('total_classes', 0) }} Classes</span>
+                <span class="tag">Generated: {{ generated }}</span>
+            </div>
+{% include "search.html" %}
+        </header>
+""",
+    "module-body.html": """{% if data['duplicate_of'] %}
+            <div class="params">📎 Identical to <a href="{{ duplicate_href }}">{{ data['duplicate_of'] }}</a></div>
+{% else %}
+{% if data['imports'] %}
+            <div class="params"><strong>Imports:</strong> {% for stmt in data['imports'] %}{{ ', ' if not loop.first }}<code>{{ stmt|link(links) }}</code>{% endfor %}</div>
+{% endif %}
+{% if data['functions'] %}
+            <h2>🔧 Functions</h2>
+{% for symbol in data['functions'] %}
+{% include "function.html" %}
+{% endfor %}
+{% endif %}
+{% if data['classes'] %}
+            <h2>🏗️ Classes</h2>
+{% for symbol in data['classes'] %}
+{% include "class.html" %}
+{% endfor %}
+{% endif %}
+{% endif %}
+""",
+    "module.html": """{% include "module-header.html" %}
+
+        <main>
+{% include "module-body.html" %}
+        </main>
+""",
+    "footer.html": """
+        <footer style="margin-top: 40px; text-align: center; color: #6b7280; border-top: 1px solid #e5e7eb; padding-top: 20px;">
+            <p>Generated by <strong>CodeDoc AI</strong> 🚀 - Smart Documentation Generator</p>
+        </footer>
+    </div>
+</body>
+</html>
+""",
+    "page.html": """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{{ data.get('file_path', 'Documentation') }} - CodeDoc AI</title>
+    <style>
+{% include "codedoc.css" %}
+    </style>
+</head>
+<body>
+    <div class="container">
+{% include "module.html" %}
+{% include "footer.html" %}
+""",
+    # All files of a project in one document, sharing its stylesheet; the
+    # search box goes in the first file's header
+    "project.html": """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{data.get('file_path', 'Documentation')} - CodeDoc AI</title>
+    <title>{{ data.get('project_name', 'Documentation') }} - CodeDoc AI</title>
     <style>
-        body {{ font-family: -apple-system, 'Segoe UI', sans-serif; margin: 40px; background: #f5f5f5; }}
-        .container {{ max-width: 1200px; margin: 0 auto; background: white; padding: 40px; border-radius: 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }}
-        h1 {{ color: #2563eb; border-bottom: 2px solid #2563eb; padding-bottom: 10px; }}
-        h2 {{ color: #1e40af; margin-top: 30px; }}
-        h3 {{ color: #3b82f6; }}
-        .function, .class {{ background: #f8fafc; border-left: 4px solid #3b82f6; padding: 20px; margin: 20px 0; border-radius: 5px; }}
-        .docstring {{ color: #6b7280; margin: 10px 0; font-style: italic; }}
-        .params {{ background: #ecfdf5; padding: 10px; border-radius: 5px; margin: 10px 0; }}
-        .code {{ background: #1e293b; color: #e2e8f0; padding: 15px; border-radius: 5px; overflow-x: auto; font-family: 'SF Mono', Monaco, monospace; }}
-        .stats {{ background: #dbeafe; padding: 15px; border-radius: 5px; margin: 20px 0; }}
-        .tag {{ background: #3b82f6; color: white; padding: 2px 6px; border-radius: 3px; font-size: 12px; margin-right: 5px; }}
+{% include "codedoc.css" %}
     </style>
 </head>
+<body>
+    <div class="container">
+        <main>
+{% for module in modules %}
+{% with data=module['data'], file_path=module['file_path'], duplicate_href=module['duplicate_href'],
+        links=module['links'], search_url=search_url if loop.first else none %}
+        <section class="module">
+{% include "module-header.html" %}
+{% include "module-body.html" %}
+        </section>
+{% endwith %}
+{% endfor %}
+        </main>
+{% include "footer.html" %}
+""",
+    # Multi-page site (see ``codedoc.site``): pages link the shared assets
+    "site-page.html": """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{{ data.get('file_path', 'Documentation') }} - {{ project_name }} - CodeDoc AI</title>
+    <link rel="stylesheet" href="{{ assets }}/codedoc.css">
+</head>
+<body>
+    <div class="container">
+        <nav class="site-nav">
+            <a href="index.html">🏠 {{ project_name }}</a>
+{% if pages|length > 1 %}
+            <span class="pages">Page {% for href in pages %}{% if loop.index == page %}<strong>{{ loop.index }}</strong>{% else %}<a href="{{ href }}">{{ loop.index }}</a>{% endif %} {% endfor %}of {{ pages|length }}</span>
+{% endif %}
+        </nav>
+{% include "module.html" %}
+{% if page < pages|length %}
+        <nav class="site-nav"><a href="{{ pages[page] }}">Next page →</a></nav>
+{% endif %}
+{% include "footer.html" %}
+""",
+    "site-index.html": """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{{ project_name }} - CodeDoc AI</title>
+    <link rel="stylesheet" href="{{ assets }}/codedoc.css">
+</head>
 <body>
     <div class="container">
         <header>
-            <h1>📚 {data.get('file_path', 'Documentation')}</h1>
+            <h1>📚 {{ project_name }}</h1>
             <div class="stats">
-                <span class="tag">{data.get('language', 'Unknown').upper()}</span>
-                <span class="tag">{data.get('total_functions', 0)} Functions</span>
-                <span class="tag">{data.get('total_classes', 0)} Classes</span>
-                <span class="tag">Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}</span>
+{% for language in languages %}
+                <span class="tag">{{ language|upper }}</span>
+{% endfor %}
+                <span class="tag">{{ total_files }} Files</span>
+                <span class="tag">Generated: {{ generated }}</span>
             </div>
+{% include "search.html" %}
         </header>
-        
+
         <main>
-        """
-        
-        # Add functions
-        if data.get('functions'):
-            html += "<h2>🔧 Functions</h2>"
-            for func in data['functions']:
-                html += self._render_function(func)
-        
-        # Add classes
-        if data.get('classes'):
-            html += "<h2>🏗️ Classes</h2>"
-            for cls in data['classes']:
-                html += self._render_class(cls)
-        
-        html += """
+            <h2>📦 Modules</h2>
+            <ul class="modules">
+{% for module in modules %}
+                <li><a href="{{ module['href'] }}">{{ module['file_path'] }}</a> <span class="tag">{{ module['language']|upper }}</span>
+{% if module['duplicate_of'] %}
+                    📎 Identical to {{ module['duplicate_of'] }}
+{% else %}
+                    {{ module['functions'] }} functions, {{ module['classes'] }} classes{{ ', %d pages' % module['pages'] if module['pages'] > 1 }}
+{% endif %}
+                </li>
+{% endfor %}
+            </ul>
         </main>
+{% include "footer.html" %}
+""",
+}
+
+MARKDOWN_TEMPLATES = {
+    "function.md": """### ⚡ `{{ symbol['name'] }}({{ (symbol['params'] or [])|join(', ') }})`
+
+{% if symbol['docstring'] %}
+> {{ symbol['docstring'] }}
+
+{% endif %}
+{% if symbol['params'] %}
+**Parameters:** {{ symbol['params']|join(', ') }}{{ '  ' }}
+{% endif %}
+{% if symbol['return_type'] %}
+**Returns:** {{ symbol['return_type'] }}{{ '  ' }}
+{% endif %}
+{% if symbol['source_code'] %}
+
+```{{ symbol.get('language', 'python') }}
+{{ symbol['source_code'] }}
+```
+
+{% endif %}
+{% include "ai.md" %}""",
+    "class.md": """### 🏗️ `{{ symbol['name'] }}`
+
+{% if symbol['docstring'] %}
+> {{ symbol['docstring'] }}
+
+{% endif %}
+{% if symbol['methods'] %}
+**Methods ({{ symbol['methods']|length }}):** {% for method in symbol['methods'] %}{{ ', ' if not loop.first }}{{ method['name'] }}{% endfor %}{{ '  ' }}
+
+{% endif %}
+{% if symbol['source_code'] %}
+```{{ symbol.get('language', 'python') }}
+{{ symbol['source_code'] }}
+```
+
+{% endif %}
+{% include "ai.md" %}""",
+    "ai.md": """{% set explanation, examples, use_cases = symbol|ai_sections %}
+{% set parameters, returns = symbol|parameter_sections %}
+{% if explanation %}
+✨ {{ explanation }}
+
+{% endif %}
+{% if parameters %}
+| Parameter | Type | Default | Description |
+|---|---|---|---|
+{% for row in parameters %}
+| {{ row['name']|cell }} | {{ row['type']|cell }} | {{ row['default']|cell }} | {{ row['description']|cell }} |
+{% endfor %}
+
+{% endif %}
+{% if returns %}
+**↩️ Returns:** {{ returns['type'] }}{{ ' — ' if returns['type'] and returns['description'] }}{{ returns['description'] }}
+
+{% endif %}
+{% if examples %}
+**💡 Examples:**
+
+{% for example in examples %}
+```{{ symbol.get('language', 'python') }}
+{{ example }}
+```
+
+{% endfor %}
+{% endif %}
+{% if use_cases %}
+**🎯 Use cases:**
+
+{% for use_case in use_cases %}
+- {{ use_case }}
+{% endfor %}
+
+{% endif %}""",
+    "page.md": """# 📚 {{ data.get('file_path', 'Documentation') }}
+
+**Language:** {{ data.get('language', 'Unknown')|upper }}{{ '  ' }}
+**Functions:** {{ data.get('total_functions', 0) }}{{ '  ' }}
+**Classes:** {{ data.get('total_classes', 0) }}{{ '  ' }}
+**Generated:** {{ generated }}
+
+---
+
+{% if data['duplicate_of'] %}
+📎 Identical to `{{ data['duplicate_of'] }}`
+{% else %}
+{% if data['functions'] %}
+## 🔧 Functions
+
+{% for symbol in data['functions'] %}
+{% include "function.md" %}
+{% endfor %}
+{% endif %}
+{% if data['classes'] %}
+## 🏗️ Classes
+
+{% for symbol in data['classes'] %}
+{% include "class.md" %}
+{% endfor %}
+{% endif %}
+{% endif %}
+
+---
+*Generated by **CodeDoc AI** 🚀 - Smart Documentation Generator*
+""",
+}
+
+
+def ai_sections(symbol: Dict[str, Any]) -> Tuple[str, List[str], List[str]]:
+    """The AI explanation, examples and use cases of a symbol as text.
+    
+    Model output is loosely typed, so single values are wrapped in lists and
+    everything is converted to strings.
+    """
+    def as_list(value: Any) -> List[str]:
+        if not value:
+            return []
+        values = value if isinstance(value, list) else [value]
+        return [item if isinstance(item, str) else json.dumps(item) for item in values if item]
+    
+    explanation = symbol.get('explanation') or ""
+    if not isinstance(explanation, str):
+        explanation = json.dumps(explanation)
+    return explanation.strip(), as_list(symbol.get('examples')), as_list(symbol.get('use_cases'))
+
+
+def parameter_sections(symbol: Dict[str, Any]) -> Tuple[List[Dict[str, str]], Dict[str, str]]:
+    """The enhancer's parameter table rows and return-value note as text.
+    
+    Rows keep the ``name``, ``type``, ``default`` and ``description`` keys
+    (empty strings when unknown); malformed entries are dropped.
+    """
+    def as_text(value: Any) -> str:
+        return "" if value is None else value if isinstance(value, str) else json.dumps(value)
+    
+    fields = ('name', 'type', 'default', 'description')
+    parameters = symbol.get('parameters')
+    rows = [
+        {field: as_text(parameter.get(field)) for field in fields}
+        for parameter in (parameters if isinstance(parameters, list) else [])
+        if isinstance(parameter, dict) and parameter.get('name')
+    ]
+    returns = symbol.get('returns')
+    note = {field: as_text(returns.get(field)) for field in ('type', 'description')} if isinstance(returns, dict) else {}
+    return rows, note if any(note.values()) else {}
+
+
+def inline_includes(templates: Dict[str, str]) -> Dict[str, str]:
+    """Template sources with every ``{% include %}`` replaced by the included source.
+    
+    Jinja2 builds a new context for each include it renders, which dominates
+    the time spent on files with thousands of symbols; inlining at load time
+    keeps the templates split up without that cost.
+    """
+    def expand(source: str) -> str:
+        return INCLUDE_PATTERN.sub(lambda match: expand(templates[match.group(1)]).rstrip("\n"), source)
+    
+    return {name: expand(source) for name, source in templates.items()}
+
+
+def chunked(pieces: Iterable[str], size: int = RENDER_CHUNK_SIZE) -> Iterator[str]:
+    """Join the many small strings a template generates into chunks of about ``size`` characters."""
+    buffer: List[str] = []
+    length = 0
+    for piece in pieces:
+        buffer.append(piece)
+        length += len(piece)
+        if length >= size:
+            yield "".join(buffer)
+            buffer, length = [], 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def template_cache_dir() -> str:
+    """Directory of the compiled template bytecode, next to the AI response cache."""
+    return os.path.join(os.path.dirname(default_cache_path()), "templates")
+
+
+@lru_cache(maxsize=None)
+def template_environment() -> Environment:
+    """The shared Jinja2 environment holding the HTML and Markdown templates.
+    
+    Templates are compiled on first use and kept for the life of the process;
+    their bytecode is also cached on disk when the cache directory is
+    writable, so later processes skip compilation.
+    """
+    bytecode_cache = None
+    try:
+        os.makedirs(template_cache_dir(), exist_ok=True)
+        if os.access(template_cache_dir(), os.W_OK):
+            bytecode_cache = FileSystemBytecodeCache(template_cache_dir())
+    except OSError:
+        pass
+    
+    environment = Environment(
+        loader=DictLoader(inline_includes(dict(HTML_TEMPLATES, **MARKDOWN_TEMPLATES))),
+        autoescape=select_autoescape(enabled_extensions=("html",), default_for_string=False),
+        bytecode_cache=bytecode_cache,
+        trim_blocks=True,
+        lstrip_blocks=True,
+        keep_trailing_newline=True
+    )
+    environment.globals["file_anchor"] = file_anchor
+    environment.filters.update(
+        ai_sections=ai_sections,
+        parameter_sections=parameter_sections,
+        link=lambda text, links: links.link(text),
+        anchor=lambda name, links: links.anchor(name),
+        signature=lambda func, links: links.signature(func),
+        cell=lambda text: text.replace("|", "\\|").replace("\n", " ")
+    )
+    return environment
+
+
+class FileLinks:
+    """Anchors, signatures and cross-reference links of one file's symbols.
+    
+    Templates use it through the ``anchor``, ``signature`` and ``link``
+    filters; signatures and links come back as escaped ``Markup``.
+    """
+    
+    def __init__(self, renderer: "HTMLTemplate", file_path: str, xref: CrossReferenceIndex):
+        self.renderer = renderer
+        self.file_path = file_path
+        self.xref = xref
+    
+    def anchor(self, name: str) -> str:
+        """Element id of a symbol of this file."""
+        return symbol_anchor(self.file_path, name)
+    
+    def signature(self, func: Dict[str, Any]) -> Markup:
+        """A function's parameters, with annotations linked."""
+        return self.renderer._render_params(func, self.file_path, self.xref)
+    
+    def link(self, text: str) -> Markup:
+        """``text`` with every name that resolves to a definition hyperlinked."""
+        return self.renderer._link(text, self.file_path, self.xref)
+
+
+class HTMLTemplate:
+    """HTML template renderer for documentation."""
+    
+    def render(
+        self,
+        data: Dict[str, Any],
+        xref: Optional[CrossReferenceIndex] = None,
+        search_url: Optional[str] = None
+    ) -> str:
+        """Render data to HTML format.
         
-        <footer style="margin-top: 40px; text-align: center; color: #6b7280; border-top: 1px solid #e5e7eb; padding-top: 20px;">
-            <p>Generated by <strong>CodeDoc AI</strong> 🚀 - Smart Documentation Generator</p>
-        </footer>
-    </div>
-</body>
-</html>
+        ``xref`` resolves names across the whole project; without it only
+        names defined in this file are linked. ``search_url`` points at a
+        search index written by ``SearchIndexBuilder`` and adds a search box.
         """
-        
-        return html
+        template, context = self._page(data, xref, search_url)
+        return template.render(context)
     
-    def _render_function(self, func: Dict[str, Any]) -> str:
-        """Render a single function."""
-        params_str = ", ".join(func.get('params', []))
+    def render_chunks(
+        self,
+        data: Dict[str, Any],
+        xref: Optional[CrossReferenceIndex] = None,
+        search_url: Optional[str] = None
+    ) -> Iterator[str]:
+        """Render like ``render``, yielding the document in chunks as it is produced.
         
-        html = f"""
-        <div class="function">
-            <h3>⚡ {func['name']}({params_str})</h3>
+        Only one chunk (see ``RENDER_CHUNK_SIZE``) is held at a time, so an
+        HTTP response can start sending before the page is complete.
         """
+        template, context = self._page(data, xref, search_url)
+        return chunked(template.generate(context))
+    
+    def render_to(
+        self,
+        stream: TextIO,
+        data: Dict[str, Any],
+        xref: Optional[CrossReferenceIndex] = None,
+        search_url: Optional[str] = None
+    ) -> None:
+        """Render like ``render``, writing the document to ``stream`` chunk by chunk."""
+        for chunk in self.render_chunks(data, xref, search_url):
+            stream.write(chunk)
+    
+    def _page(
+        self,
+        data: Dict[str, Any],
+        xref: Optional[CrossReferenceIndex],
+        search_url: Optional[str]
+    ) -> Tuple[Template, Dict[str, Any]]:
+        """The page template and its variables for one file."""
+        if xref is None:
+            xref = CrossReferenceIndex.build([data])
+        return template_environment().get_template("page.html"), dict(
+            self._module_context(data, xref),
+            generated=datetime.now().strftime('%Y-%m-%d %H:%M'),
+            search_url=search_url,
+            search_script=Markup(f"<script>{SEARCH_SCRIPT}</script>")
+        )
+    
+    def _module_context(self, data: Dict[str, Any], xref: CrossReferenceIndex) -> Dict[str, Any]:
+        """Variables of the ``module.html`` part of a page."""
+        file_path = str(data.get('file_path', ''))
+        duplicate_of = data.get('duplicate_of')
+        return {
+            "data": data,
+            "file_path": file_path,
+            "duplicate_href": self._file_href(duplicate_of) if duplicate_of else "",
+            "links": FileLinks(self, file_path, xref),
+        }
+    
+    def render_symbol(
+        self,
+        kind: str,
+        symbol: Dict[str, Any],
+        file_path: str,
+        xref: Optional[CrossReferenceIndex] = None
+    ) -> str:
+        """Render one function or class, e.g. to patch it into a page already shown.
         
-        if func.get('docstring'):
-            html += f'<div class="docstring">"{func["docstring"]}"</div>'
-        
-        if func.get('params'):
-            html += f'<div class="params"><strong>Parameters:</strong> {", ".join(func["params"])}</div>'
-        
-        if func.get('return_type'):
-            html += f'<div class="params"><strong>Returns:</strong> {func["return_type"]}</div>'
-        
-        if func.get('source_code'):
-            html += f'<div class="code">{self._escape_html(func["source_code"])}</div>'
-        
-        html += "</div>"
-        return html
-    
-    def _render_class(self, cls: Dict[str, Any]) -> str:
-        """Render a single class."""
-        html = f"""
-        <div class="class">
-            <h3>🏗️ {cls['name']}</h3>
+        The fragment replaces the element whose id is the symbol's anchor.
         """
+        if xref is None:
+            xref = CrossReferenceIndex()
+        name = "class.html" if kind == "class" else "function.html"
+        return template_environment().get_template(name).render(links=FileLinks(self, file_path, xref), symbol=symbol)
+    
+    def _render_params(self, func: Dict[str, Any], file_path: str, xref: CrossReferenceIndex) -> Markup:
+        """Render parameters, linking Python annotations to their definitions."""
+        if 'params' in func:
+            return escape(", ".join(func['params'] or []))
         
-        if cls.get('docstring'):
-            html += f'<div class="docstring">"{cls["docstring"]}"</div>'
-        
-        if cls.get('methods'):
-            html += f'<div class="params"><strong>Methods ({len(cls["methods"])}):</strong> '
-            method_names = [m['name'] for m in cls['methods']]
-            html += ", ".join(method_names)
-            html += '</div>'
-        
-        if cls.get('source_code'):
-            html += f'<div class="code">{self._escape_html(cls["source_code"])}</div>'
-        
-        html += "</div>"
-        return html
+        annotations = func.get('arg_annotations') or {}
+        # Plain identifiers, by far the most common arguments, never need escaping
+        return Markup(", ".join([
+            (arg if arg.isidentifier() else escape(arg))
+            + (f": {self._link(annotations[arg], file_path, xref)}" if arg in annotations else "")
+            for arg in func.get('args', [])
+        ]))
     
-    def _escape_html(self, text: str) -> str:
-        """Escape HTML characters."""
-        return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+    def _link(self, text: str, file_path: str, xref: CrossReferenceIndex) -> Markup:
+        """Escape ``text`` and hyperlink every name that resolves to a definition."""
+        # Joined as plain strings and marked safe once; ``Markup`` arithmetic
+        # per segment dominates rendering time on large files, and names
+        # (most segments) never need escaping
+        return Markup("".join([
+            f'<a href="{escape(self._href(target))}">{escape(segment)}</a>' if target
+            else segment if segment.isidentifier() else escape(segment)
+            for segment, target in xref.link_segments(text, file_path)
+        ]))
     
-    def render_project(self, data: Dict[str, Any]) -> str:
-        """Render multiple files as a project."""
-        # Simplified project rendering
-        html_parts = [self.render(file_data) for file_data in data.get('files', [])]
-        return "\n\n".join(html_parts)
+    def _href(self, target: Definition) -> str:
+        """Link target for a resolved definition."""
+        return f"#{target.anchor}"
+    
+    def _file_href(self, file_path: str) -> str:
+        """Link target for another file's documentation."""
+        return f"#{file_anchor(file_path)}"
+    
+    def render_project(
+        self,
+        data: Dict[str, Any],
+        xref: Optional[CrossReferenceIndex] = None,
+        search_url: Optional[str] = None
+    ) -> str:
+        """Render multiple files as one project document."""
+        return "".join(self.render_project_chunks(data, xref=xref, search_url=search_url))
+    
+    def render_project_chunks(
+        self,
+        data: Dict[str, Any],
+        files: Optional[Iterable[Dict[str, Any]]] = None,
+        xref: Optional[CrossReferenceIndex] = None,
+        search_url: Optional[str] = None
+    ) -> Iterator[str]:
+        """Render like ``render_project``, yielding the document in chunks.
+        
+        ``files`` replaces ``data['files']``, so a spilled run can stream the
+        files from its store; each file is rendered only when it is reached.
+        """
+        if files is None:
+            files = data.get('files', [])
+        if xref is None:
+            files = list(files)
+            xref = CrossReferenceIndex.build(files)
+        template = template_environment().get_template("project.html")
+        return chunked(template.generate(
+            data=data,
+            modules=(self._module_context(file_data, xref) for file_data in files),
+            generated=datetime.now().strftime('%Y-%m-%d %H:%M'),
+            search_url=search_url,
+            search_script=Markup(f"<script>{SEARCH_SCRIPT}</script>")
+        ))
 
 
 class MarkdownTemplate:
     """Markdown template renderer for documentation."""
     
-    def render(self, data: Dict[str, Any]) -> str:
-        """Render data to Markdown format."""
-        md = f"""# 📚 {data.get('file_path', 'Documentation')}
-
-**Language:** {data.get('language', 'Unknown').upper()}  
-**Functions:** {data.get('total_functions', 0)}  
-**Classes:** {data.get('total_classes', 0)}  
-**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M')}
-
----
-
-"""
-        
-        # Add functions
-        if data.get('functions'):
-            md += "## 🔧 Functions\n\n"
-            for func in data['functions']:
-                md += self._render_function(func)
-        
-        # Add classes
-        if data.get('classes'):
-            md += "## 🏗️ Classes\n\n"
-            for cls in data['classes']:
-                md += self._render_class(cls)
-        
-        md += "\n---\n*Generated by **CodeDoc AI** 🚀 - Smart Documentation Generator*\n"
-        
-        return md
+    def render(self, data: Dict[str, Any], xref: Optional[CrossReferenceIndex] = None) -> str:
+        """Render data to Markdown format (``xref`` is accepted for API parity)."""
+        template, context = self._page(data)
+        return template.render(context)
     
-    def _render_function(self, func: Dict[str, Any]) -> str:
-        """Render a single function in Markdown."""
-        params_str = ", ".join(func.get('params', []))
-        
-        md = f"### ⚡ `{func['name']}({params_str})`\n\n"
-        
-        if func.get('docstring'):
-            md += f"> {func['docstring']}\n\n"
-        
-        if func.get('params'):
-            md += f"**Parameters:** {', '.join(func['params'])}  \n"
-        
-        if func.get('return_type'):
-            md += f"**Returns:** {func['return_type']}  \n"
-        
-        if func.get('source_code'):
-            language = func.get('language', 'python')
-            md += f"\n```{language}\n{func['source_code']}\n```\n\n"
-        
-        return md
+    def render_chunks(self, data: Dict[str, Any], xref: Optional[CrossReferenceIndex] = None) -> Iterator[str]:
+        """Render like ``render``, yielding the document in chunks (see ``HTMLTemplate.render_chunks``)."""
+        template, context = self._page(data)
+        return chunked(template.generate(context))
     
-    def _render_class(self, cls: Dict[str, Any]) -> str:
-        """Render a single class in Markdown."""
-        md = f"### 🏗️ `{cls['name']}`\n\n"
-        
-        if cls.get('docstring'):
-            md += f"> {cls['docstring']}\n\n"
-        
-        if cls.get('methods'):
-            md += f"**Methods ({len(cls['methods'])}):** "
-            method_names = [m['name'] for m in cls['methods']]
-            md += ", ".join(method_names)
-            md += "  \n\n"
-        
-        if cls.get('source_code'):
-            language = cls.get('language', 'python')
-            md += f"```{language}\n{cls['source_code']}\n```\n\n"
-        
-        return md
+    def render_to(self, stream: TextIO, data: Dict[str, Any], xref: Optional[CrossReferenceIndex] = None) -> None:
+        """Render like ``render``, writing the document to ``stream`` chunk by chunk."""
+        for chunk in self.render_chunks(data, xref):
+            stream.write(chunk)
+    
+    def _page(self, data: Dict[str, Any]) -> Tuple[Template, Dict[str, Any]]:
+        """The page template and its variables for one file."""
+        context = {"data": data, "generated": datetime.now().strftime('%Y-%m-%d %H:%M')}
+        return template_environment().get_template("page.md"), context
+    
+    def render_symbol(
+        self,
+        kind: str,
+        symbol: Dict[str, Any],
+        file_path: str = "",
+        xref: Optional[CrossReferenceIndex] = None
+    ) -> str:
+        """Render one function or class (arguments as in ``HTMLTemplate.render_symbol``)."""
+        name = "class.md" if kind == "class" else "function.md"
+        return template_environment().get_template(name).render(symbol=symbol)
     
-    def render_project(self, data: Dict[str, Any]) -> str:
+    def render_project(self, data: Dict[str, Any], xref: Optional[CrossReferenceIndex] = None) -> str:
         """Render multiple files as a project."""
         # Simplified project rendering
         md_parts = [self.render(file_data) for file_data in data.get('files', [])]
-        return "\n\n".join(md_parts) 
\ No newline at end of file
+        return "\n\n".join(md_parts)
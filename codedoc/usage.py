@@ -0,0 +1,214 @@
+"""
+AI Usage Accounting Module 📈
+
+Per-call records of prompt and completion tokens, latency, retries, hedges,
+cache hits, errors and deadline fallbacks, aggregated per file and per run, with a latency histogram
+and a JSON export for budgeting and comparing providers and models.
+"""
+
+import json
+import math
+import threading
+from collections import Counter
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# Upper bounds (seconds) of the latency histogram buckets; a last bucket catches the rest
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# USD per 1K prompt and completion tokens; other models are reported without a cost
+MODEL_PRICES: Dict[str, Tuple[float, float]] = {
+    "gpt-3.5-turbo": (0.0005, 0.0015),
+    "gpt-4o-mini": (0.00015, 0.0006),
+    "gpt-4o": (0.0025, 0.01),
+}
+
+
+@dataclass
+class CallRecord:
+    """One request sent to the provider (all of its attempts)."""
+    file: Optional[str]
+    symbols: int
+    prompt_tokens: int
+    completion_tokens: int
+    latency: float
+    elapsed: float
+    attempts: int
+    error: Optional[str] = None
+    estimated: bool = False
+    model: Optional[str] = None
+    hedged: bool = False
+
+
+class UsageTracker:
+    """📈 Collects ``CallRecord``s, cache hits and reuses of one run.
+
+    ``latency`` of a record is the provider time of its last attempt;
+    ``elapsed`` also covers queueing, rate limiting and retry backoff. Token
+    counts come from the response's ``usage`` and are estimated (and flagged
+    ``estimated``) when a provider does not report them. A ``hedged`` call
+    also sent a duplicate request whose tokens are not counted.
+    """
+
+    def __init__(self, model: str = "gpt-3.5-turbo", prices: Optional[Dict[str, Tuple[float, float]]] = None):
+        """Create an empty tracker.
+
+        Args:
+            model: Model of calls that do not name their own, used to price them
+            prices: USD per 1K prompt and completion tokens by model
+                (defaults to ``MODEL_PRICES``)
+        """
+        self.model = model
+        self.prices = MODEL_PRICES if prices is None else prices
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget everything recorded so far (at the beginning of a run)."""
+        with self._lock:
+            self.records: List[CallRecord] = []
+            self.cache_hits: Counter = Counter()
+            self.reuses: Counter = Counter()
+            self.fallbacks: Counter = Counter()
+            self.routes: Dict[Optional[str], Counter] = {}
+
+    def record_call(self, record: CallRecord) -> None:
+        """Account for one request sent to the provider."""
+        with self._lock:
+            self.records.append(record)
+
+    def record_cache_hit(self, file: Optional[str] = None) -> None:
+        """Account for a symbol answered from the response cache."""
+        with self._lock:
+            self.cache_hits[file] += 1
+
+    def record_reuse(self, file: Optional[str] = None) -> None:
+        """Account for a symbol answered with a structurally identical symbol's output."""
+        with self._lock:
+            self.reuses[file] += 1
+
+    def record_fallback(self, file: Optional[str] = None) -> None:
+        """Account for a symbol given offline content because its call missed the deadline."""
+        with self._lock:
+            self.fallbacks[file] += 1
+
+    def record_route(self, file: Optional[str], model: str) -> None:
+        """Account for a symbol routed to ``model`` (or the offline heuristic)."""
+        with self._lock:
+            self.routes.setdefault(file, Counter())[model] += 1
+
+    @property
+    def calls(self) -> int:
+        """Number of requests sent."""
+        return len(self.records)
+
+    def latency_percentile(self, percent: float) -> Optional[float]:
+        """Latency percentile of the answered calls so far (``None`` before the first)."""
+        with self._lock:
+            latencies = sorted(r.latency for r in self.records if r.error is None)
+        return _percentile(latencies, percent) if latencies else None
+
+    def summary(self, file: Optional[str] = None) -> Dict[str, Any]:
+        """Totals of the whole run, or of one file's symbols.
+
+        Returns:
+            Calls, symbols, tokens, cost (``None`` if any model is unpriced),
+            retries, hedges, errors by type, cache hits, reuses, deadline
+            fallbacks, symbols per routed model and latency statistics
+        """
+        with self._lock:
+            records = [r for r in self.records if file is None or r.file == file]
+            cache_hits = sum(self.cache_hits.values()) if file is None else self.cache_hits[file]
+            reuses = sum(self.reuses.values()) if file is None else self.reuses[file]
+            fallbacks = sum(self.fallbacks.values()) if file is None else self.fallbacks[file]
+            routes: Counter = Counter()
+            for route_file, counts in self.routes.items():
+                if file is None or route_file == file:
+                    routes.update(counts)
+
+        prompt_tokens = sum(r.prompt_tokens for r in records)
+        completion_tokens = sum(r.completion_tokens for r in records)
+        symbols = sum(r.symbols for r in records)
+        latencies = sorted(r.latency for r in records if r.error is None)
+        answered = symbols + cache_hits + reuses
+        return {
+            "calls": len(records),
+            "symbols": symbols,
+            "symbols_per_call": round(symbols / len(records), 2) if records else 0.0,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "estimated_calls": sum(1 for r in records if r.estimated),
+            "cost": self._records_cost(records),
+            "retries": sum(max(0, r.attempts - 1) for r in records),
+            "hedges": sum(1 for r in records if r.hedged),
+            "errors": sum(1 for r in records if r.error),
+            "errors_by_type": dict(Counter(r.error for r in records if r.error)),
+            "cache_hits": cache_hits,
+            "cache_hit_rate": round(cache_hits / answered, 4) if answered else 0.0,
+            "reuses": reuses,
+            "fallbacks": fallbacks,
+            "routes": dict(routes),
+            "latency": {
+                "mean": sum(latencies) / len(latencies) if latencies else 0.0,
+                "p50": _percentile(latencies, 50),
+                "p95": _percentile(latencies, 95),
+                "max": latencies[-1] if latencies else 0.0,
+            },
+            "elapsed": sum(r.elapsed for r in records),
+        }
+
+    def cost(self, prompt_tokens: int, completion_tokens: int, model: Optional[str] = None) -> Optional[float]:
+        """USD for the given tokens of ``model`` (the tracker's by default), or ``None`` if it has no known price."""
+        model = model or self.model
+        if model not in self.prices:
+            return None
+        prompt_price, completion_price = self.prices[model]
+        return round(prompt_tokens / 1000 * prompt_price + completion_tokens / 1000 * completion_price, 6)
+
+    def _records_cost(self, records: List[CallRecord]) -> Optional[float]:
+        total = 0.0
+        for record in records:
+            cost = self.cost(record.prompt_tokens, record.completion_tokens, record.model)
+            if cost is None:
+                return None
+            total += cost
+        return round(total, 6)
+
+    def latency_histogram(self) -> List[Dict[str, Any]]:
+        """Answered calls per latency bucket (``le`` is the bucket's upper bound, ``null`` for the last)."""
+        counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        with self._lock:
+            for record in self.records:
+                if record.error is None:
+                    counts[next((i for i, bound in enumerate(LATENCY_BUCKETS) if record.latency <= bound),
+                                len(LATENCY_BUCKETS))] += 1
+        return [{"le": bound, "count": count} for bound, count in zip(list(LATENCY_BUCKETS) + [None], counts)]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Everything recorded: run totals, per-file totals, histogram and individual calls."""
+        with self._lock:
+            files = {r.file for r in self.records} | set(self.cache_hits) | set(self.reuses) | set(self.fallbacks)
+            files |= set(self.routes)
+            files = sorted(files, key=lambda file: file or "")
+            calls = [asdict(record) for record in self.records]
+        return {
+            "model": self.model,
+            "run": self.summary(),
+            "files": {file: self.summary(file) for file in files if file is not None},
+            "latency_histogram": self.latency_histogram(),
+            "calls": calls,
+        }
+
+    def export(self, path: str) -> None:
+        """Write ``to_dict()`` as JSON to ``path``."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    """Nearest-rank percentile of sorted ``values`` (0.0 when empty)."""
+    if not values:
+        return 0.0
+    return values[max(0, math.ceil(percent / 100 * len(values)) - 1)]
@@ -0,0 +1,227 @@
+"""
+Cross-Reference Module 🔗
+
+Builds a project-wide map from names to definitions once, so renderers can
+turn base classes, annotations and imports into links with O(1) lookups.
+"""
+
+import re
+from dataclasses import dataclass
+from pathlib import PurePath
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+from .index import iter_symbols
+
+
+_IDENTIFIER = re.compile(r"[A-Za-z_$][\w$]*(?:\.[A-Za-z_$][\w$]*)*")
+_PY_FROM_IMPORT = re.compile(r"^from\s+(\.*[\w.]*)\s+import\s+\(?(.+?)\)?$")
+_PY_IMPORT = re.compile(r"^import\s+(.+)$")
+_JS_IMPORT = re.compile(r"^import\s+(?:\{(.*)\}\s+from\s+)?['\"](.+)['\"]$")
+
+
+@dataclass
+class Definition:
+    """Where a symbol is documented."""
+    name: str
+    qualname: str
+    kind: str
+    file_path: str
+    anchor: str
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_-]+", "-", text).strip("-")
+
+
+def file_anchor(file_path: str) -> str:
+    """HTML id of a file's documentation header."""
+    return f"file-{_slug(str(file_path))}"
+
+
+def symbol_anchor(file_path: str, qualname: str) -> str:
+    """HTML id of a symbol's documentation block."""
+    return f"sym-{_slug(str(file_path))}--{_slug(qualname)}"
+
+
+def module_names(file_path: str) -> List[str]:
+    """Dotted module names a file can be imported as, longest first.
+
+    ``proj/pkg/shapes.py`` yields ``proj.pkg.shapes``, ``pkg.shapes`` and
+    ``shapes``; package ``__init__`` and JS ``index`` files name their directory.
+    """
+    parts = [part for part in PurePath(str(file_path).replace("\\", "/")).with_suffix("").parts
+             if part not in ("/", ".", "..")]
+    if parts and parts[-1] in ("__init__", "index") and len(parts) > 1:
+        parts = parts[:-1]
+    return [".".join(parts[i:]) for i in range(len(parts))]
+
+
+def _module_key(source: str) -> str:
+    """Normalise an import source (``pkg.mod``, ``./lib/util.js``) to a dotted name."""
+    source = source.lstrip(".")
+    source = re.sub(r"^/+|/+$", "", source)
+    source = re.sub(r"\.(js|ts|jsx|tsx|py)$", "", source)
+    source = re.sub(r"/(index|__init__)$", "", source)
+    return source.replace("/", ".").lstrip("./")
+
+
+def _split_alias(part: str) -> Tuple[str, str]:
+    """``"Square as Sq"`` -> ``("Square", "Sq")``."""
+    name, _, alias = part.strip().partition(" as ")
+    return name.strip(), (alias or name).strip()
+
+
+def parse_import(statement: str) -> Tuple[str, List[Tuple[str, str]]]:
+    """Split a Python or JavaScript import statement.
+
+    Returns ``(module, [(imported_name, bound_name), ...])``; the list is
+    empty for plain ``import module`` statements.
+    """
+    statement = statement.strip().rstrip(";")
+
+    match = _PY_FROM_IMPORT.match(statement)
+    if match:
+        names = [_split_alias(part) for part in match.group(2).split(",")]
+        return _module_key(match.group(1)), [pair for pair in names if pair[0] and pair[0] != "*"]
+
+    match = _JS_IMPORT.match(statement)
+    if match:
+        names = [_split_alias(part) for part in (match.group(1) or "").split(",")]
+        return _module_key(match.group(2)), [pair for pair in names if pair[0]]
+
+    match = _PY_IMPORT.match(statement)
+    if match:
+        return _split_alias(match.group(1).split(",")[0])[0], []
+
+    return "", []
+
+
+class CrossReferenceIndex:
+    """🔗 Name → definition map for a whole project."""
+
+    def __init__(self):
+        self._names: Dict[str, List[Definition]] = {}
+        self._modules: Dict[str, List[str]] = {}
+        self._module_defs: Dict[str, Definition] = {}
+        self._file_symbols: Dict[str, Dict[str, Definition]] = {}
+        self._file_imports: Dict[str, Dict[str, str]] = {}
+        self._cache: Dict[Tuple[str, str], Optional[Definition]] = {}
+
+    @classmethod
+    def build(cls, files: Iterable[Dict[str, Any]]) -> "CrossReferenceIndex":
+        """Index every definition of the given files in a single pass."""
+        xref = cls()
+        for file_data in files:
+            xref.add_file(file_data)
+        return xref
+
+    def add_file(self, file_data: Dict[str, Any]) -> None:
+        """Add one file's definitions and imports."""
+        file_path = str(file_data.get("file_path", ""))
+        symbols = self._file_symbols.setdefault(file_path, {})
+
+        module_def = Definition(
+            name=PurePath(file_path).stem,
+            qualname=PurePath(file_path).stem,
+            kind="module",
+            file_path=file_path,
+            anchor=file_anchor(file_path),
+        )
+        self._module_defs[file_path] = module_def
+        for module in module_names(file_path):
+            self._modules.setdefault(module, []).append(file_path)
+
+        if file_data.get("duplicate_of"):
+            # Copies are rendered as a pointer to the original, which holds the anchors
+            self._file_imports[file_path] = {}
+            return
+
+        for record in iter_symbols(file_data):
+            # Methods are documented inside their class block
+            owner = record.qualname.split(".")[0] if record.kind == "method" else record.qualname
+            definition = Definition(
+                name=record.name,
+                qualname=record.qualname,
+                kind=record.kind,
+                file_path=file_path,
+                anchor=symbol_anchor(file_path, owner),
+            )
+            symbols[record.qualname] = definition
+            # Functions and classes are keyed by name, methods by ``Class.method``
+            self._names.setdefault(record.qualname, []).append(definition)
+
+        imports = {}
+        for statement in file_data.get("imports", []) or []:
+            module, names = parse_import(statement)
+            for name, bound in names:
+                imports[bound] = f"{module}.{name}" if module else name
+            if module and not names:
+                # ``import a.b`` binds ``a``
+                root = module.split(".")[0]
+                imports[root] = root
+        self._file_imports[file_path] = imports
+        self._cache.clear()
+
+    def __len__(self) -> int:
+        return sum(len(symbols) for symbols in self._file_symbols.values())
+
+    def resolve(self, name: str, from_file: Optional[str] = None) -> Optional[Definition]:
+        """Resolve a (possibly dotted) name as seen from ``from_file``.
+
+        Lookups prefer the referencing file, then names it imports, then the
+        first project-wide definition in file order. Results are memoised.
+        """
+        key = (name, from_file or "")
+        if key not in self._cache:
+            self._cache[key] = self._resolve(name, from_file)
+        return self._cache[key]
+
+    def _resolve(self, name: str, from_file: Optional[str]) -> Optional[Definition]:
+        if from_file is not None:
+            local = self._file_symbols.get(from_file, {}).get(name)
+            if local:
+                return local
+
+            imported = self._file_imports.get(from_file, {}).get(name.split(".")[0])
+            if imported and imported != name:
+                rest = name.split(".", 1)[1] if "." in name else ""
+                target = self._resolve_dotted(f"{imported}.{rest}" if rest else imported)
+                if target:
+                    return target
+
+        candidates = self._names.get(name)
+        if candidates:
+            return candidates[0]
+
+        return self._resolve_dotted(name)
+
+    def _resolve_dotted(self, name: str) -> Optional[Definition]:
+        """Resolve ``module.Symbol`` / ``module`` forms by longest module prefix."""
+        parts = name.split(".")
+        for split in range(len(parts), 0, -1):
+            module = ".".join(parts[:split])
+            for file_path in self._modules.get(module, []):
+                rest = ".".join(parts[split:])
+                if not rest:
+                    return self._module_defs[file_path]
+                target = self._file_symbols[file_path].get(rest)
+                if target:
+                    return target
+        return None
+
+    def link_segments(self, text: str, from_file: Optional[str] = None) -> List[Tuple[str, Optional[Definition]]]:
+        """Split an annotation or base expression into text and resolved names.
+
+        ``"Dict[str, Shape]"`` becomes ``[("Dict", None), ("[", None),
+        ("str", None), (", ", None), ("Shape", <Definition>), ("]", None)]``.
+        """
+        segments: List[Tuple[str, Optional[Definition]]] = []
+        position = 0
+        for match in _IDENTIFIER.finditer(text):
+            if match.start() > position:
+                segments.append((text[position:match.start()], None))
+            segments.append((match.group(0), self.resolve(match.group(0), from_file)))
+            position = match.end()
+        if position < len(text):
+            segments.append((text[position:], None))
+        return segments
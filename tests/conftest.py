@@ -0,0 +1,19 @@
+"""
+Shared Test Fixtures 🧪
+
+Every test gets its own client registry, so rate limiters and circuit
+breakers tripped by one test do not leak into the next.
+"""
+
+import pytest
+
+from codedoc import clients
+
+
+@pytest.fixture(autouse=True)
+def client_registry(monkeypatch):
+    """Replace the process-wide client registry for the duration of a test."""
+    registry = clients.ClientRegistry()
+    monkeypatch.setattr(clients, "_registry", registry)
+    yield registry
+    registry.close()
@@ -0,0 +1,185 @@
+"""
+Tests for the AI Example Generator 🤖
+
+Testing concurrent enhancement against a fake async client.
+"""
+
+import asyncio
+import json
+import re
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from codedoc.ai import AIExampleGenerator
+from codedoc.budget import compact_source
+from codedoc.core import DocumentationGenerator
+
+
+class FakeAsyncClient:
+    """Answers every prompt after a short delay and records peak concurrency.
+
+    Batched prompts are answered per symbol number; any prompt containing
+    ``fail_on`` raises, and with ``drop_from_batch`` that symbol is left
+    out of batched answers instead.
+    """
+
+    def __init__(self, fail_on=None, drop_from_batch=None):
+        self.fail_on = fail_on
+        self.drop_from_batch = drop_from_batch
+        self.calls = 0
+        self.in_flight = 0
+        self.peak = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, model, messages, **kwargs):
+        prompt = messages[-1]["content"]
+        self.calls += 1
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if self.fail_on and self.fail_on in prompt:
+                raise RuntimeError("boom")
+            signatures = re.findall(r"Signature: (.*)", prompt)
+            if "### Symbol" not in prompt:
+                content = json.dumps(self._answer(signatures[0]))
+            else:
+                content = json.dumps({str(number): self._answer(signature)
+                                      for number, signature in enumerate(signatures, 1)
+                                      if not (self.drop_from_batch and self.drop_from_batch in signature)})
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+        finally:
+            self.in_flight -= 1
+
+    @staticmethod
+    def _answer(signature):
+        return {"examples": [signature], "explanation": f"About {signature}", "use_cases": [], "methods": "ignored"}
+
+    async def close(self):
+        pass
+
+
+class TestConcurrentEnhancement:
+    """Test the async enhancement path."""
+
+    def setup_method(self):
+        """Setup for each test."""
+        self.generator = AIExampleGenerator(api_key="test-key", concurrency=3, batch_tokens=0)
+        self.client = FakeAsyncClient(fail_on="broken(")
+        self.generator._async_client = self.client
+
+    def teardown_method(self):
+        """Cleanup after each test."""
+        self.generator.close()
+
+    def test_results_keep_request_order_and_respect_limit(self):
+        """Results come back in order and never exceed the concurrency limit."""
+        requests = [("function", {"name": f"f{i}", "params": ["x"], "docstring": None, "source_code": ""})
+                    for i in range(12)]
+        requests.append(("class", {"name": "Shape", "methods": ["area"], "docstring": None, "source_code": ""}))
+
+        results = self.generator.enhance_many(requests)
+
+        assert [r["examples"][0] for r in results[:12]] == [f"f{i}(x)" for i in range(12)]
+        assert results[12]["examples"] == ["Shape (methods: area)"]
+        assert "methods" not in results[12]
+        assert self.client.peak == 3
+
+    def test_failures_are_returned_in_place(self):
+        """A failed request yields its exception without affecting the others."""
+        results = self.generator.enhance_many([
+            ("function", {"name": "ok", "params": [], "docstring": None, "source_code": ""}),
+            ("function", {"name": "broken", "params": [], "docstring": None, "source_code": ""}),
+        ])
+        assert results[0]["explanation"] == "About ok()"
+        assert isinstance(results[1], RuntimeError)
+
+    def test_invalid_concurrency(self):
+        """Concurrency must be positive."""
+        with pytest.raises(ValueError):
+            AIExampleGenerator(api_key="test-key", concurrency=0)
+
+
+class TestBatchedEnhancement:
+    """Test packing small symbols into shared prompts."""
+
+    def setup_method(self):
+        """Setup for each test."""
+        self.generator = AIExampleGenerator(api_key="test-key", batch_tokens=2000)
+
+    def teardown_method(self):
+        """Cleanup after each test."""
+        self.generator.close()
+
+    def _requests(self, count, language="python"):
+        return [("function", {"name": f"f{i}", "params": [], "docstring": None,
+                              "source_code": "return 1", "language": language}) for i in range(count)]
+
+    def test_small_symbols_share_requests(self):
+        """Small helpers are packed, capped at MAX_BATCH_SYMBOLS per request."""
+        client = self.generator._async_client = FakeAsyncClient()
+        results = self.generator.enhance_many(self._requests(25))
+
+        assert [r["examples"][0] for r in results] == [f"f{i}()" for i in range(25)]
+        assert client.calls == 2
+
+    def test_large_symbols_and_other_languages_go_alone(self):
+        """Oversized symbols are sent on their own and batches never mix languages."""
+        client = self.generator._async_client = FakeAsyncClient()
+        requests = self._requests(2) + self._requests(2, language="javascript")
+        requests.append(("function", {"name": "big", "params": [], "docstring": None, "source_code": "x" * 4000}))
+
+        results = self.generator.enhance_many(requests)
+
+        assert results[4]["examples"] == ["big()"]
+        assert client.calls == 3
+
+    def test_failed_batch_falls_back_to_single_requests(self):
+        """A failing batch is retried per symbol; symbols a batch omits are retried too."""
+        client = self.generator._async_client = FakeAsyncClient(drop_from_batch="f1(")
+        results = self.generator.enhance_many(self._requests(3))
+        assert [r["examples"][0] for r in results] == ["f0()", "f1()", "f2()"]
+        assert client.calls == 2
+
+        client = self.generator._async_client = FakeAsyncClient(fail_on="### Symbol")
+        results = self.generator.enhance_many(self._requests(3))
+        assert [r["examples"][0] for r in results] == ["f0()", "f1()", "f2()"]
+        assert client.calls == 4
+
+    def test_source_is_compacted_once_per_symbol(self):
+        """The compacted source sent in the prompt is the one computed for the symbol."""
+        self.generator._async_client = FakeAsyncClient()
+        with patch('codedoc.ai.compact_source', wraps=compact_source) as compact:
+            self.generator.enhance_many(self._requests(3))
+        assert compact.call_count == 3
+
+
+@patch('codedoc.core.JavaScriptParser')
+class TestEnhancedGeneration:
+    """Test that generation merges AI results into the file data."""
+
+    def test_enhanced_file_data_is_merged_in_order(self, mock_js_parser):
+        """Every function and class receives its own result; failures keep the parsed data."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source = Path(temp_dir) / "mod.py"
+            source.write_text("def a(x):\n    pass\n\ndef broken():\n    pass\n\nclass B:\n    def m(self):\n        pass\n")
+
+            with patch.dict('os.environ', {'OPENAI_API_KEY': 'test-key'}):
+                generator = DocumentationGenerator(use_ai=True, search_index=False, ai_concurrency=2,
+                                                   ai_skip=False, ai_cache=False)
+            generator.ai_enhancer._async_client = FakeAsyncClient(fail_on="broken(")
+            try:
+                data = json.loads(generator.generate_documentation(str(source), output_format="json"))
+            finally:
+                generator.ai_enhancer.close()
+
+        functions = {f["name"]: f for f in data["functions"]}
+        assert [f["name"] for f in data["functions"]] == ["a", "broken"]
+        assert functions["a"]["examples"] == ["a(x)"]
+        assert "examples" not in functions["broken"]
+        assert data["classes"][0]["examples"] == ["B (methods: m)"]
+        assert data["classes"][0]["methods"][0]["name"] == "m"
@@ -0,0 +1,132 @@
+"""
+Tests for AI Batch Files 📦
+
+Testing batch request files, the local batch processor, ingestion into the
+AI response cache and rendering from the cache without requests.
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from codedoc.ai import AIExampleGenerator
+from codedoc.batchfile import ingest_batch_results, process_batch_file, read_jsonl, write_jsonl
+from codedoc.cache import AIResponseCache
+from codedoc.core import DocumentationGenerator
+from codedoc.routing import ModelRouter
+
+
+SOURCE = '''
+def area(width, height):
+    """Area of a rectangle."""
+    return width * height
+
+
+class Shape:
+    def grow(self, factor):
+        return factor
+'''
+
+
+@patch('codedoc.core.JavaScriptParser')
+class TestBatchRoundTrip:
+    """Test prepare, process, ingest and render."""
+
+    def setup_method(self):
+        """Setup for each test."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        (self.root / "src").mkdir()
+        (self.root / "src" / "shapes.py").write_text(SOURCE)
+        (self.root / "src" / "copy.py").write_text(SOURCE)
+        self.cache_path = str(self.root / "cache.sqlite3")
+
+    def teardown_method(self):
+        """Cleanup after each test."""
+        self.temp_dir.cleanup()
+
+    def _generator(self, **kwargs):
+        return DocumentationGenerator(use_ai=True, ai_api_key="test-key", ai_skip=False, search_index=False,
+                                      ai_cache_path=self.cache_path, **kwargs)
+
+    def test_render_from_ingested_results(self, mock_js_parser):
+        """Ingested answers are found by a run that may not send any request."""
+        requests_path = str(self.root / "requests.jsonl")
+        results_path = str(self.root / "results.jsonl")
+
+        count = self._generator().prepare_ai_batch(str(self.root / "src"), requests_path)
+        lines = list(read_jsonl(requests_path))
+        assert count == len(lines) == 2  # The copy's symbols share the same keys
+        assert lines[0]["url"] == "/v1/chat/completions" and lines[0]["body"]["messages"][0]["role"] == "system"
+
+        assert process_batch_file(requests_path, results_path) == 2
+        generator = self._generator(ai_max_calls=0)
+        assert generator.ingest_ai_batch(results_path) == {"ingested": 2, "failed": 0}
+
+        content = generator.generate_documentation(str(self.root / "src" / "shapes.py"), output_format="markdown")
+        assert "area(width, height) (stand-in explanation)" in content
+        assert generator.ai_usage.calls == 0 and not generator.ai_skipped
+
+        assert self._generator().prepare_ai_batch(str(self.root / "src"), requests_path) == 0
+
+    def test_ingest_requires_a_cache(self, mock_js_parser):
+        """Without the response cache there is nowhere to put results."""
+        generator = DocumentationGenerator(use_ai=True, ai_api_key="test-key", ai_cache=False)
+        with pytest.raises(ValueError):
+            generator.ingest_ai_batch(str(self.root / "results.jsonl"))
+
+
+class TestBatchRequests:
+    """Test which symbols are written to a batch file."""
+
+    def test_routed_and_structurally_identical_symbols_are_left_out(self):
+        """Symbols a run answers without a request get no batch line."""
+        generator = AIExampleGenerator(api_key="test-key",
+                                       router=ModelRouter({"trivial": "heuristic", "complex": "large"}))
+        trivial = {"cyclomatic": 1, "loc": 2, "params": 1, "nesting": 0}
+        complex_ = {"cyclomatic": 20, "loc": 90, "params": 1, "nesting": 1}
+        request = lambda name, complexity, structure: ("function", {  # noqa: E731
+            "name": name, "params": ["x"], "docstring": None, "source_code": "", "complexity": complexity,
+            "structure_hash": structure,
+        })
+
+        lines = generator.batch_requests([
+            request("getter", trivial, None),
+            request("plan", complex_, "py:same"),
+            request("plan_again", complex_, "py:same"),
+        ])
+
+        assert len(lines) == 1
+        assert lines[0]["body"]["model"] == "large"
+        assert lines[0]["custom_id"] == generator._pending_symbol(0, *request("plan", complex_, "py:same")).key
+
+
+class TestBatchResults:
+    """Test reading and ingesting results files."""
+
+    def test_failed_results_are_counted_not_cached(self):
+        """Errors and non-200 responses are skipped; malformed files raise."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            results_path = os.path.join(temp_dir, "results.jsonl")
+            ok = {"custom_id": "k1", "response": {"status_code": 200, "body": {
+                "choices": [{"message": {"content": "{}"}}]}}, "error": None}
+            write_jsonl([
+                ok,
+                {"custom_id": "k2", "response": None, "error": {"code": "server_error"}},
+                {"custom_id": "k3", "response": {"status_code": 429, "body": {}}, "error": None},
+            ], results_path)
+            cache = AIResponseCache(os.path.join(temp_dir, "cache.sqlite3"))
+            try:
+                assert ingest_batch_results(results_path, cache) == {"ingested": 1, "failed": 2}
+                assert cache.get("k1") == "{}" and cache.get("k2") is None
+            finally:
+                cache.close()
+
+            with open(results_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps([1]) + "\n")
+            with pytest.raises(ValueError):
+                list(read_jsonl(results_path))
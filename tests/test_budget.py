@@ -0,0 +1,147 @@
+"""
+Tests for AI Budgeting 💰
+
+Testing prompt compaction, the skip policy and budget-ordered dispatch.
+"""
+
+import json
+import tempfile
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from codedoc.budget import SkipPolicy, compact_source, estimate_tokens, is_test_file, is_trivial
+from codedoc.core import DocumentationGenerator
+from tests.test_ai import FakeAsyncClient
+
+
+BIG_CLASS = '''class Store:
+    """Key-value store."""
+
+    def get(self, key):
+        """Fetch a value."""
+''' + "".join(f"        value_{i} = self.data.get(key, {i})\n" for i in range(200)) + '''        return value_0
+
+    def put(self, key, value):
+''' + "".join(f"        self.data[key + '{i}'] = value\n" for i in range(200))
+
+
+class TestCompaction:
+    """Test source compaction."""
+
+    def test_source_within_budget_is_unchanged(self):
+        """Small sources are sent as they are."""
+        assert compact_source("def f():\n    return 1", 100) == "def f():\n    return 1"
+
+    def test_python_bodies_are_elided(self):
+        """Over budget, method bodies collapse to docstrings and ``...``."""
+        compacted = compact_source(BIG_CLASS, 200)
+        assert estimate_tokens(compacted) <= 200
+        assert "def get(self, key):" in compacted
+        assert "Fetch a value." in compacted
+        assert "def put(self, key, value):" in compacted
+        assert "value_1 " not in compacted
+
+    def test_other_sources_are_truncated(self):
+        """Sources that cannot be outlined are cut with an elision note."""
+        source = "function f() {\n" + "  x += 1;\n" * 500 + "}"
+        compacted = compact_source(source, 50, language="javascript")
+        assert compacted.startswith("function f() {")
+        assert compacted.endswith("more line(s) elided")
+        assert estimate_tokens(compacted) < 70
+
+
+class TestSkipPolicy:
+    """Test which symbols are not sent to the AI."""
+
+    def setup_method(self):
+        """Setup for each test."""
+        self.policy = SkipPolicy()
+
+    def test_tests_are_skipped(self):
+        """Test files and test functions are recognised."""
+        assert is_test_file("proj/tests/helpers.py")
+        assert is_test_file("src/test_shapes.py")
+        assert is_test_file("web/app.spec.ts")
+        assert not is_test_file("src/contest.py")
+        assert self.policy.reason("function", {"name": "test_area", "source_code": ""}, "src/a.py", "python") == "test"
+
+    def test_rich_docstrings_are_skipped(self):
+        """Docstrings with sections or many words count as documented."""
+        documented = {"name": "area", "docstring": "Compute.\n\nArgs:\n    w: width", "source_code": ""}
+        assert self.policy.reason("function", documented, "src/a.py", "python") == "documented"
+        assert not self.policy.is_rich_docstring("Compute the area.")
+
+    def test_trivial_functions_are_skipped(self):
+        """Getters, setters and empty bodies are trivial; real logic is not."""
+        assert is_trivial("def name(self):\n    return self._name")
+        assert is_trivial("def set_name(self, value):\n    \"\"\"Set.\"\"\"\n    self._name = value")
+        assert is_trivial("def noop():\n    pass")
+        assert is_trivial("getName() {\n  return this.name;\n}", language="javascript")
+        assert not is_trivial("def area(w, h):\n    return w * h")
+        assert not is_trivial("area(w, h) {\n  return w * h;\n}", language="javascript")
+
+    def test_policy_can_be_relaxed(self):
+        """Individual rules can be turned off."""
+        policy = SkipPolicy(skip_trivial=False)
+        assert policy.reason("function", {"name": "noop", "source_code": "def noop():\n    pass"},
+                             "src/a.py", "python") is None
+
+
+@patch('codedoc.core.JavaScriptParser')
+class TestSkippedEnhancement:
+    """Test that skipped symbols never reach the AI and keep their order."""
+
+    def test_only_worthwhile_symbols_are_sent(self, mock_js_parser):
+        """Trivial functions stay in place without an AI request."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source = Path(temp_dir) / "mod.py"
+            source.write_text("def noop():\n    pass\n\ndef area(w, h):\n    return w * h\n\n"
+                              "def name(self):\n    return self._name\n")
+
+            with patch.dict('os.environ', {'OPENAI_API_KEY': 'test-key'}):
+                generator = DocumentationGenerator(use_ai=True, search_index=False, ai_cache=False)
+            generator.ai_enhancer = MagicMock()
+            generator.ai_enhancer.enhance_many.side_effect = lambda requests: [{"examples": ["x"]} for _ in requests]
+
+            data = json.loads(generator.generate_documentation(str(source), output_format="json"))
+
+        (requests,), _ = generator.ai_enhancer.enhance_many.call_args
+        assert [kwargs["name"] for _, kwargs in requests] == ["area"]
+        assert [f["name"] for f in data["functions"]] == ["noop", "area", "name"]
+        assert [("examples" in f) for f in data["functions"]] == [False, True, False]
+        assert generator.ai_skipped == {"trivial": 2}
+
+
+@patch('codedoc.core.JavaScriptParser')
+class TestBudgetedEnhancement:
+    """Test that a call budget spends its requests on the most valuable symbols."""
+
+    def test_priority_order_under_call_limit(self, mock_js_parser):
+        """Public undocumented code goes first; the rest keeps its baseline docs."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source = Path(temp_dir) / "mod.py"
+            source.write_text('def _hidden(x):\n    return x * 2\n\n'
+                              'def documented(x):\n    """Double."""\n    return x * 2\n\n'
+                              'def plain(x):\n    return x * 2\n')
+
+            with patch.dict('os.environ', {'OPENAI_API_KEY': 'test-key'}):
+                generator = DocumentationGenerator(use_ai=True, search_index=False, ai_cache=False,
+                                                   ai_batch_tokens=0, ai_max_calls=2)
+            client = generator.ai_enhancer._async_client = FakeAsyncClient()
+            try:
+                data = json.loads(generator.generate_documentation(str(source), output_format="json",
+                                                                   include_private=True))
+            finally:
+                generator.ai_enhancer.close()
+
+        assert [("examples" in f) for f in data["functions"]] == [False, True, True]
+        assert client.calls == 2
+        assert generator.ai_skipped == {"budget": 1}
+
+    def test_priority_key(self, mock_js_parser):
+        """Exported and larger symbols win among otherwise equal ones."""
+        generator = DocumentationGenerator(use_ai=False)
+        symbols = [{"name": "small", "source_code": "x"}, {"name": "large", "source_code": "x" * 50},
+                   {"name": "shared", "source_code": "x"}, {"name": "_private", "source_code": "x" * 90}]
+        ranked = sorted(symbols, key=lambda symbol: generator._ai_priority(symbol, {"shared"}))
+        assert [symbol["name"] for symbol in ranked] == ["shared", "large", "small", "_private"]
@@ -0,0 +1,130 @@
+"""
+Tests for the AI Response Cache 💾
+
+Testing persistence, expiry, eviction and the cached AI client paths.
+"""
+
+import sqlite3
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from codedoc.ai import AIExampleGenerator
+from codedoc.cache import AIResponseCache, make_key
+from codedoc.core import DocumentationGenerator
+from codedoc.parser import FunctionInfo
+
+from tests.test_ai import FakeAsyncClient
+
+
+class TestAIResponseCache:
+    """Test the cache store."""
+
+    def setup_method(self):
+        """Setup for each test."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = str(Path(self.temp_dir.name) / "cache" / "ai.sqlite3")
+
+    def teardown_method(self):
+        """Cleanup after each test."""
+        self.temp_dir.cleanup()
+
+    def test_roundtrip_persists_and_counts(self):
+        """Stored responses survive reopening and hits/misses are counted."""
+        with AIResponseCache(self.path) as cache:
+            assert cache.get("k") is None
+            cache.put("k", "response")
+            assert cache.get("k") == "response"
+            assert cache.stats() == {"hits": 1, "misses": 1, "evictions": 0, "entries": 1}
+
+        with AIResponseCache(self.path) as cache:
+            assert cache.get("k") == "response"
+
+    def test_expired_entries_are_misses(self):
+        """Entries older than the TTL are dropped."""
+        with patch("codedoc.cache._now", return_value=1000.0):
+            cache = AIResponseCache(self.path, ttl=60)
+            cache.put("k", "response")
+        with patch("codedoc.cache._now", return_value=1061.0):
+            assert cache.get("k") is None
+            assert cache.stats()["entries"] == 0
+        cache.close()
+
+    def test_least_recently_used_entries_are_evicted(self):
+        """The cache never grows past ``max_entries``."""
+        with AIResponseCache(self.path, ttl=None, max_entries=2) as cache:
+            with patch("codedoc.cache._now", side_effect=[1.0, 2.0, 3.0, 4.0]):
+                cache.put("a", "1")
+                cache.put("b", "2")
+                cache.get("a")
+                cache.put("c", "3")
+            assert cache.get("b") is None
+            assert cache.get("a") == "1"
+            assert cache.stats()["evictions"] == 1
+
+    def test_key_ignores_whitespace_but_not_model_or_version(self):
+        """Trailing whitespace and line endings do not change the key."""
+        key = make_key("openai", "gpt", "1", "enhance", "def f():\n    return 1\n")
+        assert make_key("openai", "gpt", "1", "enhance", "def f():  \r\n    return 1") == key
+        assert make_key("openai", "gpt-4", "1", "enhance", "def f():\n    return 1") != key
+        assert make_key("openai", "gpt", "2", "enhance", "def f():\n    return 1") != key
+
+    @patch('codedoc.core.JavaScriptParser')
+    def test_generator_close_closes_the_cache(self, mock_js_parser):
+        """Closing a generator releases its cache connection, e.g. after a web request."""
+        generator = DocumentationGenerator(use_ai=True, ai_api_key="test-key", ai_cache_path=self.path)
+        cache = generator.ai_cache
+
+        generator.close()
+        generator.close()
+
+        assert generator.ai_cache is None
+        with pytest.raises(sqlite3.ProgrammingError):
+            cache.get("k")
+
+
+class TestCachedGeneration:
+    """Test that the AI generator consults the cache."""
+
+    def setup_method(self):
+        """Setup for each test."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache = AIResponseCache(str(Path(self.temp_dir.name) / "ai.sqlite3"))
+
+    def teardown_method(self):
+        """Cleanup after each test."""
+        self.cache.close()
+        self.temp_dir.cleanup()
+
+    def test_sync_examples_are_served_from_cache(self):
+        """An unchanged function is only sent to the API once."""
+        generator = AIExampleGenerator(api_key="test-key", cache=self.cache)
+        generator.client = MagicMock()
+        generator.client.chat.completions.create.return_value = SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content='{"examples": ["f()"]}'))]
+        )
+        function = FunctionInfo(name="f", args=[], docstring=None, source_code="def f(): pass", line_number=1)
+
+        first = generator.generate_function_examples(function)
+        second = generator.generate_function_examples(function)
+
+        assert first == second == {"examples": ["f()"]}
+        assert generator.client.chat.completions.create.call_count == 1
+
+    def test_async_enhancement_is_served_from_cache(self):
+        """Repeated async enhancement of the same symbol costs one call."""
+        client = FakeAsyncClient()
+        generator = AIExampleGenerator(api_key="test-key", cache=self.cache)
+        generator._async_client = client
+        request = ("function", {"name": "f", "params": [], "docstring": None, "source_code": "pass"})
+        try:
+            generator.enhance_many([request])
+            client.create = MagicMock(side_effect=AssertionError("not cached"))
+            client.chat.completions.create = client.create
+            assert generator.enhance_many([request])[0]["examples"] == ["f()"]
+        finally:
+            generator.close()
+        assert self.cache.stats()["hits"] == 1
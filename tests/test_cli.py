@@ -123,8 +123,9 @@ class TestCLI:
         assert result.exit_code == 2  # Click error for missing file
         assert 'does not exist' in result.output.lower()
     
-    def test_generate_command_api_key_warning(self):
-        """Test API key warning when AI is enabled."""
+    @patch('codedoc.cli.DocumentationGenerator')
+    def test_generate_command_api_key_warning(self, mock_generator):
+        """Test API key warning when AI is enabled; examples fall back to offline heuristics."""
         with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
             f.write('def test(): pass')
             temp_file = f.name
@@ -135,11 +136,36 @@ class TestCLI:
                 result = self.runner.invoke(generate, [temp_file])
                 
                 assert '⚠️  No OpenAI API key found!' in result.output
-                assert 'Continuing without AI features' in result.output
+                assert 'Using offline heuristic examples' in result.output
+                assert mock_generator.call_args.kwargs['ai_provider'] == 'heuristic'
             
         finally:
             Path(temp_file).unlink()
     
+    @patch('codedoc.cli.DocumentationGenerator')
+    def test_generate_journals_only_paid_runs(self, mock_generator):
+        """Only runs that send paid AI requests journal by default; the journal is removed on success."""
+        mock_instance = Mock(ai_skipped={}, ai_enhancer=None, ai_budget=None, ai_cache=None)
+        mock_instance.ai_usage.summary.return_value = {'calls': 0, 'fallbacks': 0, 'hedges': 0, 'routes': {}}
+        mock_generator.return_value = mock_instance
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source = Path(temp_dir) / "mod.py"
+            source.write_text('def test(): pass')
+            output = str(Path(temp_dir) / "docs.html")
+            journal = Path(f"{output}.journal")
+            
+            with patch.dict('os.environ', {}, clear=True):
+                self.runner.invoke(generate, [str(source), '--output', output])
+                assert mock_generator.call_args.kwargs['journal_path'] is None
+                self.runner.invoke(generate, [str(source), '--output', output, '--ai-provider', 'heuristic'])
+                assert mock_generator.call_args.kwargs['journal_path'] is None
+                
+                journal.write_text("")
+                result = self.runner.invoke(generate, [str(source), '--output', output, '--api-key', 'test-key'])
+                assert result.exit_code == 0
+                assert mock_generator.call_args.kwargs['journal_path'] == str(journal)
+                assert not journal.exists()
+    
     def test_parse_command_success(self):
         """Test successful parse command."""
         # Create a simple test file
@@ -0,0 +1,70 @@
+"""
+Tests for the AI Client Registry 🔌
+
+Testing that generators share pooled clients and warm connections.
+"""
+
+from unittest.mock import patch
+
+from codedoc.ai import AIExampleGenerator
+from codedoc.clients import ClientRegistry, PoolConfig
+from codedoc.core import DocumentationGenerator
+from codedoc.standin import StandInServer
+
+
+class TestClientRegistry:
+    """Test client sharing."""
+
+    def setup_method(self):
+        """Setup for each test."""
+        self.registry = ClientRegistry()
+
+    def teardown_method(self):
+        """Cleanup after each test."""
+        self.registry.close()
+
+    def test_clients_are_shared_per_settings(self):
+        """Equal settings share a client; different pools or endpoints do not."""
+        client = self.registry.sync_client("key", "http://localhost:1/v1")
+        assert self.registry.sync_client("key", "http://localhost:1/v1", PoolConfig()) is client
+        assert self.registry.sync_client("key", "http://localhost:1/v1", PoolConfig(max_connections=2)) is not client
+        assert self.registry.sync_client("key", "http://localhost:2/v1") is not client
+        assert self.registry.async_client("key") is self.registry.async_client("key")
+
+    def test_limiters_and_breakers_are_shared_per_model_endpoint(self):
+        """Generators for the same provider, endpoint and model share limits and outages."""
+        first = AIExampleGenerator(api_key="a", base_url="http://localhost:1/v1", registry=self.registry,
+                                   rate_limiter=self.registry.rate_limiter("openai", "http://localhost:1/v1",
+                                                                           "gpt-3.5-turbo", 60))
+        second = AIExampleGenerator(api_key="b", base_url="http://localhost:1/v1", registry=self.registry,
+                                    rate_limiter=self.registry.rate_limiter("openai", "http://localhost:1/v1",
+                                                                            "gpt-3.5-turbo", 60))
+        other = AIExampleGenerator(api_key="a", base_url="http://localhost:1/v1", registry=self.registry,
+                                   model="gpt-4o")
+        assert first.rate_limiter is second.rate_limiter
+        assert first.circuit_breaker is second.circuit_breaker
+        assert other.circuit_breaker is not first.circuit_breaker
+        assert self.registry.rate_limiter("openai", "http://localhost:2/v1", "gpt-3.5-turbo", 60) \
+            is not first.rate_limiter
+
+    @patch('codedoc.core.JavaScriptParser')
+    def test_generators_share_the_process_limits(self, mock_js_parser, client_registry):
+        """Documentation generators (e.g. one per web request) use the process-wide limiter and breaker."""
+        first, second = (
+            DocumentationGenerator(ai_api_key="test-key", ai_cache=False, ai_requests_per_minute=60)
+            for _ in range(2)
+        )
+        assert first.ai_enhancer.rate_limiter is second.ai_enhancer.rate_limiter
+        assert first.ai_enhancer.circuit_breaker is second.ai_enhancer.circuit_breaker
+        assert first.ai_enhancer.circuit_breaker is client_registry.circuit_breaker("openai", None, "gpt-3.5-turbo")
+
+    def test_generators_reuse_warm_connections(self):
+        """Requests from separate generators travel over one kept-alive connection."""
+        with StandInServer() as server:
+            for name in ("first", "second", "third"):
+                generator = AIExampleGenerator(api_key="test", base_url=server.base_url, registry=self.registry)
+                result = generator.enhance_function_documentation(name, [], None, "pass")
+                assert result["explanation"] == f"{name}() (stand-in explanation)"
+                generator.close()
+            assert server.stats["requests"] == 3
+            assert server.stats["connections"] == 1
@@ -0,0 +1,182 @@
+"""
+Tests for AI Call Deadlines and Hedging ⏳
+
+Testing that calls past their deadline degrade to offline heuristic content,
+that slow requests are hedged with a duplicate once enough latencies are
+known, and how both are accounted for.
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from codedoc.ai import HEDGE_MIN_SAMPLES, AIExampleGenerator
+from codedoc.parser import FunctionInfo
+from codedoc.ratelimit import CircuitBreaker, DeadlineExceededError, RateLimiter, acall_with_retry
+from codedoc.usage import CallRecord
+from tests.test_ai import FakeAsyncClient
+
+
+class CountingLimiter(RateLimiter):
+    """Unlimited rate limiter that counts the requests it let through."""
+
+    def __init__(self):
+        super().__init__()
+        self.reserved = 0
+
+    def reserve(self, tokens):
+        self.reserved += 1
+        return super().reserve(tokens)
+
+
+class StallingClient(FakeAsyncClient):
+    """Fake client that never answers prompts containing ``stall_on``, nor its first ``stall_requests`` requests."""
+
+    def __init__(self, stall_on=None, stall_requests=0):
+        super().__init__()
+        self.stall_on = stall_on
+        self.stall_requests = stall_requests
+
+    async def create(self, model, messages, **kwargs):
+        if (self.stall_on and self.stall_on in messages[-1]["content"]) or self.calls < self.stall_requests:
+            self.calls += 1
+            await asyncio.sleep(60)
+        return await super().create(model, messages, **kwargs)
+
+
+def _request(name, structure_hash=None):
+    return ("function", {"file_path": "mod.py", "name": name, "params": ["x"], "docstring": None,
+                         "source_code": "", "structure_hash": structure_hash})
+
+
+class TestDeadline:
+    """Test calls that are not answered in time."""
+
+    def setup_method(self):
+        """Setup for each test."""
+        self.generator = AIExampleGenerator(api_key="test-key", batch_tokens=0, deadline=0.2)
+        self.generator._async_client = StallingClient(stall_on="stuck")
+
+    def teardown_method(self):
+        """Cleanup after each test."""
+        self.generator.close()
+
+    def test_stuck_calls_fall_back_to_heuristic_content(self):
+        """A stuck symbol gets offline content while the rest keep their AI answers."""
+        started = time.perf_counter()
+        results = self.generator.enhance_many([_request("ok"), _request("stuck"), _request("stuck_copy", "py:s")])
+
+        assert time.perf_counter() - started < 5
+        assert results[0]["explanation"] == "About ok(x)"
+        assert results[1]["examples"] == ["result = stuck(x)"]
+        assert results[2]["examples"] == ["result = stuck_copy(x)"]
+        usage = self.generator.usage.summary()
+        assert usage["fallbacks"] == 2 and usage["errors_by_type"] == {"DeadlineExceededError": 2}
+
+    def test_followers_of_a_stuck_structure_are_not_reused(self):
+        """Offline content is not registered for structurally identical symbols."""
+        results = self.generator.enhance_many([_request("stuck", "py:same"), _request("other", "py:same")])
+
+        assert results[1]["examples"] == ["result = other(x)"]
+        assert "py:same" not in self.generator._structures
+        assert self.generator.usage.summary()["fallbacks"] == 2
+
+    def test_single_symbol_api_falls_back(self):
+        """``enhance_function_documentation`` degrades the same way."""
+        result = self.generator.enhance_function_documentation("stuck", ["x"], None, "")
+        assert result["examples"] == ["result = stuck(x)"]
+
+    def test_sync_calls_have_a_deadline_and_fall_back(self):
+        """The synchronous API bounds each request by the deadline and degrades to heuristic examples."""
+        timeouts = []
+
+        def create(**kwargs):
+            timeouts.append(kwargs.get("timeout"))
+            time.sleep(kwargs["timeout"])
+            raise TimeoutError("Request timed out")
+
+        self.generator.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+        function = FunctionInfo(name="stuck", args=["x"], docstring=None, source_code="def stuck(x): ...",
+                                line_number=1)
+
+        result = self.generator.generate_function_examples(function)
+
+        assert timeouts == [pytest.approx(0.2, abs=0.05)]
+        assert result["examples"] == ["result = stuck(x)"] and "not answered" in result["error"]
+        assert self.generator.usage.summary()["fallbacks"] == 1
+
+    def test_deadline_counts_as_a_provider_failure(self):
+        """The circuit breaker sees deadline misses, and they are not retried."""
+        breaker = CircuitBreaker(failure_threshold=1)
+        calls = []
+
+        async def call():
+            calls.append(1)
+            raise DeadlineExceededError("late")
+
+        with pytest.raises(DeadlineExceededError):
+            asyncio.run(acall_with_retry(call, 10, breaker=breaker))
+        assert len(calls) == 1 and breaker.state == "open"
+
+    def test_deadline_must_be_positive(self):
+        """A zero deadline is rejected."""
+        with pytest.raises(ValueError):
+            AIExampleGenerator(api_key="test-key", deadline=0)
+
+
+class TestHedging:
+    """Test duplicate requests for slow calls."""
+
+    def setup_method(self):
+        """Setup for each test."""
+        self.generator = AIExampleGenerator(api_key="test-key", batch_tokens=0, hedge=True, deadline=5)
+        self.client = self.generator._async_client = StallingClient(stall_requests=1)
+
+    def teardown_method(self):
+        """Cleanup after each test."""
+        self.generator.close()
+
+    def _observe(self, calls, latency=0.05):
+        for _ in range(calls):
+            self.generator.usage.record_call(CallRecord(file=None, symbols=1, prompt_tokens=1, completion_tokens=1,
+                                                        latency=latency, elapsed=latency, attempts=1))
+
+    def test_slow_request_is_hedged_and_first_answer_wins(self):
+        """Past the p95 latency a duplicate is sent and answers for the stuck request."""
+        self._observe(HEDGE_MIN_SAMPLES)
+        started = time.perf_counter()
+        results = self.generator.enhance_many([_request("slow")])
+
+        assert time.perf_counter() - started < 2
+        assert results[0]["explanation"] == "About slow(x)"
+        assert self.client.calls == 2
+        assert self.generator.usage.summary()["hedges"] == 1
+
+    def test_duplicates_are_rate_limited_and_take_a_concurrency_slot(self):
+        """A hedge waits for the limiter and a free slot; with none free nothing is duplicated."""
+        self._observe(HEDGE_MIN_SAMPLES)
+        self.generator.rate_limiter = limiter = CountingLimiter()
+        self.generator.enhance_many([_request("slow")])
+        assert limiter.reserved == 2 and self.client.calls == 2
+
+        single = AIExampleGenerator(api_key="test-key", batch_tokens=0, hedge=True, deadline=0.3, concurrency=1,
+                                    usage=self.generator.usage)
+        single._async_client = client = StallingClient(stall_requests=1)
+        try:
+            results = single.enhance_many([_request("slow")])
+        finally:
+            single.close()
+        assert results[0]["examples"] == ["result = slow(x)"]
+        assert client.calls == 1
+
+    def test_no_hedging_without_enough_latencies(self):
+        """Until enough calls were answered the p95 is not trusted and nothing is duplicated."""
+        self._observe(HEDGE_MIN_SAMPLES - 1)
+        self.generator.deadline = 0.3
+        results = self.generator.enhance_many([_request("slow")])
+
+        assert results[0]["examples"] == ["result = slow(x)"]
+        assert self.client.calls == 1
+        assert self.generator.usage.summary()["hedges"] == 0
@@ -0,0 +1,79 @@
+"""
+Tests for Duplicate File Detection ♻️
+
+Testing that byte-identical files are processed once and rendered as copies.
+"""
+
+import json
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from codedoc.core import DocumentationGenerator
+from codedoc.search import SearchIndexBuilder
+from codedoc.xref import CrossReferenceIndex
+
+
+SOURCE = 'class Shape:\n    """A shape."""\n\n    def area(self):\n        return 0\n'
+
+
+@patch('codedoc.core.JavaScriptParser')
+class TestDuplicateDetection:
+    """Test dedupe in directory runs."""
+
+    def setup_method(self):
+        """Setup for each test."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.source = Path(self.temp_dir.name) / "proj"
+        (self.source / "vendor").mkdir(parents=True)
+        (self.source / "shapes.py").write_text(SOURCE)
+        (self.source / "vendor" / "shapes.py").write_text(SOURCE)
+        (self.source / "other.py").write_text("def other():\n    pass\n")
+
+    def teardown_method(self):
+        """Cleanup after each test."""
+        self.temp_dir.cleanup()
+
+    def _generate(self, mock_js_parser, output_format="json", **kwargs):
+        generator = DocumentationGenerator(use_ai=False, search_index=False, **kwargs)
+        with patch.object(generator, '_process_file', wraps=generator._process_file) as process:
+            content = generator.generate_documentation(str(self.source), output_format=output_format)
+        return content, process
+
+    def test_identical_files_are_processed_once(self, mock_js_parser):
+        """The copy reuses the original's data and points back at it."""
+        content, process = self._generate(mock_js_parser)
+        assert process.call_count == 2
+
+        files = {Path(f["file_path"]).relative_to(self.source).as_posix(): f for f in json.loads(content)["files"]}
+        assert set(files) == {"other.py", "shapes.py", "vendor/shapes.py"}
+        copy = files["vendor/shapes.py"]
+        assert copy["duplicate_of"] == files["shapes.py"]["file_path"]
+        assert copy["classes"] == files["shapes.py"]["classes"]
+        assert "duplicate_of" not in files["shapes.py"]
+
+    def test_dedupe_can_be_disabled(self, mock_js_parser):
+        """Without dedupe every file is parsed."""
+        content, process = self._generate(mock_js_parser, dedupe=False)
+        assert process.call_count == 3
+        assert not any("duplicate_of" in f for f in json.loads(content)["files"])
+
+    def test_html_renders_copy_as_notice(self, mock_js_parser):
+        """Copies show a link to the original instead of repeating its body."""
+        content, _ = self._generate(mock_js_parser, output_format="html")
+        assert content.count("Identical to") == 1
+        assert content.count("🏗️ Shape") == 1
+
+
+class TestDuplicateIndexing:
+    """Test that copies do not add symbols of their own."""
+
+    def test_copies_are_not_indexed(self):
+        """Cross references and search only see the original's symbols."""
+        original = {"file_path": "a/shapes.py", "functions": [], "imports": [],
+                    "classes": [{"name": "Shape", "methods": [], "docstring": None}]}
+        copy = dict(original, file_path="b/shapes.py", duplicate_of="a/shapes.py")
+
+        xref = CrossReferenceIndex.build([original, copy])
+        assert xref.resolve("Shape", "b/shapes.py").file_path == "a/shapes.py"
+        assert len(SearchIndexBuilder.build([original, copy]).docs) == 1
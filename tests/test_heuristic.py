@@ -0,0 +1,160 @@
+"""
+Tests for the Heuristic Example Generator 🧮
+
+Testing offline examples, parameter tables and return notes synthesized
+from signatures and docstrings, and their use as an AI provider.
+"""
+
+import ast
+import os
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from codedoc.core import DocumentationGenerator
+from codedoc.heuristic import HeuristicExampleGenerator
+from codedoc.js_parser import JavaScriptParser
+
+
+AREA = '''def area(radius: float, precision=2):
+    """Area of a circle.
+
+    Args:
+        radius (float): Circle radius
+        precision: Rounding digits
+
+    Returns:
+        float: The area
+    """
+    return round(3.14159 * radius ** 2, precision)
+'''
+
+RESIZE = '''def resize(path, width):
+    """Resize an image.
+
+    :param path: Image file
+    :type width: int
+    :returns: The new size
+    """
+'''
+
+STACK = '''class Stack:
+    def __init__(self, capacity):
+        self.items = []
+
+    def push(self, item):
+        self.items.append(item)
+
+    def _grow(self):
+        pass
+'''
+
+
+def _docstring(source):
+    return ast.get_docstring(ast.parse(source).body[0])
+
+
+class TestHeuristicExamples:
+    """Test what is synthesized from signatures and docstrings."""
+
+    def setup_method(self):
+        """Setup for each test."""
+        self.generator = HeuristicExampleGenerator()
+
+    def test_google_docstring_and_annotations(self):
+        """Required arguments get typed placeholders; documented fields fill the table."""
+        result = self.generator.enhance_function_documentation(
+            "area", ["radius", "precision=2"], _docstring(AREA), AREA
+        )
+
+        assert result["examples"] == ["result = area(1.0)"]
+        assert result["parameters"] == [
+            {"name": "radius", "type": "float", "default": None, "description": "Circle radius"},
+            {"name": "precision", "type": None, "default": "2", "description": "Rounding digits"},
+        ]
+        assert result["returns"] == {"type": "float", "description": "The area"}
+
+    def test_rest_fields_and_name_placeholders(self):
+        """reST fields are read and untyped arguments fall back to name-based placeholders."""
+        result = self.generator.enhance_function_documentation(
+            "resize", ["path", "width"], _docstring(RESIZE), RESIZE
+        )
+
+        assert result["examples"] == ['result = resize("path/to/file", 1)']
+        assert result["parameters"][0]["description"] == "Image file"
+        assert result["parameters"][1]["type"] == "int"
+        assert result["returns"]["description"] == "The new size"
+
+    def test_javascript_tags_and_written_examples(self):
+        """JSDoc tags are used and examples the author wrote are preferred."""
+        result = self.generator.enhance_function_documentation(
+            "fetchUser", ["id"], None, "", language="javascript", is_async=True,
+            jsdoc_tags={"param": "{number} id - User id", "returns": "{Promise<User>} The user"}
+        )
+        assert result["examples"] == ["const result = await fetchUser(1);"]
+        assert result["parameters"][0]["type"] == "number"
+        assert result["returns"] == {"type": "Promise<User>", "description": "The user"}
+
+        written = self.generator.enhance_function_documentation("f", [], "Examples:\n    >>> f()\n    1", "")
+        assert written["examples"] == [">>> f()\n1"]
+
+    @patch.object(JavaScriptParser, 'ensure_babel_installed')
+    def test_every_jsdoc_param_is_used(self, mock_babel):
+        """Each ``@param`` of a JSDoc comment describes its own parameter."""
+        _, tags = JavaScriptParser()._parse_jsdoc(
+            "/**\n * Move a point.\n * @param {number} x - Horizontal offset\n"
+            " * @param {number} y - Vertical offset\n * @param {string} [unit] Unit name\n */"
+        )
+        assert tags["param"] == ["{number} x - Horizontal offset", "{number} y - Vertical offset",
+                                 "{string} [unit] Unit name"]
+
+        result = self.generator.enhance_function_documentation(
+            "move", ["x", "y", "unit"], None, "", language="javascript", jsdoc_tags=tags
+        )
+        assert [(row["type"], row["description"]) for row in result["parameters"]] == [
+            ("number", "Horizontal offset"), ("number", "Vertical offset"), ("string", "Unit name")
+        ]
+
+    def test_class_example_calls_public_methods(self):
+        """The class is constructed and its public methods are called; unknown values keep their names."""
+        result = self.generator.enhance_class_documentation("Stack", ["__init__", "push", "_grow"], None, STACK)
+        assert result["examples"] == ["stack = Stack(capacity)\nstack.push(item)"]
+
+    def test_enhance_many_keeps_failures_in_place(self):
+        """Malformed requests yield their exception without stopping the others."""
+        results = self.generator.enhance_many([("function", {}), ("function", {"name": "g", "params": []})])
+        assert isinstance(results[0], KeyError)
+        assert results[1]["examples"] == ["result = g()"]
+
+
+@patch('codedoc.core.JavaScriptParser')
+class TestHeuristicProvider:
+    """Test the heuristic generator as the documentation generator's provider."""
+
+    def test_every_symbol_is_enhanced_offline(self, mock_js_parser):
+        """No key or network is needed, no symbol is skipped and the table is rendered."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source = Path(temp_dir) / "shapes.py"
+            source.write_text(AREA + "\n\ndef test_area():\n    assert area(1)\n")
+
+            generator = DocumentationGenerator(use_ai=True, ai_provider="heuristic", search_index=False)
+            content = generator.generate_documentation(str(source), output_format="markdown")
+
+        assert generator.offline and generator.ai_cache is None
+        assert not generator.ai_skipped
+        assert "result = area(1.0)" in content
+        assert "| radius | float |  | Circle radius |" in content
+        assert "**↩️ Returns:** float — The area" in content
+
+    def test_missing_key_falls_back_to_heuristics(self, mock_js_parser):
+        """Without an API key the OpenAI provider degrades to offline examples."""
+        with patch.dict(os.environ, {}, clear=True):
+            generator = DocumentationGenerator(use_ai=True, ai_cache=False)
+        assert isinstance(generator.ai_enhancer, HeuristicExampleGenerator)
+
+    def test_unknown_provider_is_rejected(self, mock_js_parser):
+        """Provider names are validated."""
+        with pytest.raises(ValueError):
+            DocumentationGenerator(use_ai=True, ai_provider="oracle")
@@ -0,0 +1,142 @@
+"""
+Tests for the Symbol Index 🗂️
+
+Testing the persistent SQLite index and its query API.
+"""
+
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from click.testing import CliRunner
+
+from codedoc.cli import query
+from codedoc.core import DocumentationGenerator
+from codedoc.index import SymbolIndex, format_signature
+
+
+SAMPLE_FILE = {
+    "language": "python",
+    "file_path": "pkg/shapes.py",
+    "functions": [
+        {"name": "area", "args": ["w", "h"], "arg_annotations": {"w": "float"},
+         "return_annotation": "float", "docstring": "Compute area.",
+         "source_code": "def area(w, h): ...", "line_number": 3},
+        {"name": "perimeter", "args": ["w", "h"], "docstring": None,
+         "source_code": "def perimeter(w, h): ...", "line_number": 7},
+    ],
+    "classes": [
+        {"name": "Shape", "bases": ["Base"], "docstring": None, "source_code": "class Shape(Base): ...",
+         "line_number": 10, "methods": [
+             {"name": "draw", "args": ["self"], "docstring": "Draw it.",
+              "source_code": "def draw(self): ...", "line_number": 12},
+         ]},
+    ],
+}
+
+
+class TestSymbolIndex:
+    """Test indexing and lookups."""
+
+    def setup_method(self):
+        """Setup for each test."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.index_path = str(Path(self.temp_dir.name) / "symbols.sqlite3")
+        self.index = SymbolIndex(self.index_path)
+        self.index.add_file(SAMPLE_FILE)
+
+    def teardown_method(self):
+        """Cleanup after each test."""
+        self.index.close()
+        self.temp_dir.cleanup()
+
+    def test_lookup_by_name_and_qualname(self):
+        """Symbols are found by plain and qualified name."""
+        assert [r.kind for r in self.index.lookup("area")] == ["function"]
+        method = self.index.lookup("Shape.draw")
+        assert len(method) == 1
+        assert method[0].name == "draw"
+        assert method[0].line_number == 12
+
+    def test_prefix_and_file_queries(self):
+        """Prefix search and per-file listing return matching symbols."""
+        assert [r.name for r in self.index.search_prefix("p")] == ["perimeter"]
+        assert [r.name for r in self.index.symbols_in_file("pkg/shapes.py")] == [
+            "area", "perimeter", "Shape", "draw"
+        ]
+
+    def test_undocumented_and_reindexing(self):
+        """Undocumented symbols are reported and re-indexing replaces a file's rows."""
+        assert [r.qualname for r in self.index.undocumented()] == ["perimeter", "Shape"]
+
+        self.index.add_file(dict(SAMPLE_FILE, functions=[], classes=[]))
+        assert self.index.stats() == {"files": 0, "symbols": 0, "undocumented": 0}
+
+    def test_index_persists_between_sessions(self):
+        """A closed index can be reopened and queried."""
+        self.index.close()
+        with SymbolIndex(self.index_path) as reopened:
+            assert reopened.stats()["symbols"] == 4
+        self.index = SymbolIndex(self.index_path)
+
+    def test_failed_session_rolls_back(self):
+        """An exception inside the context leaves the persisted index untouched."""
+        self.index.close()
+        with pytest.raises(RuntimeError):
+            with SymbolIndex(self.index_path) as index:
+                index.clear()
+                raise RuntimeError("run failed")
+        self.index = SymbolIndex(self.index_path)
+        assert self.index.stats()["symbols"] == 4
+
+    def test_format_signature(self):
+        """Signatures include annotations and return types."""
+        assert format_signature(SAMPLE_FILE["functions"][0]) == "area(w: float, h) -> float"
+        assert format_signature({"name": "load", "params": ["url"], "is_async": True}) == "async load(url)"
+
+
+@patch('codedoc.core.JavaScriptParser')
+class TestIndexedGeneration:
+    """Test that generation runs populate the index."""
+
+    def test_directory_run_writes_queryable_index(self, mock_js_parser):
+        """A directory run indexes every file and the CLI can query it."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source = Path(temp_dir) / "proj"
+            source.mkdir()
+            (source / "a.py").write_text('def alpha():\n    """Alpha."""\n')
+            (source / "b.py").write_text('def beta():\n    pass\n')
+            index_path = str(Path(temp_dir) / "index.sqlite3")
+
+            DocumentationGenerator(use_ai=False, index_path=index_path).generate_documentation(
+                str(source), output_format="json"
+            )
+
+            with SymbolIndex(index_path) as index:
+                assert index.stats() == {"files": 2, "symbols": 2, "undocumented": 1}
+
+            result = CliRunner().invoke(query, [index_path, "--undocumented"])
+            assert result.exit_code == 0
+            assert "beta" in result.output
+
+    def test_failed_rebuild_keeps_previous_index(self, mock_js_parser):
+        """A rebuild that crashes does not wipe the index written by the last run."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source = Path(temp_dir) / "proj"
+            source.mkdir()
+            (source / "a.py").write_text('def alpha():\n    """Alpha."""\n')
+            index_path = str(Path(temp_dir) / "index.sqlite3")
+
+            DocumentationGenerator(use_ai=False, index_path=index_path).generate_documentation(
+                str(source), output_format="json"
+            )
+
+            with patch.object(DocumentationGenerator, "_process_file", side_effect=RuntimeError("boom")):
+                with pytest.raises(RuntimeError):
+                    DocumentationGenerator(use_ai=False, index_path=index_path).generate_documentation(
+                        str(source), output_format="json"
+                    )
+
+            with SymbolIndex(index_path) as index:
+                assert index.stats()["symbols"] == 1
@@ -0,0 +1,167 @@
+"""
+Tests for the Run Journal 📓
+
+Testing the append-only journal of completed symbol enhancements and file
+data, and resuming an interrupted documentation run from it.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from codedoc.core import DocumentationGenerator
+from codedoc.journal import RunJournal, symbol_key
+from tests.test_ai import FakeAsyncClient
+from tests.test_deadline import StallingClient
+
+
+class TestRunJournal:
+    """Test writing and reloading journals."""
+
+    def setup_method(self):
+        """Setup for each test."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "run.journal")
+
+    def teardown_method(self):
+        """Cleanup after each test."""
+        self.temp_dir.cleanup()
+
+    def test_resume_reloads_completed_work(self):
+        """Journaled symbols and files are found again by a resumed run with the same options."""
+        key = symbol_key("function", {"name": "f", "params": []})
+        with RunJournal(self.path, options={"include_private": False}) as journal:
+            journal.record_symbol(key, {"examples": ["f()"]})
+            journal.record_file("a.py", "py:1", {"file_path": "a.py", "functions": []})
+
+        with RunJournal(self.path, resume=True, options={"include_private": False}) as journal:
+            assert journal.symbol(key) == {"examples": ["f()"]}
+            assert journal.file("a.py", "py:1")["file_path"] == "a.py"
+            assert journal.file("a.py", "py:2") is None
+            assert dict(journal.reused) == {"symbols": 1, "files": 1}
+            assert not journal.restarted
+
+        assert key != symbol_key("function", {"name": "f", "params": ["x"]})
+
+    def test_other_options_or_no_resume_start_over(self):
+        """A journal is only resumed by a run with the same options."""
+        with RunJournal(self.path, options={"include_private": False}) as journal:
+            journal.record_symbol("k", {"examples": []})
+
+        with RunJournal(self.path, resume=True, options={"include_private": True}) as journal:
+            assert journal.restarted and journal.symbol("k") is None
+        with RunJournal(self.path, options={"include_private": True}) as journal:
+            assert journal.symbol("k") is None
+
+    def test_file_data_is_read_back_from_disk(self):
+        """Journaled file data is not kept in memory, and only finished files are synced."""
+        data = {"file_path": "a.py", "functions": [{"name": "f"}]}
+        with patch("codedoc.journal.os.fsync") as fsync:
+            with RunJournal(self.path) as journal:
+                for index in range(3):
+                    journal.record_symbol(f"k{index}", {"examples": []})
+                journal.record_file("a.py", "py:1", data)
+                data["functions"].clear()
+
+                assert journal.file("a.py", "py:1")["functions"] == [{"name": "f"}]
+
+        assert fsync.call_count == 3  # Header, the file and closing
+
+    def test_line_cut_off_by_a_crash_is_ignored(self):
+        """A truncated last entry is skipped and later entries still load."""
+        with RunJournal(self.path) as journal:
+            journal.record_symbol("k1", {"examples": ["one"]})
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write('{"type": "symbol", "key": "k2", "res')
+
+        with RunJournal(self.path, resume=True) as journal:
+            assert journal.symbol("k2") is None
+            journal.record_symbol("k3", {"examples": ["three"]})
+        with RunJournal(self.path, resume=True) as journal:
+            assert journal.symbol("k1") and journal.symbol("k3")
+
+
+@patch('codedoc.core.JavaScriptParser')
+class TestResumedRun:
+    """Test resuming a directory run."""
+
+    def setup_method(self):
+        """Setup for each test."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        (self.root / "src").mkdir()
+        (self.root / "src" / "a.py").write_text("def alpha(x):\n    return x\n")
+        (self.root / "src" / "b.py").write_text("def beta(y):\n    return y\n\n\ndef gamma(z):\n    return z\n")
+        self.journal_path = str(self.root / "docs.md.journal")
+
+    def teardown_method(self):
+        """Cleanup after each test."""
+        self.temp_dir.cleanup()
+
+    def _run(self, resume=False):
+        generator = DocumentationGenerator(use_ai=True, ai_provider="heuristic", search_index=False,
+                                           journal_path=self.journal_path, resume=resume)
+        requested = []
+        iter_enhancements = generator.ai_enhancer.iter_enhancements
+
+        def spy(requests):
+            requested.extend(kwargs["name"] for _, kwargs in requests)
+            return iter_enhancements(requests)
+
+        with patch.object(generator.ai_enhancer, "iter_enhancements", side_effect=spy):
+            content = generator.generate_documentation(str(self.root / "src"), output_format="markdown")
+        return content, requested
+
+    def test_resume_skips_unchanged_files_and_symbols(self, mock_js_parser):
+        """Unchanged files are not reprocessed and unchanged symbols of changed files not re-enhanced."""
+        first, requested = self._run()
+        assert sorted(requested) == ["alpha", "beta", "gamma"]
+
+        (self.root / "src" / "b.py").write_text(
+            "def beta(y):\n    return y\n\n\ndef gamma(z, w):\n    return z + w\n"
+        )
+        resumed, requested = self._run(resume=True)
+
+        assert requested == ["gamma"]
+        assert "alpha(x)" in resumed and "gamma(z, w)" in resumed
+
+        _, requested = self._run()
+        assert sorted(requested) == ["alpha", "beta", "gamma"]
+
+    def test_deadline_fallbacks_are_retried_on_resume(self, mock_js_parser):
+        """Symbols that got offline content because their call missed the deadline are not journaled."""
+        prompts = []
+        for client in (StallingClient(stall_on="beta"), FakeAsyncClient()):
+            generator = DocumentationGenerator(use_ai=True, ai_api_key="test-key", ai_cache=False, ai_skip=False,
+                                               ai_batch_tokens=0, ai_deadline=0.2, search_index=False,
+                                               journal_path=self.journal_path, resume=True)
+            generator.ai_enhancer._async_client = client
+            create = client.create
+
+            async def spy(model, messages, **kwargs):
+                prompts.append(messages[-1]["content"])
+                return await create(model, messages, **kwargs)
+
+            client.chat.completions.create = spy
+            try:
+                generator.generate_documentation(str(self.root / "src"), output_format="markdown")
+            finally:
+                generator.close()
+            if isinstance(client, StallingClient):
+                assert generator.ai_usage.summary()["fallbacks"] == 1
+                prompts.clear()
+
+        assert len(prompts) == 1 and "beta" in prompts[0]
+
+    def test_other_ai_settings_start_over(self, mock_js_parser):
+        """Runs that split or compact source differently do not reuse each other's journal."""
+        restarted = []
+        for max_source_tokens in (1500, 1500, 500):
+            generator = DocumentationGenerator(use_ai=True, ai_api_key="test-key", ai_cache=False,
+                                               ai_max_source_tokens=max_source_tokens,
+                                               journal_path=self.journal_path, resume=True)
+            with generator._journaling(include_private=False, language=None):
+                restarted.append(generator.journal.restarted)
+
+        assert restarted == [True, False, True]
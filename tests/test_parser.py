@@ -219,6 +219,24 @@ class Class1: pass
         
         assert "2 functions" in summary
         assert "1 classes" in summary
+    
+    def test_import_extraction(self):
+        """Test that top-level imports are collected."""
+        code = '''
+import os
+from typing import List, Optional
+from .shapes import Square as Sq
+
+def func():
+    import json
+'''
+        result = self.parser.parse_code(code)
+        
+        assert result['imports'] == [
+            'import os',
+            'from typing import List, Optional',
+            'from .shapes import Square as Sq'
+        ]
 
 
 class TestFunctionInfo:
@@ -0,0 +1,206 @@
+"""
+Tests for AI Rate Limiting 🚦
+
+Testing the token buckets, retry policy, circuit breaker and run budget with a fake clock.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from codedoc.ratelimit import (
+    BudgetExhaustedError, CallBudget, CircuitBreaker, CircuitOpenError, RateLimiter, RetryPolicy, TokenBucket,
+    acall_with_retry, call_with_retry, is_retryable, retry_after_seconds
+)
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class ProviderError(Exception):
+    """Stand-in for an API status error."""
+
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(headers=headers or {})
+
+
+class TestTokenBuckets:
+    """Test request and token limits."""
+
+    def setup_method(self):
+        """Setup for each test."""
+        self.clock = FakeClock()
+
+    def test_bucket_allows_burst_then_paces(self):
+        """A full bucket serves a burst, then callers wait for the refill."""
+        bucket = TokenBucket(60, clock=self.clock)
+        assert [bucket.reserve() for _ in range(60)] == [0.0] * 60
+        assert bucket.reserve() == pytest.approx(1.0)
+        self.clock.now = 10.0
+        assert bucket.reserve() == 0.0
+
+    def test_limiter_waits_for_the_tighter_limit(self):
+        """The token limit throttles large requests even when requests are cheap."""
+        limiter = RateLimiter(requests_per_minute=600, tokens_per_minute=6000, clock=self.clock)
+        assert limiter.reserve(6000) == 0.0
+        assert limiter.reserve(3000) == pytest.approx(30.0)
+
+
+class TestRetries:
+    """Test retry classification and backoff."""
+
+    def test_transient_errors_are_retryable(self):
+        """Rate limits and server errors are retried; client errors are not."""
+        assert is_retryable(ProviderError(429))
+        assert is_retryable(ProviderError(503))
+        assert not is_retryable(ProviderError(400))
+        assert not is_retryable(ValueError("bad"))
+
+    def test_retry_after_wins_over_backoff(self):
+        """Retry-After headers are honored, in seconds or milliseconds."""
+        policy = RetryPolicy(base_delay=1.0, max_delay=60.0)
+        assert policy.delay(0, ProviderError(429, {"retry-after": "7"})) == 7.0
+        assert retry_after_seconds(ProviderError(429, {"retry-after-ms": "250"})) == 0.25
+        assert 0 <= policy.delay(3) <= 8.0
+
+    def test_call_is_retried_until_success(self):
+        """Transient failures are retried with backoff; the result is returned."""
+        outcomes = [ProviderError(429, {"retry-after": "2"}), ProviderError(500), "ok"]
+        sleeps = []
+
+        def call():
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        assert call_with_retry(call, 10, policy=RetryPolicy(max_attempts=3), sleep=sleeps.append) == "ok"
+        assert sleeps[0] == 2.0
+        assert len(sleeps) == 2
+
+    def test_client_errors_are_not_retried(self):
+        """A non-retryable error is raised on the first attempt."""
+        calls = []
+
+        def call():
+            calls.append(1)
+            raise ProviderError(400)
+
+        with pytest.raises(ProviderError):
+            call_with_retry(call, 10, policy=RetryPolicy(max_attempts=5), sleep=lambda _: None)
+        assert len(calls) == 1
+
+
+class TestCircuitBreaker:
+    """Test failing fast while the provider is down."""
+
+    def test_breaker_opens_and_recovers(self):
+        """Consecutive failures open the circuit; a successful trial closes it."""
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30, clock=clock)
+        breaker.record_failure()
+        breaker.record_failure()
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+
+        clock.now = 31
+        breaker.before_call()
+        assert breaker.state == "half-open"
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()  # Only one trial at a time
+        breaker.record_success()
+        assert breaker.state == "closed"
+
+    def _half_open(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30, clock=clock)
+        breaker.record_failure()
+        clock.now = 31
+        return breaker
+
+    def test_trial_refused_by_the_budget_is_released(self):
+        """A half-open trial the budget refuses does not keep the circuit stuck."""
+        breaker = self._half_open()
+
+        def refused():
+            raise BudgetExhaustedError("AI budget exhausted")
+
+        with pytest.raises(BudgetExhaustedError):
+            call_with_retry(refused, 10, breaker=breaker)
+
+        assert call_with_retry(lambda: "ok", 10, breaker=breaker) == "ok"
+        assert breaker.state == "closed"
+
+    def test_cancelled_trial_is_released(self):
+        """A cancelled half-open trial lets the next call be the trial."""
+        breaker = self._half_open()
+
+        async def stalled():
+            await asyncio.sleep(60)
+
+        async def answered():
+            return "ok"
+
+        async def run():
+            task = asyncio.ensure_future(acall_with_retry(stalled, 10, breaker=breaker))
+            await asyncio.sleep(0)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            return await acall_with_retry(answered, 10, breaker=breaker)
+
+        assert asyncio.run(run()) == "ok"
+        assert breaker.state == "closed"
+
+    def test_open_circuit_skips_the_call(self):
+        """No request is made while the circuit is open."""
+        breaker = CircuitBreaker(failure_threshold=1, clock=FakeClock())
+        breaker.record_failure()
+        with pytest.raises(CircuitOpenError):
+            call_with_retry(lambda: pytest.fail("called"), 10, breaker=breaker)
+
+
+class TestCallBudget:
+    """Test the per-run wall time and call limits."""
+
+    def test_calls_and_deadline_are_enforced(self):
+        """Charges stop at the call limit or the deadline; ``start`` resets both."""
+        clock = FakeClock()
+        budget = CallBudget(time_budget=10, max_calls=2, clock=clock)
+        budget.charge()
+        budget.charge()
+        with pytest.raises(BudgetExhaustedError):
+            budget.charge()
+
+        budget.start()
+        clock.now = 4
+        assert budget.remaining() == 6
+        budget.charge()
+        clock.now = 10
+        assert budget.exhausted
+        with pytest.raises(BudgetExhaustedError):
+            budget.charge()
+
+    def test_exhausted_budget_is_neither_retried_nor_a_provider_failure(self):
+        """Refused calls end the retry loop and leave the circuit breaker alone."""
+        budget = CallBudget(max_calls=0)
+        breaker = CircuitBreaker(failure_threshold=1, clock=FakeClock())
+
+        def call():
+            budget.charge()
+            pytest.fail("called")
+
+        with pytest.raises(BudgetExhaustedError):
+            call_with_retry(call, 10, policy=RetryPolicy(max_attempts=3), breaker=breaker,
+                            sleep=lambda seconds: pytest.fail("slept"))
+        assert breaker.state == "closed"
@@ -0,0 +1,152 @@
+"""
+Tests for Complexity-Based Model Routing 🧭
+
+Testing per-symbol complexity metrics, complexity tiers, route specs and
+the AI generator sending each symbol to the model of its tier.
+"""
+
+import pytest
+
+from codedoc.ai import AIExampleGenerator
+from codedoc.complexity import js_complexity
+from codedoc.parser import CodeParser
+from codedoc.routing import ModelRouter, complexity_tier, parse_route_spec
+from tests.test_ai import FakeAsyncClient
+
+
+SOURCE = '''
+def tiny(x):
+    return x
+
+
+def branchy(a, b=1, *rest, **options):
+    if a and b:
+        for item in rest:
+            try:
+                pass
+            except ValueError:
+                pass
+    return [value for value in rest if value]
+
+
+class Account:
+    def __init__(self, owner, balance=0):
+        self.owner = owner
+
+    def label(self):
+        return "rich" if self.owner else "poor"
+'''
+
+TRIVIAL = {"cyclomatic": 1, "loc": 2, "params": 1, "nesting": 0}
+SIMPLE = {"cyclomatic": 3, "loc": 12, "params": 2, "nesting": 1}
+COMPLEX = {"cyclomatic": 14, "loc": 80, "params": 3, "nesting": 2}
+
+
+class ModelRecordingClient(FakeAsyncClient):
+    """Fake client that remembers the model of every request."""
+
+    def __init__(self):
+        super().__init__()
+        self.models = []
+
+    async def create(self, model, messages, **kwargs):
+        self.models.append(model)
+        return await super().create(model, messages, **kwargs)
+
+
+class TestComplexityMetrics:
+    """Test the metrics computed while parsing."""
+
+    def test_python_symbols(self):
+        """Branches, lines, parameters (without self) and nesting are counted."""
+        result = CodeParser().parse_code(SOURCE)
+        functions = {function.name: function.complexity for function in result["functions"]}
+
+        assert (functions["tiny"].cyclomatic, functions["tiny"].loc, functions["tiny"].nesting) == (1, 2, 0)
+        branchy = functions["branchy"]
+        assert (branchy.cyclomatic, branchy.params, branchy.nesting) == (7, 4, 3)
+
+        account = result["classes"][0]
+        assert (account.complexity.cyclomatic, account.complexity.params) == (2, 2)
+        assert account.methods[0].complexity.params == 2
+
+    def test_javascript_nodes(self):
+        """Babel decisions, logical operators and nested blocks are counted."""
+        condition = {"type": "LogicalExpression", "operator": "&&", "left": {}, "right": {}}
+        inner = {"type": "ForOfStatement", "body": {"type": "BlockStatement", "body": []}}
+        node = {
+            "type": "FunctionDeclaration",
+            "params": [{"type": "Identifier", "name": "a"}, {"type": "Identifier", "name": "b"}],
+            "loc": {"start": {"line": 3}, "end": {"line": 9}},
+            "body": {"type": "BlockStatement", "body": [
+                {"type": "IfStatement", "test": condition, "consequent": inner, "alternate": None},
+            ]},
+        }
+        metrics = js_complexity(node)
+        assert (metrics.cyclomatic, metrics.loc, metrics.params, metrics.nesting) == (4, 7, 2, 2)
+
+
+class TestRoutingPolicy:
+    """Test tiers and route specs."""
+
+    def test_tiers(self):
+        """Symbols within every trivial limit are trivial; any complex threshold makes them complex."""
+        assert complexity_tier(TRIVIAL) == "trivial"
+        assert complexity_tier(SIMPLE) == "simple"
+        assert complexity_tier(COMPLEX) == "complex"
+        assert complexity_tier(dict(TRIVIAL, params=6)) == "complex"
+
+    def test_specs(self):
+        """Specs map tiers to models; unrouted tiers and unknown metrics use the default model."""
+        assert parse_route_spec("auto")["trivial"] == "heuristic"
+        router = ModelRouter.from_spec("simple=small, complex=large")
+        assert (router.route(SIMPLE), router.route(COMPLEX)) == ("small", "large")
+        assert router.route(TRIVIAL) is None and router.route(None) is None
+
+        for spec in ("huge=gpt-4o", "simple", "simple=", ""):
+            with pytest.raises(ValueError):
+                parse_route_spec(spec)
+
+
+class TestRoutedEnhancement:
+    """Test that each symbol goes to its tier's model."""
+
+    def setup_method(self):
+        """Setup for each test."""
+        self.generator = AIExampleGenerator(
+            api_key="test-key", batch_tokens=2000, model="default-model",
+            router=ModelRouter.from_spec("trivial=heuristic,simple=small,complex=large")
+        )
+        self.client = self.generator._async_client = ModelRecordingClient()
+
+    def teardown_method(self):
+        """Cleanup after each test."""
+        self.generator.close()
+
+    def _request(self, name, complexity):
+        return ("function", {"name": name, "params": ["x"], "docstring": None, "source_code": "",
+                             "complexity": complexity, "file_path": "mod.py"})
+
+    def test_models_follow_complexity(self):
+        """Trivial symbols are answered offline; batches never mix models."""
+        results = self.generator.enhance_many([
+            self._request("getter", TRIVIAL),
+            self._request("parse", SIMPLE),
+            self._request("plan", COMPLEX),
+            self._request("render", SIMPLE),
+            self._request("legacy", None),
+        ])
+
+        assert results[0]["examples"] == ["result = getter(x)"]
+        assert results[1]["explanation"] == "About parse(x)"
+        assert sorted(self.client.models) == ["default-model", "large", "small"]
+        assert self.generator.usage.summary()["routes"] == {
+            "heuristic": 1, "small": 2, "large": 1, "default-model": 1
+        }
+        assert {record.model for record in self.generator.usage.records} == {"default-model", "large", "small"}
+
+    def test_cache_keys_depend_on_the_model(self):
+        """A cached answer from one model is not reused for another."""
+        simple = self.generator._pending_symbol(0, "function", self._request("f", SIMPLE)[1])
+        complex_ = self.generator._pending_symbol(0, "function", self._request("f", COMPLEX)[1])
+        assert simple.prompt == complex_.prompt and simple.key != complex_.key
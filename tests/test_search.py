@@ -0,0 +1,102 @@
+"""
+Tests for the Search Index 🔎
+
+Testing tokenization and the sharded client-side index.
+"""
+
+import json
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from codedoc.core import DocumentationGenerator
+from codedoc.search import SearchIndexBuilder, tokenize, NAME_WEIGHT, DOCSTRING_WEIGHT
+
+
+SAMPLE_FILE = {
+    "file_path": "pkg/users.py",
+    "functions": [
+        {"name": "getUserName", "args": ["user_id"], "docstring": "Look up the display name.",
+         "source_code": "", "line_number": 1},
+        {"name": "delete_user", "args": ["user_id"], "docstring": None, "source_code": "", "line_number": 5},
+    ],
+    "classes": [],
+}
+
+
+def _load_shard(path: Path):
+    """Strip the register() wrapper from a written shard."""
+    text = path.read_text(encoding='utf-8')
+    return json.loads(text[text.index(",", text.index(",") + 1) + 1:text.rindex(")")])
+
+
+class TestTokenize:
+    """Test search term extraction."""
+
+    def test_splits_camel_and_snake_case(self):
+        """Identifiers yield their parts plus the whole camelCase word."""
+        assert tokenize("getUserName") == ["getusername", "get", "user", "name"]
+        assert tokenize("delete_user") == ["delete", "user"]
+
+    def test_drops_stop_words_and_short_terms(self):
+        """Stop words and one-letter terms are not indexed."""
+        assert tokenize("Look up the display name of a user") == ["look", "up", "display", "name", "user"]
+
+
+class TestSearchIndexBuilder:
+    """Test building and writing the index."""
+
+    def test_postings_pack_doc_id_and_weight(self):
+        """Name terms outrank docstring terms for the same document."""
+        builder = SearchIndexBuilder.build([SAMPLE_FILE])
+
+        assert builder.postings["getusername"] == [0 * 4 + NAME_WEIGHT]
+        assert builder.postings["user"] == [0 * 4 + NAME_WEIGHT, 1 * 4 + NAME_WEIGHT]
+        assert builder.postings["display"] == [0 * 4 + DOCSTRING_WEIGHT]
+        assert builder.docs[1][0] == "delete_user"
+
+    def test_write_shards_by_prefix(self):
+        """Terms are split into two-letter shards and docs into chunks."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            SearchIndexBuilder.build([SAMPLE_FILE]).write(temp_dir)
+            target = Path(temp_dir)
+
+            assert set(_load_shard(target / "terms-us.js")) == {"user"}
+            assert "getusername" in _load_shard(target / "terms-ge.js")
+            assert _load_shard(target / "docs-0.js")[0][3].startswith("#sym-pkg-users-py--")
+
+    def test_rewrite_removes_only_stale_shards(self):
+        """Shards of an earlier index are deleted; other scripts in the directory are kept."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            target = Path(temp_dir)
+            (target / "terms-zz.js").write_text("stale")
+            (target / "app.js").write_text("keep")
+
+            SearchIndexBuilder.build([SAMPLE_FILE]).write(temp_dir)
+
+            assert not (target / "terms-zz.js").exists()
+            assert (target / "app.js").read_text() == "keep"
+
+
+@patch('codedoc.core.JavaScriptParser')
+class TestSearchOutput:
+    """Test that HTML generation ships the index."""
+
+    def test_html_output_references_written_index(self, mock_js_parser):
+        """The search box points at the index directory beside the page."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source = Path(temp_dir) / "mod.py"
+            source.write_text('def lookup():\n    """Find things."""\n')
+            output = Path(temp_dir) / "docs.html"
+
+            html = DocumentationGenerator(use_ai=False).generate_documentation(
+                str(source), output_path=str(output)
+            )
+
+            assert 'data-index="docs-search"' in html
+            assert (Path(temp_dir) / "docs-search" / "terms-lo.js").exists()
+
+            html = DocumentationGenerator(use_ai=False, search_index=False).generate_documentation(
+                str(source), output_path=str(output)
+            )
+            assert 'codedoc-search' not in html
@@ -0,0 +1,116 @@
+"""
+Tests for Sharding 🧩
+
+Testing shard assignment and merging of partial results.
+"""
+
+import json
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from codedoc.core import DocumentationGenerator
+from codedoc.shard import (
+    parse_shard_spec, assign_shards, select_shard, build_partial, merge_partials
+)
+
+
+class TestShardAssignment:
+    """Test shard specs and file partitioning."""
+
+    def test_parse_shard_spec(self):
+        """Test parsing valid and invalid shard specs."""
+        assert parse_shard_spec("1/4") == (1, 4)
+        assert parse_shard_spec("4/4") == (4, 4)
+
+        for spec in ["0/4", "5/4", "1/0", "abc", "1-4"]:
+            with pytest.raises(ValueError):
+                parse_shard_spec(spec)
+
+    def test_assignment_is_complete_and_balanced(self):
+        """Every file lands in exactly one shard and sizes stay balanced."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            files = []
+            for i in range(20):
+                file_path = root / f"module_{i}.py"
+                file_path.write_text("x = 1\n" * (i + 1))
+                files.append(file_path)
+
+            shards = assign_shards(files, root, 3)
+            assigned = [f for shard in shards for f in shard]
+            assert sorted(assigned) == sorted(files)
+
+            loads = [sum(f.stat().st_size for f in shard) for shard in shards]
+            assert max(loads) - min(loads) <= max(f.stat().st_size for f in files)
+
+    def test_assignment_is_independent_of_root_location(self):
+        """Two checkouts in different directories agree on the partition."""
+        with tempfile.TemporaryDirectory() as first, tempfile.TemporaryDirectory() as second:
+            selections = []
+            for temp_dir in (first, second):
+                root = Path(temp_dir)
+                files = []
+                for name in ["a.py", "b.py", "c.py", "d.py"]:
+                    (root / name).write_text("pass\n")
+                    files.append(root / name)
+                selections.append([f.name for f in select_shard(files, root, 1, 2)])
+
+            assert selections[0] == selections[1]
+
+
+class TestMergePartials:
+    """Test merging partial shard results."""
+
+    def test_merge_orders_files_by_path(self):
+        """Merged files come back in path order regardless of shard order."""
+        first = build_partial("proj", [{"file_path": "proj/b.py"}], 1, 2)
+        second = build_partial("proj", [{"file_path": "proj/a.py"}], 2, 2)
+
+        project_name, files = merge_partials([first, second])
+
+        assert project_name == "proj"
+        assert [f["file_path"] for f in files] == ["proj/a.py", "proj/b.py"]
+
+    def test_merge_rejects_missing_and_duplicate_shards(self):
+        """Incomplete or repeated shard sets are refused."""
+        first = build_partial("proj", [], 1, 3)
+        second = build_partial("proj", [], 2, 3)
+
+        with pytest.raises(ValueError, match="Missing shard"):
+            merge_partials([first, second])
+        with pytest.raises(ValueError, match="more than once"):
+            merge_partials([first, first, second])
+
+
+@patch('codedoc.core.JavaScriptParser')
+class TestShardedGeneration:
+    """Test sharded generation end to end."""
+
+    def test_sharded_run_matches_single_run(self, mock_js_parser):
+        """Merging every shard gives the same data as one unsharded run."""
+        generator = DocumentationGenerator(use_ai=False)
+
+        with tempfile.TemporaryDirectory() as temp_dir, tempfile.TemporaryDirectory() as out_dir:
+            source = Path(temp_dir) / "proj"
+            (source / "pkg").mkdir(parents=True)
+            for i in range(5):
+                (source / "pkg" / f"mod{i}.py").write_text(
+                    f'def func{i}():\n    """Function {i}."""\n    return {i}\n'
+                )
+
+            shard_paths = []
+            for index in (1, 2):
+                shard_path = str(Path(out_dir) / f"shard{index}.json")
+                generator.generate_documentation(
+                    str(source), output_path=shard_path, shard=(index, 2)
+                )
+                shard_paths.append(shard_path)
+
+            merged = json.loads(generator.merge_shards(shard_paths, output_format="json"))
+            single = json.loads(generator.generate_documentation(str(source), output_format="json"))
+
+            assert merged == single
+            assert merged["total_files"] == 5
@@ -0,0 +1,133 @@
+"""
+Tests for the Static Site 🌐
+
+Testing multi-page project output: one page per module, pagination of huge
+modules, shared assets, the navigation index and links across pages.
+"""
+
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from codedoc.core import DocumentationGenerator
+from codedoc.site import StaticSiteWriter, page_names, paginate
+
+
+def _module(file_path, functions=0, classes=0, **extra):
+    data = {
+        "file_path": file_path,
+        "language": "python",
+        "functions": [{"name": f"f{i}", "params": ["x"]} for i in range(functions)],
+        "classes": [{"name": f"C{i}", "methods": []} for i in range(classes)],
+        "total_functions": functions,
+        "total_classes": classes,
+    }
+    data.update(extra)
+    return data
+
+
+class TestPagination:
+    """Test splitting huge modules into pages."""
+
+    def test_symbols_are_split_functions_first(self):
+        """Pages hold at most ``per_page`` symbols; imports stay on the first page."""
+        pages = paginate(_module("m.py", functions=5, classes=3, imports=["import os"]), per_page=3)
+
+        assert [[s["name"] for s in page["functions"] + page["classes"]] for page in pages] == [
+            ["f0", "f1", "f2"], ["f3", "f4", "C0"], ["C1", "C2"]
+        ]
+        assert pages[0]["imports"] == ["import os"] and pages[1]["imports"] == []
+        assert pages[2]["total_functions"] == 5
+
+    def test_small_modules_and_page_names(self):
+        """Small modules keep a single page; later pages are numbered."""
+        data = _module("m.py", functions=2)
+        assert paginate(data, per_page=3) == [data]
+        assert page_names("pkg/m.py", 2) == ["file-pkg-m-py.html", "file-pkg-m-py.2.html"]
+
+
+class TestStaticSiteWriter:
+    """Test the written site."""
+
+    def setup_method(self):
+        """Setup for each test."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.site = Path(self.temp_dir.name) / "site"
+
+    def teardown_method(self):
+        """Cleanup after each test."""
+        self.temp_dir.cleanup()
+
+    def test_pages_share_assets_and_link_across_pages(self):
+        """Each module gets its own pages, linked to the shared assets and to each other."""
+        shapes = _module("pkg/shapes.py", functions=4, classes=1)
+        user = _module("pkg/use.py", functions=1, imports=["from pkg.shapes import C0"])
+        user["functions"] = [{"name": "draw", "args": ["s"], "arg_annotations": {"s": "C0"}}]
+        files = [shapes, user]
+
+        index = StaticSiteWriter(symbols_per_page=2).write(
+            str(self.site), {"project_name": "demo", "total_files": 2, "languages": ["python"]}, lambda: files
+        )
+
+        assert index == str(self.site / "index.html")
+        assert sorted(path.name for path in self.site.glob("file-*.html")) == [
+            "file-pkg-shapes-py.2.html", "file-pkg-shapes-py.3.html", "file-pkg-shapes-py.html", "file-pkg-use-py.html"
+        ]
+        page = (self.site / "file-pkg-use-py.html").read_text(encoding="utf-8")
+        assert '<link rel="stylesheet" href="assets/codedoc.css">' in page and "<style>" not in page
+        assert '<script src="assets/search.js"></script>' in page
+        assert 'href="file-pkg-shapes-py.3.html#sym-pkg-shapes-py--C0"' in page
+        assert (self.site / "assets" / "codedoc.css").exists()
+        assert "file-pkg-shapes-py.3.html#sym-pkg-shapes-py--C0" in (self.site / "search" / "docs-0.js").read_text()
+
+        listing = (self.site / "index.html").read_text(encoding="utf-8")
+        assert 'href="file-pkg-shapes-py.html"' in listing and "3 pages" in listing
+        second = (self.site / "file-pkg-shapes-py.2.html").read_text(encoding="utf-8")
+        assert '<strong>2</strong>' in second and 'href="file-pkg-shapes-py.3.html">Next page' in second
+
+    def test_rerun_removes_only_its_own_stale_pages(self):
+        """Pages a module no longer needs are removed; other files in the directory are kept."""
+        info = {"project_name": "demo"}
+        big = [_module("pkg/big.py", functions=5)]
+        StaticSiteWriter(symbols_per_page=2).write(str(self.site), info, lambda: big)
+        (self.site / "file-notes.html").write_text("mine", encoding="utf-8")
+
+        StaticSiteWriter(symbols_per_page=5).write(str(self.site), info, lambda: big)
+
+        assert sorted(path.name for path in self.site.glob("file-*.html")) == [
+            "file-notes.html", "file-pkg-big-py.html"
+        ]
+
+    def test_per_page_must_be_positive(self):
+        """A page must hold at least one symbol."""
+        with pytest.raises(ValueError):
+            StaticSiteWriter(symbols_per_page=0)
+
+
+@patch('codedoc.core.JavaScriptParser')
+class TestSiteOutput:
+    """Test the ``site`` output format of directory runs."""
+
+    def test_spilled_and_in_memory_runs_write_the_same_site(self, mock_js_parser):
+        """Spilled runs stream the site from their store."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source = Path(temp_dir) / "src"
+            source.mkdir()
+            (source / "a.py").write_text("def alpha(x):\n    return x\n")
+            (source / "b.py").write_text("class Beta:\n    pass\n")
+
+            pages = {}
+            for spill in (False, True):
+                site = Path(temp_dir) / f"site-{spill}"
+                result = DocumentationGenerator(use_ai=False, spill=spill).generate_documentation(
+                    str(source), output_format="site", output_path=str(site)
+                )
+                assert result == str(site / "index.html")
+                pages[spill] = sorted(path.name for path in site.glob("*.html"))
+
+            assert pages[False] == pages[True] and len(pages[False]) == 3
+
+            with pytest.raises(ValueError):
+                DocumentationGenerator(use_ai=False).generate_documentation(str(source), output_format="site")
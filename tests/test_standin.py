@@ -0,0 +1,86 @@
+"""
+Tests for the AI Stand-in Server 🧪
+
+Testing the offline chat-completions endpoint through the real OpenAI client.
+"""
+
+import json
+import random
+
+import pytest
+
+from codedoc.ai import AIExampleGenerator
+from codedoc.parser import FunctionInfo
+from codedoc.ratelimit import RetryPolicy
+from codedoc.standin import StandInConfig, StandInServer, canned_response, parse_latency
+
+
+def _requests(count):
+    return [("function", {"name": f"f{i}", "params": ["x"], "docstring": None, "source_code": "return x * 2"})
+            for i in range(count)]
+
+
+class TestStandInServer:
+    """Test the stand-in against AIExampleGenerator."""
+
+    def test_enhancement_runs_offline(self):
+        """Single and batched prompts get deterministic per-symbol answers."""
+        with StandInServer() as server:
+            generator = AIExampleGenerator(api_key="test", base_url=server.base_url, concurrency=4)
+            try:
+                batched = generator.enhance_many(_requests(5))
+                generator.batch_tokens = 0
+                single = generator.enhance_many(_requests(5))
+            finally:
+                generator.close()
+
+        assert batched == single
+        assert batched[3]["explanation"] == "f3(x) (stand-in explanation)"
+        assert server.stats["requests"] == 6
+
+    def test_sync_api_uses_base_url(self):
+        """The synchronous client is pointed at the stand-in too."""
+        with StandInServer() as server:
+            generator = AIExampleGenerator(api_key="test", base_url=server.base_url)
+            function = FunctionInfo(name="double", args=["x"], docstring=None, source_code="def double(x): ...",
+                                    line_number=1)
+            result = generator.generate_function_examples(function)
+        assert result["examples"] == ["# Example usage of double\ndouble()"]
+        assert "error" not in result
+
+    def test_injected_rate_limits_are_retried(self):
+        """429s carry Retry-After and are retried until they succeed."""
+        config = StandInConfig(rate_limit_rate=0.5, retry_after=0, seed=3)
+        with StandInServer(config) as server:
+            generator = AIExampleGenerator(api_key="test", base_url=server.base_url, batch_tokens=0,
+                                           retry_policy=RetryPolicy(max_attempts=20, base_delay=0))
+            try:
+                results = generator.enhance_many(_requests(6))
+            finally:
+                generator.close()
+
+        assert all(isinstance(result, dict) for result in results)
+        assert server.stats["rate_limited"] > 0
+        assert server.stats["requests"] == 6 + server.stats["rate_limited"]
+
+
+class TestStandInHelpers:
+    """Test latency parsing and canned responses."""
+
+    def test_latency_specs(self):
+        """Latency specs are in milliseconds and sampled as seconds."""
+        rng = random.Random(0)
+        assert parse_latency("250")(rng) == 0.25
+        assert 0.05 <= parse_latency("uniform:50:150")(rng) <= 0.15
+        assert parse_latency("exp:0")(rng) == 0.0
+        with pytest.raises(ValueError):
+            parse_latency("uniform:50")
+        with pytest.raises(ValueError):
+            StandInConfig(error_rate=2)
+
+    def test_canned_batch_answer(self):
+        """Batched prompts are answered per symbol number."""
+        prompt = "### Symbol 1 (function)\nSignature: a()\n### Symbol 2 (class)\nSignature: B (methods: none)\n"
+        answer = json.loads(canned_response(prompt))
+        assert set(answer) == {"1", "2"}
+        assert answer["2"]["use_cases"] == ["Using B"]
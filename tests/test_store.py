@@ -0,0 +1,83 @@
+"""
+Tests for the Symbol Store 💾
+
+Testing disk spilling of per-file documentation data.
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from codedoc.core import DocumentationGenerator
+from codedoc.store import SymbolStore
+
+
+class TestSymbolStore:
+    """Test the SQLite spill store."""
+
+    def test_round_trip_in_insertion_order(self):
+        """Files come back in the order they were added, across batches."""
+        with SymbolStore(batch_size=3, commit_every=2) as store:
+            for i in range(10):
+                store.add_file({"file_path": f"f{i}.py", "language": "python" if i % 2 else "javascript"})
+
+            assert store.count() == 10
+            assert store.languages() == ["javascript", "python"]
+            assert [f["file_path"] for f in store.iter_files()] == [f"f{i}.py" for i in range(10)]
+
+    def test_temporary_store_is_removed_on_close(self):
+        """A store without an explicit path cleans up after itself."""
+        store = SymbolStore()
+        path = store.path
+        store.add_file({"file_path": "a.py"})
+        assert os.path.exists(path)
+
+        store.close()
+        assert not os.path.exists(path)
+
+
+@patch('codedoc.core.JavaScriptParser')
+class TestSpilledGeneration:
+    """Test that spilled runs produce the same output as in-memory runs."""
+
+    def _make_project(self, root: Path) -> Path:
+        source = root / "proj"
+        source.mkdir()
+        for i in range(4):
+            (source / f"mod{i}.py").write_text(
+                f'class Thing{i}:\n    """Thing {i}."""\n\n    def run(self, x):\n        return x\n'
+            )
+        return source
+
+    def test_json_output_matches_in_memory_run(self, mock_js_parser):
+        """Streaming JSON from the store gives byte-identical output."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source = self._make_project(Path(temp_dir))
+            output = str(Path(temp_dir) / "spilled.json")
+
+            in_memory = DocumentationGenerator(use_ai=False).generate_documentation(
+                str(source), output_format="json"
+            )
+            result = DocumentationGenerator(use_ai=False, spill=True).generate_documentation(
+                str(source), output_format="json", output_path=output
+            )
+
+            assert result == output
+            assert Path(output).read_text(encoding='utf-8') == in_memory
+            assert json.loads(in_memory)["total_files"] == 4
+
+    def test_spilled_shard_partial_matches(self, mock_js_parser):
+        """Shard partials are streamed from the store too."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source = self._make_project(Path(temp_dir))
+
+            in_memory = DocumentationGenerator(use_ai=False).generate_documentation(
+                str(source), shard=(1, 2)
+            )
+            spilled = DocumentationGenerator(use_ai=False, spill=True).generate_documentation(
+                str(source), shard=(1, 2)
+            )
+
+            assert spilled == in_memory
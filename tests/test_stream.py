@@ -0,0 +1,110 @@
+"""
+Tests for Progressive Documentation 🌊
+
+Testing streamed completions, enhancements in completion order and
+documentation that is rendered first and patched as AI results arrive.
+"""
+
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from codedoc.ai import AIExampleGenerator
+from codedoc.core import DocumentationGenerator
+from codedoc.standin import StandInServer
+from codedoc.templates import HTMLTemplate, MarkdownTemplate
+from codedoc.xref import symbol_anchor
+from tests.test_ai import FakeAsyncClient
+
+
+def _requests(*names):
+    return [("function", {"name": name, "params": [], "docstring": None, "source_code": ""}) for name in names]
+
+
+class TestIterEnhancements:
+    """Test results yielded as they finish."""
+
+    def setup_method(self):
+        """Setup for each test."""
+        self.generator = AIExampleGenerator(api_key="test-key", batch_tokens=0)
+        self.generator._async_client = FakeAsyncClient(fail_on="broken(")
+
+    def teardown_method(self):
+        """Cleanup after each test."""
+        self.generator.close()
+
+    def test_every_position_is_yielded_once(self):
+        """Each request yields exactly one result; failures yield their exception."""
+        results = dict(self.generator.iter_enhancements(_requests("a", "broken", "c")))
+
+        assert sorted(results) == [0, 1, 2]
+        assert results[0]["examples"] == ["a()"]
+        assert isinstance(results[1], RuntimeError)
+        assert list(self.generator.iter_enhancements([])) == []
+
+    def test_streamed_completions_match_plain_ones(self):
+        """Streamed chunks are joined into the same answers."""
+        with StandInServer() as server:
+            plain = AIExampleGenerator(api_key="test", base_url=server.base_url, batch_tokens=0)
+            streamed = AIExampleGenerator(api_key="test", base_url=server.base_url, batch_tokens=0, stream=True)
+            try:
+                assert streamed.enhance_many(_requests("f", "g")) == plain.enhance_many(_requests("f", "g"))
+            finally:
+                plain.close()
+                streamed.close()
+
+
+@patch('codedoc.core.JavaScriptParser')
+class TestGenerationStream:
+    """Test base documentation first, AI sections patched in afterwards."""
+
+    def test_events_patch_symbols_in_place(self, mock_js_parser):
+        """The base page has no AI sections; each symbol event replaces its anchor."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source = Path(temp_dir) / "mod.py"
+            source.write_text("def area(w, h):\n    return w * h\n\nclass Shape:\n    def grow(self, k):\n        return k\n")
+
+            with patch.dict('os.environ', {'OPENAI_API_KEY': 'test-key'}):
+                generator = DocumentationGenerator(use_ai=True, search_index=False, ai_cache=False)
+            generator.ai_enhancer._async_client = FakeAsyncClient()
+            try:
+                events = list(generator.generate_documentation_stream(str(source)))
+            finally:
+                generator.ai_enhancer.close()
+
+        kinds = [event for event, _ in events]
+        assert kinds[0] == "base" and kinds[-1] == "done"
+        assert sorted(payload["name"] for event, payload in events if event == "symbol") == ["Shape", "area"]
+        assert "✨" not in events[0][1]["content"]
+
+        symbol = next(payload for event, payload in events if event == "symbol" and payload["name"] == "area")
+        assert symbol["anchor"] == symbol_anchor(str(source), "area")
+        assert f'id="{symbol["anchor"]}"' in symbol["content"]
+        assert "✨ About area(w, h)" in symbol["content"]
+        assert "✨ About area(w, h)" in events[-1][1]["content"]
+
+    def test_directories_are_rejected(self, mock_js_parser):
+        """Only single files can be streamed."""
+        generator = DocumentationGenerator(use_ai=False)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with pytest.raises(ValueError):
+                list(generator.generate_documentation_stream(temp_dir))
+
+
+class TestAISections:
+    """Test rendering of AI fields."""
+
+    def test_ai_output_is_escaped_and_normalised(self):
+        """Model output is escaped in HTML and single values are treated as lists."""
+        func = {"name": "f", "args": [], "explanation": "Uses <b>", "examples": "f()", "use_cases": ["Tests"]}
+
+        html = HTMLTemplate().render_symbol("function", func, "mod.py")
+        assert "✨ Uses &lt;b&gt;" in html
+        assert '<div class="code">f()</div>' in html
+        assert "<li>Tests</li>" in html
+
+        markdown = MarkdownTemplate().render_symbol("function", func)
+        assert "```python\nf()\n```" in markdown
+        assert "- Tests" in markdown
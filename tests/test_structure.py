@@ -0,0 +1,122 @@
+"""
+Tests for Structural Hashing 🧬
+
+Testing name-insensitive symbol hashes and reuse of AI output between
+structurally identical symbols.
+"""
+
+from codedoc.ai import AIExampleGenerator, substitute_names
+from codedoc.parser import CodeParser
+from codedoc.structure import js_structure_hash
+from tests.test_ai import FakeAsyncClient
+
+
+HANDLERS = '''
+def get_user(db, user_id):
+    """Fetch a user."""
+    row = db.users.find_one({"id": user_id})
+    if row is None:
+        raise KeyError(user_id)
+    return dict(row, kind="user")
+
+
+def get_order(store, order_id):
+    # Orders live in their own collection
+    row = store.orders.find_one({"id": order_id})
+    if row is None:
+        raise KeyError(order_id)
+    return dict(row, kind="order")
+
+
+def get_invoice(db, invoice_id):
+    row = db.invoices.find_one({"id": invoice_id})
+    if row is not None:
+        raise KeyError(invoice_id)
+    return dict(row, kind="invoice")
+
+
+def tiny(x):
+    return x
+'''
+
+
+def _js_function(name, operator, value):
+    identifier = lambda n: {"type": "Identifier", "name": n, "loc": {"start": {"line": 1}}}
+    statement = {"type": "ReturnStatement", "argument": {
+        "type": "BinaryExpression", "operator": operator,
+        "left": identifier("a"), "right": {"type": "NumericLiteral", "value": value, "extra": {"raw": str(value)}},
+    }}
+    return {"type": "FunctionDeclaration", "id": identifier(name), "async": False, "params": [identifier("a")],
+            "body": {"type": "BlockStatement", "body": [statement] * 6},
+            "leadingComments": [{"type": "CommentBlock", "value": f"* {name} "}]}
+
+
+class TestStructureHash:
+    """Test which differences the hash ignores."""
+
+    def setup_method(self):
+        """Setup for each test."""
+        functions = CodeParser().parse_code(HANDLERS)["functions"]
+        self.hashes = {function.name: function.structure_hash for function in functions}
+
+    def test_names_literals_comments_and_docstrings_are_ignored(self):
+        """Handlers that differ only in naming share a hash; different logic does not."""
+        assert self.hashes["get_user"] == self.hashes["get_order"]
+        assert self.hashes["get_user"].startswith("py:")
+        assert self.hashes["get_invoice"] != self.hashes["get_user"]
+
+    def test_small_symbols_are_not_hashed(self):
+        """Tiny functions are too generic to share output."""
+        assert self.hashes["tiny"] is None
+
+    def test_javascript_nodes(self):
+        """Names, literal values, positions and comments are dropped; operators are kept."""
+        assert js_structure_hash(_js_function("add", "+", 1)) == js_structure_hash(_js_function("plus", "+", 2))
+        assert js_structure_hash(_js_function("add", "+", 1)) != js_structure_hash(_js_function("sub", "-", 1))
+
+
+class TestStructureReuse:
+    """Test that structurally identical symbols share one AI request."""
+
+    def setup_method(self):
+        """Setup for each test."""
+        self.generator = AIExampleGenerator(api_key="test-key", batch_tokens=0)
+        self.client = self.generator._async_client = FakeAsyncClient(fail_on="broken(")
+
+    def teardown_method(self):
+        """Cleanup after each test."""
+        self.generator.close()
+
+    def _request(self, name, params, structure_hash="py:crud"):
+        return ("function", {"name": name, "params": params, "docstring": None, "source_code": "",
+                             "structure_hash": structure_hash})
+
+    def test_output_is_reused_with_names_substituted(self):
+        """One request answers the group, renamed per symbol, also in later calls."""
+        results = self.generator.enhance_many([
+            self._request("get_user", ["db", "user_id"]),
+            self._request("get_order", ["store", "order_id=None"]),
+        ])
+        later = self.generator.enhance_many([self._request("get_item", ["db", "item_id"])])
+
+        assert results[0]["examples"] == ["get_user(db, user_id)"]
+        assert results[1]["examples"] == ["get_order(store, order_id)"]
+        assert later[0]["explanation"] == "About get_item(db, item_id)"
+        assert self.client.calls == 1
+        assert self.generator.structure_reuses == 2
+
+    def test_failures_are_shared_and_reuse_can_be_disabled(self):
+        """Followers of a failed request fail with it; without reuse each symbol is sent."""
+        results = self.generator.enhance_many([self._request("broken", []), self._request("other", [])])
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+        self.generator.reuse_structures = False
+        self.generator.enhance_many([self._request("first", []), self._request("second", [])])
+        assert self.client.calls == 3
+
+    def test_substitution_matches_whole_words(self):
+        """Only whole identifiers are renamed, inside nested values too."""
+        value = {"examples": ["get_user(user_id)", "get_username()"], "explanation": "get_user works"}
+        assert substitute_names(value, {"get_user": "get_order", "user_id": "order_id"}) == {
+            "examples": ["get_order(order_id)", "get_username()"], "explanation": "get_order works"
+        }
@@ -0,0 +1,159 @@
+"""
+Tests for the Document Templates 🎨
+
+Testing the compiled Jinja2 templates: auto-escaping of HTML output, plain
+Markdown output, the shared template environment and rendering in chunks.
+"""
+
+import io
+import os
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from codedoc.core import DocumentationGenerator
+from codedoc.templates import HTMLTemplate, MarkdownTemplate, chunked, inline_includes, template_environment
+
+
+def _file_data():
+    return {
+        "file_path": "pkg/mod.py",
+        "language": "python",
+        "functions": [{
+            "name": "render",
+            "args": ["node"],
+            "docstring": "Returns <b>bold</b> & \"quoted\" text.",
+            "source_code": "def render(node):\n    return f'<b>{node}</b>'\n",
+            "examples": ["render('<i>')"],
+        }],
+        "classes": [],
+        "total_functions": 1,
+        "total_classes": 0,
+    }
+
+
+class TestTemplates:
+    """Test rendering through the Jinja2 templates."""
+
+    def test_html_escapes_symbol_text(self):
+        """Docstrings, source code and examples cannot inject markup into the page."""
+        html = HTMLTemplate().render(_file_data())
+
+        assert "<b>bold</b>" not in html and "&lt;b&gt;bold&lt;/b&gt; &amp;" in html
+        assert "return f&#39;&lt;b&gt;{node}&lt;/b&gt;&#39;" in html
+        assert "render(&#39;&lt;i&gt;&#39;)" in html
+        assert "<style>" in html and "</html>" in html
+
+    def test_every_symbol_field_is_escaped(self):
+        """Names, signatures, imports, bases, methods and AI output are all escaped."""
+        evil = "<script>x</script>"
+        data = dict(_file_data(), imports=[f"import {evil}"], functions=[{
+            "name": evil, "args": [evil], "arg_annotations": {evil: evil}, "return_type": evil,
+            "explanation": evil, "use_cases": [evil],
+            "parameters": [{"name": evil, "type": evil, "default": evil, "description": evil}],
+            "returns": {"type": evil, "description": evil},
+        }], classes=[{"name": "C", "bases": [evil], "methods": [{"name": evil}]}])
+
+        html = HTMLTemplate().render(data)
+        fragment = HTMLTemplate().render_symbol("function", data["functions"][0], data["file_path"])
+
+        assert "<script>" not in html
+        assert "<script>" not in fragment and "&lt;script&gt;x&lt;/script&gt;" in fragment
+
+    def test_markdown_is_not_escaped(self):
+        """Markdown keeps symbol text as written."""
+        md = MarkdownTemplate().render(_file_data())
+
+        assert "> Returns <b>bold</b> & \"quoted\" text." in md
+        assert "### ⚡ `render()`" in md
+
+    def test_symbol_fragment_matches_page(self):
+        """``render_symbol`` produces the same markup as the symbol on its page."""
+        data = _file_data()
+        fragment = HTMLTemplate().render_symbol("function", data["functions"][0], data["file_path"])
+
+        assert fragment.startswith('        <div class="function" id=')
+        assert fragment in HTMLTemplate().render(data)
+
+    def test_project_is_one_document(self):
+        """All files of a project share one page and stylesheet; the search box appears once."""
+        other = dict(_file_data(), file_path="pkg/other.py")
+        html = HTMLTemplate().render_project({"project_name": "demo", "files": [_file_data(), other]},
+                                             search_url="search")
+
+        assert html.count("<!DOCTYPE html>") == html.count("<style>") == html.count("</html>") == 1
+        assert html.count("<main>") == 1 and html.count('<section class="module">') == 2
+        assert html.count('id="codedoc-search"') == 1
+        assert 'id="file-pkg-mod-py"' in html and 'id="file-pkg-other-py"' in html
+
+    def test_environment_is_compiled_once(self):
+        """Every renderer shares one environment, whose includes are inlined at load time."""
+        assert template_environment() is template_environment()
+        sources = inline_includes({"outer": 'a\n{% include "inner" %}\nc', "inner": "b\n"})
+        assert sources["outer"] == "a\nb\nc"
+        assert os.path.basename(template_environment().bytecode_cache.directory) == "templates"
+
+
+class TestChunkedRendering:
+    """Test rendering documents chunk by chunk."""
+
+    def test_render_to_writes_the_rendered_document(self):
+        """``render_to`` produces exactly what ``render`` returns, for both formats."""
+        data = _file_data()
+        for template in (HTMLTemplate(), MarkdownTemplate()):
+            stream = io.StringIO()
+            template.render_to(stream, data)
+            assert stream.getvalue() == template.render(data)
+
+    def test_chunks_are_bounded(self):
+        """Small pieces are gathered into chunks of about the requested size."""
+        chunks = list(chunked(("x" * 10 for _ in range(25)), size=100))
+
+        assert [len(chunk) for chunk in chunks] == [100, 100, 50]
+
+    @patch('codedoc.core.JavaScriptParser')
+    def test_spilled_file_run_streams_to_the_output(self, mock_js_parser):
+        """A spilled single-file run writes the page without returning it."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source = Path(temp_dir) / "mod.py"
+            source.write_text('def lookup(key):\n    """Find <things>."""\n')
+            output = str(Path(temp_dir) / "docs.html")
+
+            result = DocumentationGenerator(use_ai=False, spill=True, search_index=False).generate_documentation(
+                str(source), output_path=output
+            )
+
+            assert result == output
+            assert "Find &lt;things&gt;." in Path(output).read_text(encoding="utf-8")
+
+    @patch('codedoc.core.JavaScriptParser')
+    def test_generate_documentation_chunks(self, mock_js_parser):
+        """A file's documentation can be taken chunk by chunk, e.g. to stream an HTTP response."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source = Path(temp_dir) / "mod.py"
+            source.write_text('def lookup(key):\n    """Find <things>."""\n')
+            generator = DocumentationGenerator(use_ai=False)
+
+            chunks = generator.generate_documentation_chunks(str(source), output_format="json")
+
+            assert "".join(chunks) == generator.generate_documentation(str(source), output_format="json")
+
+    @patch('codedoc.core.JavaScriptParser')
+    def test_spilled_project_is_one_document(self, mock_js_parser):
+        """Spilled and in-memory directory runs write the same single HTML document."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source = Path(temp_dir) / "src"
+            source.mkdir()
+            (source / "a.py").write_text("def alpha(x):\n    return x\n")
+            (source / "b.py").write_text("class Beta:\n    pass\n")
+
+            documents = []
+            for spill in (False, True):
+                output = str(Path(temp_dir) / f"docs-{spill}.html")
+                DocumentationGenerator(use_ai=False, spill=spill, search_index=False).generate_documentation(
+                    str(source), output_path=output
+                )
+                documents.append(Path(output).read_text(encoding="utf-8"))
+
+            assert documents[0].count("<!DOCTYPE html>") == 1 and documents[0].count("<section") == 2
+            assert [len(document.splitlines()) for document in documents] == [len(documents[0].splitlines())] * 2
@@ -0,0 +1,122 @@
+"""
+Tests for AI Usage Accounting 📈
+
+Testing per-call records of tokens, latency, retries, cache hits and
+errors, their per-file and per-run aggregation and the JSON export.
+"""
+
+import json
+import os
+import tempfile
+
+import pytest
+
+from codedoc.ai import AIExampleGenerator
+from codedoc.cache import AIResponseCache
+from codedoc.ratelimit import RetryPolicy
+from codedoc.standin import StandInConfig, StandInServer
+from codedoc.usage import CallRecord, UsageTracker
+from tests.test_ai import FakeAsyncClient
+
+
+def _requests(*names, file_path="mod.py"):
+    return [("function", {"file_path": file_path, "name": name, "params": [], "docstring": None, "source_code": ""})
+            for name in names]
+
+
+def _record(file="a.py", latency=0.2, error=None, attempts=1, symbols=1):
+    return CallRecord(file=file, symbols=symbols, prompt_tokens=1000, completion_tokens=500, latency=latency,
+                      elapsed=latency, attempts=attempts, error=error)
+
+
+class TestUsageTracker:
+    """Test aggregation of call records."""
+
+    def setup_method(self):
+        """Setup for each test."""
+        self.tracker = UsageTracker("gpt-3.5-turbo")
+        for record in (_record(latency=0.05), _record(latency=0.3, attempts=3, symbols=4),
+                       _record(file="b.py", latency=2.0), _record(file="b.py", error="RateLimitError")):
+            self.tracker.record_call(record)
+        self.tracker.record_cache_hit("a.py")
+        self.tracker.record_reuse("b.py")
+
+    def test_run_and_file_totals(self):
+        """Tokens, cost, retries, errors and hits are summed per run and per file."""
+        run = self.tracker.summary()
+        assert run["calls"] == 4 and run["symbols"] == 7
+        assert run["prompt_tokens"] == 4000 and run["completion_tokens"] == 2000
+        assert run["cost"] == pytest.approx(4 * (0.0005 + 0.00075))
+        assert run["retries"] == 2
+        assert run["errors_by_type"] == {"RateLimitError": 1}
+        assert run["cache_hit_rate"] == pytest.approx(1 / 9, abs=1e-4)
+
+        per_file = self.tracker.summary("a.py")
+        assert per_file["calls"] == 2 and per_file["cache_hits"] == 1 and per_file["reuses"] == 0
+        assert per_file["symbols_per_call"] == 2.5
+
+    def test_latency_statistics_ignore_failed_calls(self):
+        """Percentiles and the histogram only count answered calls."""
+        latency = self.tracker.summary()["latency"]
+        assert (latency["p50"], latency["p95"], latency["max"]) == (0.3, 2.0, 2.0)
+
+        histogram = {bucket["le"]: bucket["count"] for bucket in self.tracker.latency_histogram()}
+        assert histogram[0.1] == 1 and histogram[0.5] == 1 and histogram[2.5] == 1
+        assert sum(histogram.values()) == 3 and None in histogram
+
+    def test_export_and_unknown_models(self):
+        """The export holds run, per-file and per-call data; unpriced models have no cost."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "usage.json")
+            self.tracker.export(path)
+            with open(path, encoding="utf-8") as f:
+                exported = json.load(f)
+
+        assert exported["run"]["calls"] == 4
+        assert sorted(exported["files"]) == ["a.py", "b.py"]
+        assert len(exported["calls"]) == 4 and len(exported["latency_histogram"]) == 10
+        assert UsageTracker("local-model").cost(1000, 1000) is None
+
+        self.tracker.reset()
+        assert self.tracker.calls == 0 and self.tracker.summary()["cache_hits"] == 0
+
+
+class TestGeneratorUsage:
+    """Test what the AI generator records."""
+
+    def test_fake_client_calls_are_estimated_and_cache_hits_counted(self):
+        """Responses without ``usage`` get estimated tokens; cached symbols cost no call."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = AIResponseCache(os.path.join(temp_dir, "cache.sqlite3"))
+            generator = AIExampleGenerator(api_key="test-key", batch_tokens=0, cache=cache)
+            generator._async_client = FakeAsyncClient(fail_on="broken(")
+            try:
+                generator.enhance_many(_requests("a", "broken"))
+                generator.enhance_many(_requests("a", file_path="other.py"))
+            finally:
+                generator.close()
+                cache.close()
+
+        usage = generator.usage.summary()
+        assert usage["calls"] == 2 and usage["estimated_calls"] == 2
+        assert usage["errors_by_type"] == {"RuntimeError": 1}
+        assert generator.usage.summary("mod.py")["calls"] == 2
+        assert generator.usage.summary("other.py")["cache_hits"] == 1
+
+    @pytest.mark.parametrize("stream", [False, True])
+    def test_reported_usage_and_retries(self, stream):
+        """Provider-reported tokens are used, streamed or not, and retried attempts are counted."""
+        config = StandInConfig(rate_limit_rate=0.5, retry_after=0, seed=3)
+        with StandInServer(config) as server:
+            generator = AIExampleGenerator(api_key="test", base_url=server.base_url, batch_tokens=0, stream=stream,
+                                           retry_policy=RetryPolicy(max_attempts=20, base_delay=0))
+            try:
+                generator.enhance_many(_requests("f", "g", "h", "i"))
+            finally:
+                generator.close()
+
+        usage = generator.usage.summary()
+        assert usage["calls"] == 4 and usage["estimated_calls"] == 0
+        assert usage["completion_tokens"] > 0
+        assert usage["retries"] == server.stats["rate_limited"] > 0
+        assert all(record.elapsed >= record.latency for record in generator.usage.records)
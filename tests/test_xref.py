@@ -0,0 +1,93 @@
+"""
+Tests for Cross-References 🔗
+
+Testing name resolution and linking across a project.
+"""
+
+from codedoc.templates import HTMLTemplate
+from codedoc.xref import CrossReferenceIndex, parse_import, symbol_anchor
+
+
+SHAPES = {
+    "language": "python",
+    "file_path": "proj/pkg/shapes.py",
+    "imports": [],
+    "functions": [],
+    "classes": [
+        {"name": "Base", "bases": [], "docstring": None, "source_code": "", "line_number": 1,
+         "methods": [{"name": "area", "args": ["self"], "docstring": None, "source_code": "", "line_number": 2}]},
+        {"name": "Square", "bases": ["Base"], "docstring": None, "source_code": "", "line_number": 5, "methods": []},
+    ],
+}
+
+DRAW = {
+    "language": "python",
+    "file_path": "proj/pkg/draw.py",
+    "imports": ["from pkg.shapes import Square as Sq", "import pkg.shapes"],
+    "functions": [
+        {"name": "render", "args": ["shape"], "arg_annotations": {"shape": "Optional[Sq]"},
+         "return_annotation": "pkg.shapes.Base", "docstring": None, "source_code": "", "line_number": 4},
+    ],
+    "classes": [],
+}
+
+
+class TestCrossReferenceIndex:
+    """Test building and querying the cross-reference index."""
+
+    def setup_method(self):
+        """Setup for each test."""
+        self.xref = CrossReferenceIndex.build([SHAPES, DRAW])
+
+    def test_resolves_local_imported_and_dotted_names(self):
+        """Names resolve through the file, its imports and module paths."""
+        assert self.xref.resolve("Base", "proj/pkg/shapes.py").qualname == "Base"
+        assert self.xref.resolve("Sq", "proj/pkg/draw.py").qualname == "Square"
+        assert self.xref.resolve("pkg.shapes.Base").qualname == "Base"
+        assert self.xref.resolve("pkg.shapes").kind == "module"
+        assert self.xref.resolve("Base.area").anchor == symbol_anchor("proj/pkg/shapes.py", "Base")
+        assert self.xref.resolve("Missing") is None
+
+    def test_link_segments_split_annotations(self):
+        """Annotations are split into linkable names and punctuation."""
+        segments = self.xref.link_segments("Optional[Sq]", "proj/pkg/draw.py")
+
+        assert [text for text, _ in segments] == ["Optional", "[", "Sq", "]"]
+        assert segments[0][1] is None
+        assert segments[2][1].qualname == "Square"
+
+    def test_parse_import(self):
+        """Python and JavaScript import statements are understood."""
+        assert parse_import("from .shapes import Square as Sq, Base") == (
+            "shapes", [("Square", "Sq"), ("Base", "Base")]
+        )
+        assert parse_import("import {render} from './lib/draw.js'") == ("lib.draw", [("render", "render")])
+        assert parse_import("import os.path") == ("os.path", [])
+
+    def test_large_project_builds_linearly(self):
+        """Building and resolving scales to many symbols."""
+        files = [
+            {"file_path": f"proj/mod{i}.py", "functions": [
+                {"name": f"func_{i}_{j}", "args": [], "source_code": "", "line_number": j} for j in range(100)
+            ], "classes": []}
+            for i in range(200)
+        ]
+        xref = CrossReferenceIndex.build(files)
+
+        assert len(xref) == 20000
+        assert xref.resolve("func_199_99").file_path == "proj/mod199.py"
+
+
+class TestLinkedRendering:
+    """Test that the HTML renderer emits links."""
+
+    def test_project_render_links_bases_and_annotations(self):
+        """Bases, annotations and imports link to their definitions."""
+        html = HTMLTemplate().render_project({"files": [SHAPES, DRAW]})
+        base_href = f'href="#{symbol_anchor("proj/pkg/shapes.py", "Base")}"'
+        square_href = f'href="#{symbol_anchor("proj/pkg/shapes.py", "Square")}"'
+
+        assert f'id="{symbol_anchor("proj/pkg/shapes.py", "Base")}"' in html
+        assert f'<strong>Extends:</strong> <a {base_href}>Base</a>' in html
+        assert f'shape: Optional[<a {square_href}>Sq</a>]' in html
+        assert f'<a {base_href}>pkg.shapes.Base</a>' in html
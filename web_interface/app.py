@@ -6,15 +6,16 @@ Upload code, get instant documentation with live preview!
 """
 
 from fastapi import FastAPI, File, UploadFile, HTTPException, Form, Request
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 import os
 import tempfile
 import shutil
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Iterable, Iterator
 import asyncio
+import itertools
 import json
 from datetime import datetime
 
@@ -67,6 +68,8 @@ async def upload_file(
             status_code=400, 
             detail="Unsupported file type. Please upload .py, .js, or .ts files."
         )
+    if output_format not in ("html", "markdown", "json"):
+        raise HTTPException(status_code=400, detail=f"Unsupported output format: {output_format}")
     
     try:
         # Save uploaded file temporarily
@@ -83,16 +86,18 @@ async def upload_file(
             include_private=include_private
         )
         
-        # Clean up temp file
+        # Clean up temp file (it is fully parsed; only rendering is left)
         os.unlink(tmp_path)
         
-        return JSONResponse({
-            "success": True,
-            "filename": file.filename,
-            "documentation": result["content"],
-            "stats": result["stats"],
-            "format": output_format
-        })
+        # Render the first chunk now, so rendering errors still become a 500
+        # instead of a truncated JSON body; the rest is rendered as it is sent
+        chunks = iter(result["chunks"])
+        first_chunk = next(chunks, "")
+        envelope = {"success": True, "filename": file.filename, "stats": result["stats"], "format": output_format}
+        return StreamingResponse(
+            stream_json_envelope(envelope, "documentation", itertools.chain([first_chunk], chunks)),
+            media_type="application/json"
+        )
         
     except Exception as e:
         # Clean up temp file if it exists
@@ -105,6 +110,76 @@ async def upload_file(
         raise HTTPException(status_code=500, detail=f"Error processing file: {str(e)}")
 
 
+@app.post("/api/upload/stream")
+async def upload_file_stream(
+    file: UploadFile = File(...),
+    use_ai: bool = Form(False),
+    output_format: str = Form("html"),
+    include_private: bool = Form(False)
+):
+    """Upload a code file and stream its documentation as Server-Sent Events.
+    
+    A ``base`` event carries the documentation without AI sections right
+    away, each ``symbol`` event one re-rendered function or class (replace the
+    element with id ``anchor``), and ``done`` the complete documentation.
+    Failures end the stream with an ``error`` event.
+    """
+    
+    if not file.filename.endswith(('.py', '.js', '.ts')):
+        raise HTTPException(
+            status_code=400, 
+            detail="Unsupported file type. Please upload .py, .js, or .ts files."
+        )
+    if output_format not in ("html", "markdown", "json"):
+        raise HTTPException(status_code=400, detail=f"Unsupported output format: {output_format}")
+    
+    with tempfile.NamedTemporaryFile(delete=False, suffix=Path(file.filename).suffix) as tmp_file:
+        shutil.copyfileobj(file.file, tmp_file)
+        tmp_path = tmp_file.name
+    
+    def events() -> Iterator[str]:
+        generator = None
+        try:
+            generator = DocumentationGenerator(use_ai=use_ai, ai_stream=True)
+            for event, payload in generator.generate_documentation_stream(
+                tmp_path, output_format=output_format, include_private=include_private
+            ):
+                yield format_sse(event, dict(payload, filename=file.filename))
+        except Exception as e:
+            yield format_sse("error", {"detail": f"Error processing file: {str(e)}"})
+        finally:
+            if generator:
+                generator.close()
+            os.unlink(tmp_path)
+    
+    # Starlette iterates the synchronous generator in a worker thread
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+def format_sse(event: str, data: dict) -> str:
+    """Format one Server-Sent Event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def closing_chunks(generator: DocumentationGenerator, chunks: Iterable[str]) -> Iterator[str]:
+    """Yield ``chunks``, then close ``generator`` once the response is sent or abandoned."""
+    try:
+        yield from chunks
+    finally:
+        generator.close()
+
+
+def stream_json_envelope(data: dict, key: str, chunks: Iterable[str]) -> Iterator[str]:
+    """Stream ``data`` as a JSON object plus a ``key`` string assembled from ``chunks``.
+    
+    Clients receive the same JSON as if the string had been built first.
+    """
+    yield json.dumps(data)[:-1] + (", " if data else "") + json.dumps(key) + ': "'
+    for chunk in chunks:
+        yield json.dumps(chunk)[1:-1]
+    yield '"}'
+
+
 @app.post("/api/analyze")
 async def analyze_code(
     code: str = Form(...),
@@ -256,14 +331,19 @@ async def generate_documentation_async(
     output_format: str = "html",
     include_private: bool = False
 ) -> dict:
-    """Generate documentation asynchronously."""
+    """Generate documentation asynchronously.
+    
+    ``chunks`` renders the documentation lazily, chunk by chunk, for
+    streaming it into a response, and closes the generator when it is done.
+    """
     
+    generator = None
     try:
         # Initialize generator with appropriate settings
         generator = DocumentationGenerator(use_ai=use_ai)
         
-        # Generate documentation
-        content = generator.generate_documentation(
+        # Parse and enhance now; the document is rendered as the chunks are read
+        chunks = generator.generate_documentation_chunks(
             source_path=file_path,
             output_format=output_format,
             include_private=include_private
@@ -291,11 +371,13 @@ async def generate_documentation_async(
             }
         
         return {
-            "content": content,
+            "chunks": closing_chunks(generator, chunks),
             "stats": stats
         }
         
     except Exception as e:
+        if generator:
+            generator.close()
         raise Exception(f"Documentation generation failed: {str(e)}")
 
 